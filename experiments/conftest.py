@@ -0,0 +1,63 @@
+"""Shared pytest configuration for the simulation tests.
+
+The tests are independent (each builds its own simulation), so the suite can
+be spread across all cores with pytest-xdist:
+
+    python -m pytest -n auto -q
+
+Long (120-240 simulated minute) runs are marked ``slow`` and skipped unless
+``--runslow`` is given; the seeded 60-minute runs cover the same paths.
+"""
+import copy
+import os
+import sys
+
+import pytest
+
+# Modules in this directory use flat imports (from parameters import ...)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from parameters import SingleDishParameters
+from simulation import RestaurantSimulation
+
+
+def pytest_addoption(parser):
+    parser.addoption("--runslow", action="store_true", default=False,
+                     help="also run tests marked slow (long simulations)")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "slow: long simulation run, needs --runslow")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--runslow"):
+        return
+    skip_slow = pytest.mark.skip(reason="long simulation run; use --runslow")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+
+@pytest.fixture(params=[1, 2, 3])
+def seed(request) -> int:
+    """Seeds for the short runs: several 60-minute runs cover more states than one long one."""
+    return request.param
+
+
+@pytest.fixture(scope="session")
+def base_params() -> SingleDishParameters:
+    """Default parameters, shared by tests that only read them."""
+    return SingleDishParameters()
+
+
+@pytest.fixture
+def params(base_params) -> SingleDishParameters:
+    """Per-test copy of the default parameters, safe to mutate."""
+    return copy.deepcopy(base_params)
+
+
+@pytest.fixture
+def base_sim(params) -> RestaurantSimulation:
+    """A freshly constructed (never run) simulation per test, safe to mutate."""
+    return RestaurantSimulation(params)
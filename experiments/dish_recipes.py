@@ -25,6 +25,8 @@ Example:
 """
 from __future__ import annotations
 
+from bisect import bisect_right
+from functools import lru_cache
 from typing import Dict, List, Tuple, Optional
 import numpy as np
 
@@ -109,6 +111,17 @@ SIMPLE_MENU_DISTRIBUTION: Dict[str, float] = {
 # RECIPE UTILITIES
 # ==========================================================================
 
+_VALID_STATIONS = frozenset({
+    "wood_grill",
+    "salad_station",
+    "sautee_station",
+    "tortilla_station",
+    "guac_station",
+})
+
+# Module-level recipe sets already validated (filled at the end of the module)
+_VALIDATED_RECIPES: Tuple[Dict[str, List[Tuple[str, float, float]]], ...] = ()
+
 def get_recipes(custom_recipes: Optional[Dict[str, List[Tuple[str, float, float]]]] = None) -> Dict[str, List[Tuple[str, float, float]]]:
     """Get recipe configuration.
     
@@ -162,14 +175,28 @@ def select_dish_type(
     Returns:
         Selected dish type name.
     """
-    dish_types = list(menu_distribution.keys())
-    probabilities = list(menu_distribution.values())
+    # One uniform inverted through the cached CDF: same draw and result as
+    # rng.choice(dish_types, p=probabilities), without per-call validation
+    dish_types, cdf = _menu_cdf(tuple(menu_distribution.items()))
+    return dish_types[min(bisect_right(cdf, rng.random()), len(dish_types) - 1)]
+
+
+@lru_cache(maxsize=32)
+def _menu_cdf(items: Tuple[Tuple[str, float], ...]) -> Tuple[Tuple[str, ...], List[float]]:
+    """Dish types and their CDF for a menu distribution, built once per menu.
+    
+    The CDF is built exactly as Generator.choice builds it from p, so
+    inverting it with one rng.random() draw selects the same dish type.
+    """
+    dish_types = tuple(str(dish_type) for dish_type, _ in items)
+    probabilities = [p for _, p in items]
     
     # Normalize probabilities
     total = sum(probabilities)
-    probabilities = [p / total for p in probabilities]
+    probabilities = np.array([p / total for p in probabilities])
     
-    return str(rng.choice(dish_types, p=probabilities))
+    cdf = probabilities.cumsum()
+    return dish_types, (cdf / cdf[-1]).tolist()
 
 
 def get_dish_components(
@@ -200,13 +227,9 @@ def validate_recipes(recipes: Dict[str, List[Tuple[str, float, float]]]) -> bool
     Returns:
         True if valid, raises ValueError otherwise.
     """
-    valid_stations = {
-        "wood_grill",
-        "salad_station",
-        "sautee_station",
-        "tortilla_station",
-        "guac_station",
-    }
+    # The built-in recipe sets are checked once, at import (end of module)
+    if any(recipes is validated for validated in _VALIDATED_RECIPES):
+        return True
     
     for dish_type, components in recipes.items():
         if not components:
@@ -218,7 +241,7 @@ def validate_recipes(recipes: Dict[str, List[Tuple[str, float, float]]]) -> bool
             
             station_name, mu, sigma = component
             
-            if station_name not in valid_stations:
+            if station_name not in _VALID_STATIONS:
                 raise ValueError(f"Unknown station '{station_name}' in dish '{dish_type}'")
             
             if mu <= 0 or sigma <= 0:
@@ -255,3 +278,8 @@ def get_total_expected_prep_time(
     return max(expected_times) if expected_times else 0.0
 
 
+# Validate the built-in recipe sets once at import; validate_recipes then
+# returns immediately for them
+validate_recipes(DEFAULT_RECIPES)
+validate_recipes(SIMPLE_RECIPES)
+_VALIDATED_RECIPES = (DEFAULT_RECIPES, SIMPLE_RECIPES)
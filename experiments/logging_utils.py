@@ -5,9 +5,11 @@ to dictionaries for JSON export, designed for GUI visualization.
 """
 from __future__ import annotations
 
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any, Union
 from enum import Enum
 
+import numpy as np
+
 from models import (
     Party, Dish, DishComponent, Task, DeliveryTask, CleaningTask,
     TaskType, Station, Host, FoodRunner, Busser
@@ -285,3 +287,134 @@ def create_event(event_type: EventType, timestamp: float, entity_id: int,
     return event
 
 
+# ==========================================================================
+# COLUMNAR EVENT LOG
+# ==========================================================================
+
+_EVENT_TYPES = list(EventType)
+_EVENT_TYPE_INDEX = {event_type: i for i, event_type in enumerate(_EVENT_TYPES)}
+_EVENT_TYPE_BY_VALUE = {event_type.value: event_type for event_type in _EVENT_TYPES}
+
+
+class EventLog:
+    """Struct-of-arrays event log.
+    
+    Timestamps, event-type codes and entity ids live in growable NumPy arrays
+    (capacity doubles when full); the sparse optional fields (from_state,
+    to_state, details) are kept in parallel lists. Event dicts are only built
+    on iteration, where they match create_event() exactly, so the log can be
+    used wherever a list of event dicts was expected (len, iteration,
+    indexing, list(...)).
+    
+    With maxlen set, only the most recent maxlen events are kept, like a
+    bounded deque.
+    """
+    
+    INITIAL_CAPACITY = 1024
+    
+    def __init__(self, maxlen: Optional[int] = None):
+        self.maxlen = maxlen
+        self._timestamps = np.empty(self.INITIAL_CAPACITY, dtype=np.float64)
+        self._kinds = np.empty(self.INITIAL_CAPACITY, dtype=np.uint8)
+        self._entity_ids = np.empty(self.INITIAL_CAPACITY, dtype=np.int64)
+        self._from_states: List[Optional[str]] = []
+        self._to_states: List[Optional[str]] = []
+        self._details: List[Optional[Dict[str, Any]]] = []
+        self._start = 0  # index of the oldest retained event
+    
+    def __len__(self) -> int:
+        return len(self._details) - self._start
+    
+    def _make_room(self):
+        """Compact away dropped events or double the array capacity."""
+        end = len(self._details)
+        live = end - self._start
+        capacity = len(self._timestamps)
+        if self._start and live <= capacity // 2:
+            lo = self._start
+            self._timestamps[:live] = self._timestamps[lo:end]
+            self._kinds[:live] = self._kinds[lo:end]
+            self._entity_ids[:live] = self._entity_ids[lo:end]
+            del self._from_states[:lo], self._to_states[:lo], self._details[:lo]
+            self._start = 0
+            return
+        self._timestamps = np.resize(self._timestamps, 2 * capacity)
+        self._kinds = np.resize(self._kinds, 2 * capacity)
+        self._entity_ids = np.resize(self._entity_ids, 2 * capacity)
+    
+    def record(self, event_type: EventType, timestamp: float, entity_id: int,
+               from_state: Optional[str] = None, to_state: Optional[str] = None,
+               details: Optional[Dict[str, Any]] = None):
+        """Append one event (same arguments as create_event)."""
+        i = len(self._details)
+        if i == len(self._timestamps):
+            self._make_room()
+            i = len(self._details)
+        self._timestamps[i] = timestamp
+        self._kinds[i] = _EVENT_TYPE_INDEX[event_type]
+        self._entity_ids[i] = entity_id
+        self._from_states.append(from_state)
+        self._to_states.append(to_state)
+        self._details.append(details)
+        if self.maxlen is not None and i + 1 - self._start > self.maxlen:
+            self._start += 1
+    
+    def append(self, event: Dict[str, Any]):
+        """Append an event dict as produced by create_event()."""
+        self.record(_EVENT_TYPE_BY_VALUE[event["event_type"]], event["timestamp"],
+                    event["entity_id"], event.get("from_state"), event.get("to_state"),
+                    event.get("details"))
+    
+    def clear(self):
+        """Drop all events (capacity is kept)."""
+        self._from_states.clear()
+        self._to_states.clear()
+        self._details.clear()
+        self._start = 0
+    
+    def _event(self, i: int) -> Dict[str, Any]:
+        return create_event(_EVENT_TYPES[self._kinds[i]], float(self._timestamps[i]),
+                            int(self._entity_ids[i]), self._from_states[i],
+                            self._to_states[i], self._details[i])
+    
+    def __getitem__(self, index: Union[int, slice]) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        n = len(self)
+        if isinstance(index, slice):
+            return [self._event(self._start + i) for i in range(n)[index]]
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("event index out of range")
+        return self._event(self._start + index)
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        end = len(self._details)
+        timestamps = self._timestamps[self._start:end].tolist()
+        kinds = self._kinds[self._start:end].tolist()
+        entity_ids = self._entity_ids[self._start:end].tolist()
+        for j, i in enumerate(range(self._start, end)):
+            yield create_event(_EVENT_TYPES[kinds[j]], timestamps[j], entity_ids[j],
+                               self._from_states[i], self._to_states[i], self._details[i])
+    
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Event timestamps (read-only view)."""
+        view = self._timestamps[self._start:len(self._details)]
+        view.flags.writeable = False
+        return view
+    
+    @property
+    def entity_ids(self) -> np.ndarray:
+        """Event entity ids (read-only view)."""
+        view = self._entity_ids[self._start:len(self._details)]
+        view.flags.writeable = False
+        return view
+    
+    @property
+    def event_types(self) -> List[str]:
+        """Event type values, one per event."""
+        return [_EVENT_TYPES[k].value for k in self._kinds[self._start:len(self._details)].tolist()]
+    
+    def type_mask(self, event_type: EventType) -> np.ndarray:
+        """Boolean mask selecting events of the given type."""
+        return self._kinds[self._start:len(self._details)] == _EVENT_TYPE_INDEX[event_type]
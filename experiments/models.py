@@ -1,4 +1,9 @@
-"""Data models for restaurant simulation entities."""
+"""Data models for restaurant simulation entities.
+
+All entities use slotted dataclasses to avoid a per-instance __dict__; the
+high-volume ones (Task, DishComponent, Dish, Party) are created once per
+task/component/dish/party.
+"""
 from __future__ import annotations
 
 from dataclasses import dataclass, field
@@ -20,7 +25,7 @@ class TaskType(Enum):
     CLEANING = auto()      # Server or Busser: clean table
 
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     """Base class for tasks in queue system."""
     id: int
@@ -33,7 +38,7 @@ class Task:
     assigned_to: Optional[str] = None  # e.g., "server_1", "food_runner_2"
 
 
-@dataclass
+@dataclass(slots=True)
 class DeliveryTask(Task):
     """Task for delivering food to a table."""
     order_id: int = 0
@@ -41,7 +46,7 @@ class DeliveryTask(Task):
     dish_id: Optional[int] = None  # For single-dish delivery tracking
 
 
-@dataclass
+@dataclass(slots=True)
 class CleaningTask(Task):
     """Task for cleaning a table after party leaves."""
     table_ids: List[int] = field(default_factory=list)
@@ -51,7 +56,7 @@ class CleaningTask(Task):
 # DISH COMPONENTS
 # ==========================================================================
 
-@dataclass
+@dataclass(slots=True)
 class DishComponent:
     """A single component of a dish that needs to be prepared at a station."""
     id: int
@@ -66,7 +71,7 @@ class DishComponent:
     actual_prep_time: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Dish:
     """A dish in an order, potentially composed of multiple components."""
     id: int
@@ -88,7 +93,7 @@ class Dish:
 # PARTY
 # ==========================================================================
 
-@dataclass
+@dataclass(slots=True)
 class Party:
     """A party (group of guests) visiting the restaurant."""
     id: int
@@ -123,7 +128,7 @@ class Party:
 # STAFF RESOURCES
 # ==========================================================================
 
-@dataclass
+@dataclass(slots=True)
 class Host:
     """Host staff member who seats guests."""
     id: int
@@ -132,7 +137,7 @@ class Host:
     parties_seated: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class FoodRunner:
     """Food runner staff member who delivers food."""
     id: int
@@ -141,7 +146,7 @@ class FoodRunner:
     deliveries_made: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class Busser:
     """Busser staff member who cleans tables."""
     id: int
@@ -150,7 +155,7 @@ class Busser:
     tables_cleaned: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class Cook:
     """Cook staff member (legacy, for backward compatibility)."""
     id: int
@@ -163,7 +168,7 @@ class Cook:
 # COOKING STATIONS
 # ==========================================================================
 
-@dataclass
+@dataclass(slots=True)
 class Station:
     """A cooking station in the kitchen."""
     id: int
@@ -5,6 +5,8 @@ import math
 from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Any
 
+import numpy as np
+
 
 @dataclass
 class SingleDishParameters:
@@ -175,22 +177,37 @@ class SingleDishParameters:
     # ==========================================================================
     log_snapshot_interval: float = 30.0  # minutes between snapshot logs (legacy, used for periodic backup)
     enable_logging: bool = True  # Master switch for all logging
+    record_snapshots: bool = True  # Capture state snapshots (False keeps only the event log)
     
     # Event-driven logging (new)
     enable_event_logging: bool = True  # Enable event log alongside snapshots
     min_snapshot_interval: float = 0.5  # Minimum time between snapshots (minutes, default 30 seconds)
     enable_periodic_backup: bool = False  # Enable periodic backup snapshots (uses log_snapshot_interval)
     periodic_backup_interval: float = 5.0  # Interval for periodic backup snapshots if enabled (minutes)
+    
+    # In-memory log retention (ring buffers). None keeps the full history;
+    # an int keeps only the most recent N entries (older ones are dropped
+    # unless flushed to disk with flush_events_to_jsonl / flush_snapshots_to_jsonl)
+    max_in_memory_events: Optional[int] = None
+    max_in_memory_snapshots: Optional[int] = None
 
     # ==========================================================================
     # RANDOM SEED
     # ==========================================================================
     seed: int = 42
+    # Antithetic run: every underlying U(0,1) draw u is replaced by 1-u, so a
+    # run with the same seed and antithetic=True is negatively correlated with
+    # the ordinary run (used for variance reduction in paired comparisons)
+    antithetic: bool = False
 
     def lambda_t(self, t: float) -> float:
         """Calculate arrival rate at time t using NHPP with Gaussian peak."""
         return self.lambda_base + self.lambda_peak_multiplier * math.exp(-((t - self.peak_time) ** 2) / (2 * self.peak_width ** 2))
     
+    def lambda_t_vectorized(self, t: np.ndarray) -> np.ndarray:
+        """Calculate arrival rate for an array of times (vectorized lambda_t)."""
+        return self.lambda_base + self.lambda_peak_multiplier * np.exp(-((t - self.peak_time) ** 2) / (2 * self.peak_width ** 2))
+    
     def get_station_names(self) -> List[str]:
         """Return list of all station names."""
         return ["wood_grill", "salad_station", "sautee_station", "tortilla_station", "guac_station"]
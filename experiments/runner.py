@@ -1,10 +1,52 @@
 """Convenience function to run restaurant simulation."""
-from typing import Dict, Optional
+import atexit
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from typing import Dict, List, Optional, Sequence
 
 from parameters import SingleDishParameters
 from simulation import SingleDishRestaurantSim
 from results import print_results
 
+# Shared worker pool, created on first use and reused by every parallel driver
+# (here and in statistical_validation) so process start-up is paid once
+_POOL: Optional[ProcessPoolExecutor] = None
+_POOL_WORKERS = 0
+
+
+def _shutdown_pool():
+    """Shut down the shared worker pool (registered with atexit)."""
+    global _POOL, _POOL_WORKERS
+    if _POOL is not None:
+        _POOL.shutdown()
+    _POOL = None
+    _POOL_WORKERS = 0
+
+
+def _get_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """Return the shared process pool, creating it on first use.
+    
+    Linux workers are forked so they inherit the already-imported
+    numpy/scipy/simpy modules; other platforms use spawn. Asking for a
+    different worker count replaces the pool.
+    """
+    global _POOL, _POOL_WORKERS
+    workers = max_workers or os.cpu_count() or 1
+    if _POOL is not None and _POOL_WORKERS != workers:
+        _shutdown_pool()
+    if _POOL is None:
+        method = 'fork' if sys.platform.startswith('linux') else 'spawn'
+        _POOL = ProcessPoolExecutor(max_workers=workers,
+                                    mp_context=multiprocessing.get_context(method))
+        _POOL_WORKERS = workers
+    return _POOL
+
+
+atexit.register(_shutdown_pool)
+
 
 def run_single_dish_sim(params: Optional[SingleDishParameters] = None, verbose: bool = False) -> Dict[str, float]:
     """Convenience function to run the simulation and return results.
@@ -31,3 +73,47 @@ def run_single_dish_sim(params: Optional[SingleDishParameters] = None, verbose:
     
     return results
 
+
+def run_single_dish_sims_parallel(params_list: List[SingleDishParameters],
+                                  max_workers: Optional[int] = None) -> List[Dict[str, float]]:
+    """Run independent simulations in a pool of worker processes.
+    
+    Each simulation builds its own SimPy environment and RNG
+    (np.random.default_rng(params.seed)) inside the worker, so results are
+    identical to running them sequentially with the same seeds.
+    
+    Args:
+        params_list: One parameter set per simulation (e.g. one per seed/config)
+        max_workers: Number of worker processes (defaults to CPU count);
+                     1 runs everything in the current process
+    
+    Returns:
+        List of result dictionaries, in the same order as params_list
+    """
+    if max_workers == 1 or len(params_list) <= 1:
+        return [run_single_dish_sim(params) for params in params_list]
+    
+    return list(_get_pool(max_workers).map(run_single_dish_sim, params_list))
+
+
+def run_batch(seeds: Sequence[int], base_params: Optional[SingleDishParameters] = None,
+              max_workers: Optional[int] = None) -> List[Dict[str, float]]:
+    """Run one replication of the same configuration per seed, in parallel.
+    
+    Inside a pytest-xdist worker (PYTEST_XDIST_WORKER set) the replications
+    run in-process unless max_workers is given, so the suite's own
+    parallelism is not multiplied by a second pool.
+    
+    Args:
+        seeds: One seed per replication
+        base_params: Configuration to replicate (uses defaults if None)
+        max_workers: Number of worker processes (see run_single_dish_sims_parallel)
+    
+    Returns:
+        List of result dictionaries, in the same order as seeds
+    """
+    base_params = base_params or SingleDishParameters()
+    if max_workers is None and os.environ.get('PYTEST_XDIST_WORKER'):
+        max_workers = 1
+    params_list = [replace(base_params, seed=seed) for seed in seeds]
+    return run_single_dish_sims_parallel(params_list, max_workers)
@@ -9,14 +9,20 @@ This module implements a discrete-event simulation of a restaurant with:
 from __future__ import annotations
 
 import math
-from collections import deque
-from typing import List, Dict, Optional, Deque, Tuple, Set
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Deque, Tuple, Set, Union
 
 import numpy as np
 import simpy
 
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from models import (
     Dish, Party, Cook, Host, FoodRunner, Busser, Station,
     DishComponent, Task, DeliveryTask, CleaningTask, TaskType
@@ -27,10 +33,65 @@ from results import calculate_results
 import dish_recipes
 from logging_utils import (
     serialize_party, serialize_dish, serialize_task, serialize_station,
-    serialize_table, serialize_order, create_event, EventType,
+    serialize_table, serialize_order, EventType, EventLog,
     get_party_status, get_dish_status
 )
 
+# Module-level bindings for the RNG helpers called once per service step
+_draw_normal_positive = utils.draw_normal_positive
+_draw_lognormal = utils.draw_lognormal
+
+
+def _noop(*args, **kwargs):
+    """Stand-in bound over per-event hooks that are disabled for a run."""
+
+
+def _dumps(obj, indent: Optional[int] = None) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes, using orjson when it is installed."""
+    if orjson is not None and indent in (None, 2):
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if indent == 2:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    if indent is None:
+        return json.dumps(obj, separators=(',', ':')).encode()
+    return json.dumps(obj, indent=indent).encode()
+
+
+class _OverlappedWriter:
+    """Accumulate encoded bytes and write them in large chunks on a background thread.
+    
+    File writes release the GIL, so while one chunk is being written the
+    caller keeps encoding the next. At most one chunk is in flight, which
+    bounds memory to roughly two chunks.
+    """
+    
+    CHUNK_BYTES = 4 << 20
+    
+    def __init__(self, f, io_pool: ThreadPoolExecutor):
+        self._f = f
+        self._io_pool = io_pool
+        self._chunk = bytearray()
+        self._pending = None
+    
+    def write(self, data: bytes):
+        self._chunk += data
+        if len(self._chunk) >= self.CHUNK_BYTES:
+            self._submit()
+    
+    def _submit(self):
+        if self._pending is not None:
+            self._pending.result()
+        self._pending = self._io_pool.submit(self._f.write, bytes(self._chunk))
+        self._chunk = bytearray()
+    
+    def close(self):
+        if self._chunk:
+            self._submit()
+        if self._pending is not None:
+            self._pending.result()
+            self._pending = None
+
 
 class RestaurantSimulation:
     """Full restaurant simulation with zones, stations, and priority queues."""
@@ -38,6 +99,10 @@ class RestaurantSimulation:
     def __init__(self, params: SingleDishParameters):
         self.p = params
         self.rng = np.random.default_rng(self.p.seed)
+        if self.p.antithetic:
+            self.rng = utils.AntitheticGenerator(self.rng)
+        # Block-drawn standard normals for the lognormal service times
+        self.normal_pool = utils.StandardNormalPool(self.rng)
         self.env = simpy.Environment()
 
         # TABLE SETUP
@@ -81,10 +146,12 @@ class RestaurantSimulation:
         self.food_runners = simpy.Resource(self.env, capacity=max(1, self.p.num_food_runners))
         self.food_runner_objects: List[FoodRunner] = [FoodRunner(id=i) for i in range(self.p.num_food_runners)]
         self.food_runner_busy_time: float = 0.0
+        self._next_runner_idx = 0  # round-robin credit for deliveries_made
         
         self.bussers = simpy.Resource(self.env, capacity=max(1, self.p.num_bussers))
         self.busser_objects: List[Busser] = [Busser(id=i) for i in range(self.p.num_bussers)]
         self.busser_busy_time: float = 0.0
+        self._next_busser_idx = 0  # round-robin credit for tables_cleaned
         
         # GUEST & HOST QUEUES
         self.guest_queue: Deque[Party] = deque()
@@ -98,8 +165,10 @@ class RestaurantSimulation:
         # TASK QUEUES
         # Use max(1, num_servers) to ensure at least 1 zone exists even with 0 servers
         num_zones = max(1, self.p.num_servers)
-        self.server_zone_queues: Dict[int, Deque[Task]] = {
-            zone_id: deque() for zone_id in range(num_zones)
+        # Zone queues are keyed by task id (insertion-ordered) so a claim
+        # elsewhere removes the task in O(1) instead of scanning the queue
+        self.server_zone_queues: Dict[int, 'OrderedDict[int, Task]'] = {
+            zone_id: OrderedDict() for zone_id in range(num_zones)
         }
         self.food_runner_queue: Deque[DeliveryTask] = deque()
         self.busser_queue: Deque[CleaningTask] = deque()
@@ -107,6 +176,14 @@ class RestaurantSimulation:
         self.active_tasks: Dict[int, Task] = {}
         self.task_counter = 0
         
+        # Server task dispatch table: TaskType -> generator method(task, party)
+        self._server_task_handlers = {
+            TaskType.ORDERING: self._do_ordering,
+            TaskType.CHECKOUT: self._do_checkout,
+            TaskType.DELIVERY: self._do_delivery_as_server,
+            TaskType.CLEANING: self._do_cleaning_as_server,
+        }
+        
         self.server_queue_triggers: Dict[int, simpy.Event] = {
             zone_id: simpy.Event(self.env) for zone_id in range(num_zones)
         }
@@ -153,7 +230,6 @@ class RestaurantSimulation:
             self.station_cook_busy_time[station_name] = 0.0
             self.station_cook_available_events[station_name] = simpy.Event(self.env)
         
-        self.component_tracking: Dict[int, Dict[int, bool]] = {}
         self.component_counter = 0
         
         # EXPO
@@ -171,6 +247,10 @@ class RestaurantSimulation:
         # DELIVERED DISHES TRACKING (for immediate single-dish delivery)
         self.order_delivered_dishes: Dict[int, Set[int]] = {}  # order_id -> set of delivered dish_ids
         
+        # ORDER STATUS (maintained incrementally at dish state transitions)
+        self.order_status: Dict[int, str] = {}  # order_id -> "pending" | "cooking" | "expo" | "delivered"
+        self.order_dish_state_counts: Dict[int, Dict[str, int]] = {}  # order_id -> dish status -> count
+        
         # DISH RECIPES
         self.recipes = dish_recipes.get_recipes(self.p.dish_recipes)
         self.menu_distribution = dish_recipes.get_menu_distribution(self.p.menu_distribution, self.recipes)
@@ -181,16 +261,36 @@ class RestaurantSimulation:
         self.order_counter = 0
         self.dish_counter = 0
         self.parties: List[Party] = []
+        self.parties_by_id: Dict[int, Party] = {}
+        self.parties_in_system: int = 0  # parties arrived but not yet departed
+        self.parties_served: int = 0  # parties that have departed
         self.all_dishes: List[Dish] = []
+        self.dishes_by_id: Dict[int, Dish] = {}
+        self.dishes_by_order: Dict[int, List[Dish]] = {}
         self.total_revenue: float = 0.0
         self.order_to_party: Dict[int, int] = {}
         self.order_first_delivery_events: Dict[int, simpy.Event] = {}
         self.order_all_delivered_events: Dict[int, simpy.Event] = {}
         
         # LOGGING
-        self.snapshot_history: List[Dict] = []
+        # Unbounded by default; max_in_memory_* caps them as ring buffers for long
+        # runs (snapshot_history stays a plain, sliceable list when uncapped)
+        self.snapshot_history: Union[List[Dict], Deque[Dict]] = (
+            [] if self.p.max_in_memory_snapshots is None
+            else deque(maxlen=self.p.max_in_memory_snapshots)
+        )
         self.last_snapshot_time: float = -self.p.min_snapshot_interval  # Allow first snapshot immediately
-        self.event_log: List[Dict] = []  # Chronological event log
+        self._log_on: bool = bool(self.p.enable_logging)  # Fixed per run; call sites skip all event work when off
+        self._snap_on: bool = self._log_on and bool(self.p.record_snapshots)  # Snapshot capture (event log unaffected)
+        self.event_log = EventLog(maxlen=self.p.max_in_memory_events)  # Chronological event log (columnar)
+        if not (self._log_on and self.p.enable_event_logging):
+            self._log_event = _noop  # Specialize once instead of re-checking the flags per event
+        # Serialized dishes are cached and only rebuilt for dishes whose state changed
+        self._serialized_dish_cache: Dict[int, Dict] = {}
+        self._dirty_dish_ids: Set[int] = set()
+        if not self._snap_on:
+            self._mark_dish_dirty = _noop  # Only the snapshot path ever drains the dirty set
+        self._tasktype_names: Dict[TaskType, str] = {tt: tt.name for tt in TaskType}  # Avoid Enum .name lookups per task
         
         # Legacy compatibility
         self.cooks: List[Cook] = [Cook(i) for i in range(self.p.num_cooks)]
@@ -369,7 +469,7 @@ class RestaurantSimulation:
         host_req = self.hosts.request()
         yield host_req
         party.walk_start_time = self.env.now
-        walk_time = utils.draw_normal_positive(self.rng, self.p.walking_to_table_mean, self.p.walking_to_table_std)
+        walk_time = _draw_normal_positive(self.rng, self.p.walking_to_table_mean, self.p.walking_to_table_std)
         yield self.env.timeout(walk_time)
         party.table_assigned_time = self.env.now
         host_time = walk_time + self.p.host_queue_processing_time
@@ -381,11 +481,12 @@ class RestaurantSimulation:
         self.hosts.release(host_req)
         
         # Log PARTY_SEATED event
-        self._take_event_snapshot(
-            EventType.PARTY_SEATED, party.id,
-            from_state="being_seated", to_state="deciding",
-            details={"table_ids": party.tables_assigned, "zone_id": party.zone_id}
-        )
+        if self._log_on:
+            self._take_event_snapshot(
+                EventType.PARTY_SEATED, party.id,
+                from_state="being_seated", to_state="deciding",
+                details={"table_ids": party.tables_assigned, "zone_id": party.zone_id}
+            )
         
         if party.table_request is not None:
             party.table_request.succeed()
@@ -434,26 +535,30 @@ class RestaurantSimulation:
         
         component.start_time = self.env.now
         cook_start_time = self.env.now  # Track when cook started working
+        self._mark_dish_dirty(component.dish_id)
         
         # Set dish start_time when first component starts
-        dish = next((d for d in self.all_dishes if d.id == component.dish_id), None)
+        dish = self.dishes_by_id.get(component.dish_id)
         is_first_component = False
         if dish and dish.start_time is None:
             dish.start_time = self.env.now
+            self._set_dish_state(dish, "queued", "cooking")
             is_first_component = True
             # Track first dish start for legacy metrics
             if component.order_id not in self.first_dish_start_times:
                 self.first_dish_start_times[component.order_id] = self.env.now
             
             # Log DISH_STARTED event (when first component starts)
-            self._take_event_snapshot(
-                EventType.DISH_STARTED, dish.id,
-                from_state="queued", to_state="cooking",
-                details={"dish_type": dish.dish_type, "order_id": dish.order_id, "station": station.name}
-            )
+            if self._log_on:
+                self._take_event_snapshot(
+                    EventType.DISH_STARTED, dish.id,
+                    from_state="queued", to_state="cooking",
+                    details={"dish_type": dish.dish_type, "order_id": dish.order_id, "station": station.name}
+                )
         
-        prep_time = utils.draw_lognormal(self.rng, component.prep_time_mu, component.prep_time_sigma)
+        prep_time = _draw_lognormal(self.normal_pool, component.prep_time_mu, component.prep_time_sigma)
         component.actual_prep_time = prep_time
+        self._mark_dish_dirty(component.dish_id)
         yield self.env.timeout(prep_time)
         
         # Track cook busy time for this station
@@ -461,6 +566,7 @@ class RestaurantSimulation:
         self.station_cook_busy_time[station.name] += cook_elapsed_time
         
         component.complete_time = self.env.now
+        self._mark_dish_dirty(component.dish_id)
         station.dishes_prepared += 1
         station.busy_slots -= 1
         
@@ -471,11 +577,11 @@ class RestaurantSimulation:
             station.busy_time += (self.env.now - station.active_since)
             station.active_since = None
         self._trigger_station(station.name)
-        dish_id = component.dish_id
-        if dish_id in self.component_tracking:
-            self.component_tracking[dish_id][component.id] = True
-            if all(self.component_tracking[dish_id].values()):
-                self._dish_components_complete(dish_id)
+        # Components of a dish finish in any order; the last one completes it
+        if dish is not None:
+            dish.components_complete += 1
+            if dish.components_complete == len(dish.components):
+                self._dish_components_complete(dish.id)
     
     def _trigger_station(self, station_name: str):
         if self.station_waiting.get(station_name, False):
@@ -486,9 +592,10 @@ class RestaurantSimulation:
                 self.station_waiting[station_name] = False
     
     def _dish_components_complete(self, dish_id: int):
-        dish = next((d for d in self.all_dishes if d.id == dish_id), None)
+        dish = self.dishes_by_id.get(dish_id)
         if dish is None:
             return
+        self._mark_dish_dirty(dish_id)
         
         # Calculate total prep time (max of parallel components)
         if dish.components:
@@ -497,14 +604,16 @@ class RestaurantSimulation:
                 dish.prep_time = max(component_times)  # Parallel cooking = max time
         
         dish.complete_time = self.env.now
+        self._set_dish_state(dish, "cooking", "expo_queue")
         self.expo_queue.append(dish)
         
         # Log DISH_COMPLETED event
-        self._take_event_snapshot(
-            EventType.DISH_COMPLETED, dish_id,
-            from_state="cooking", to_state="expo_queue",
-            details={"dish_type": dish.dish_type, "order_id": dish.order_id, "prep_time": dish.prep_time}
-        )
+        if self._log_on:
+            self._take_event_snapshot(
+                EventType.DISH_COMPLETED, dish_id,
+                from_state="cooking", to_state="expo_queue",
+                details={"dish_type": dish.dish_type, "order_id": dish.order_id, "prep_time": dish.prep_time}
+            )
         
         self._trigger_expo()
     
@@ -527,26 +636,32 @@ class RestaurantSimulation:
         expo_req = self.expo.request()
         yield expo_req
         dish.expo_start_time = self.env.now
+        self._mark_dish_dirty(dish.id)
+        self._set_dish_state(dish, "expo_queue", "expo_check")
         
         # Log DISH_EXPO_START event
-        self._take_event_snapshot(
-            EventType.DISH_EXPO_START, dish.id,
-            from_state="expo_queue", to_state="expo_check",
-            details={"dish_type": dish.dish_type, "order_id": dish.order_id}
-        )
+        if self._log_on:
+            self._take_event_snapshot(
+                EventType.DISH_EXPO_START, dish.id,
+                from_state="expo_queue", to_state="expo_check",
+                details={"dish_type": dish.dish_type, "order_id": dish.order_id}
+            )
         
-        check_time = utils.draw_normal_positive(self.rng, self.p.expo_check_time_mean, self.p.expo_check_time_std)
+        check_time = _draw_normal_positive(self.rng, self.p.expo_check_time_mean, self.p.expo_check_time_std)
         yield self.env.timeout(check_time)
         self.expo_busy_time += check_time
         dish.expo_complete_time = self.env.now
+        self._mark_dish_dirty(dish.id)
+        self._set_dish_state(dish, "expo_check", "delivered")
         self.expo.release(expo_req)
         
         # Log DISH_EXPO_COMPLETE event
-        self._take_event_snapshot(
-            EventType.DISH_EXPO_COMPLETE, dish.id,
-            from_state="expo_check", to_state="ready",
-            details={"dish_type": dish.dish_type, "order_id": dish.order_id}
-        )
+        if self._log_on:
+            self._take_event_snapshot(
+                EventType.DISH_EXPO_COMPLETE, dish.id,
+                from_state="expo_check", to_state="ready",
+                details={"dish_type": dish.dish_type, "order_id": dish.order_id}
+            )
         
         order_id = dish.order_id
         if order_id not in self.order_batching:
@@ -561,10 +676,34 @@ class RestaurantSimulation:
         if len(self.order_batching[order_id]) >= total_expected:
             party_id = self.order_to_party.get(order_id)
             if party_id is not None:
-                party = next((p for p in self.parties if p.id == party_id), None)
+                party = self.parties_by_id.get(party_id)
                 if party is not None and party.all_dishes_ready is None:
                     party.all_dishes_ready = self.env.now
     
+    def _set_dish_state(self, dish: Dish, from_state: Optional[str], to_state: str):
+        """Record a dish status transition and refresh its order's cached status.
+        
+        States mirror logging_utils.get_dish_status, so the cached order status
+        matches what would be derived by scanning the order's dishes.
+        """
+        counts = self.order_dish_state_counts.get(dish.order_id)
+        if counts is None:
+            return
+        if from_state is not None:
+            counts[from_state] -= 1
+        counts[to_state] += 1
+        
+        total = sum(counts.values())
+        if counts["delivered"] == total:
+            status = "delivered"
+        elif counts["cooking"]:
+            status = "cooking"
+        elif counts["queued"]:
+            status = "pending"
+        else:
+            status = "expo"
+        self.order_status[dish.order_id] = status
+    
     def _trigger_expo(self):
         if self.expo_waiting and not self.expo_trigger.triggered:
             self.expo_trigger.succeed()
@@ -585,7 +724,7 @@ class RestaurantSimulation:
         party_id = self.order_to_party.get(order_id)
         if party_id is None:
             return
-        party = next((p for p in self.parties if p.id == party_id), None)
+        party = self.parties_by_id.get(party_id)
         if party is None:
             return
         
@@ -603,15 +742,16 @@ class RestaurantSimulation:
         self.active_tasks[task.id] = task
         self.food_runner_queue.append(task)
         if zone_id in self.server_zone_queues:
-            self.server_zone_queues[zone_id].append(task)
+            self.server_zone_queues[zone_id][task.id] = task
         
         # Log TASK_CREATED (DELIVERY) event
-        self._take_event_snapshot(
-            EventType.TASK_CREATED, task.id,
-            to_state="pending",
-            details={"task_type": "DELIVERY", "party_id": party_id, "order_id": order_id, 
-                    "dish_id": dish.id, "num_dishes": 1}
-        )
+        if self._log_on:
+            self._take_event_snapshot(
+                EventType.TASK_CREATED, task.id,
+                to_state="pending",
+                details={"task_type": "DELIVERY", "party_id": party_id, "order_id": order_id, 
+                        "dish_id": dish.id, "num_dishes": 1}
+            )
         
         self._trigger_food_runner_queue()
         self._trigger_server_zone_queue(zone_id)
@@ -620,7 +760,7 @@ class RestaurantSimulation:
         party_id = self.order_to_party.get(order_id)
         if party_id is None:
             return
-        party = next((p for p in self.parties if p.id == party_id), None)
+        party = self.parties_by_id.get(party_id)
         if party is None:
             return
         
@@ -640,14 +780,15 @@ class RestaurantSimulation:
         self.active_tasks[task.id] = task
         self.food_runner_queue.append(task)
         if zone_id in self.server_zone_queues:
-            self.server_zone_queues[zone_id].append(task)
+            self.server_zone_queues[zone_id][task.id] = task
         
         # Log TASK_CREATED (DELIVERY) event
-        self._take_event_snapshot(
-            EventType.TASK_CREATED, task.id,
-            to_state="pending",
-            details={"task_type": "DELIVERY", "party_id": party_id, "order_id": order_id, "num_dishes": num_dishes}
-        )
+        if self._log_on:
+            self._take_event_snapshot(
+                EventType.TASK_CREATED, task.id,
+                to_state="pending",
+                details={"task_type": "DELIVERY", "party_id": party_id, "order_id": order_id, "num_dishes": num_dishes}
+            )
         
         self._trigger_food_runner_queue()
         self._trigger_server_zone_queue(zone_id)
@@ -659,14 +800,15 @@ class RestaurantSimulation:
         self.active_tasks[task.id] = task
         self.busser_queue.append(task)
         if zone_id in self.server_zone_queues:
-            self.server_zone_queues[zone_id].append(task)
+            self.server_zone_queues[zone_id][task.id] = task
         
         # Log TASK_CREATED (CLEANING) event
-        self._take_event_snapshot(
-            EventType.TASK_CREATED, task.id,
-            to_state="pending",
-            details={"task_type": "CLEANING", "party_id": party.id, "table_ids": party.tables_assigned}
-        )
+        if self._log_on:
+            self._take_event_snapshot(
+                EventType.TASK_CREATED, task.id,
+                to_state="pending",
+                details={"task_type": "CLEANING", "party_id": party.id, "table_ids": party.tables_assigned}
+            )
         
         self._trigger_busser_queue()
         self._trigger_server_zone_queue(zone_id)
@@ -677,14 +819,15 @@ class RestaurantSimulation:
                    zone_id=zone_id, created_time=self.env.now)
         self.active_tasks[task.id] = task
         if zone_id in self.server_zone_queues:
-            self.server_zone_queues[zone_id].append(task)
+            self.server_zone_queues[zone_id][task.id] = task
         
         # Log TASK_CREATED (ORDERING) event
-        self._take_event_snapshot(
-            EventType.TASK_CREATED, task.id,
-            to_state="pending",
-            details={"task_type": "ORDERING", "party_id": party.id}
-        )
+        if self._log_on:
+            self._take_event_snapshot(
+                EventType.TASK_CREATED, task.id,
+                to_state="pending",
+                details={"task_type": "ORDERING", "party_id": party.id}
+            )
         
         self._trigger_server_zone_queue(zone_id)
         return task
@@ -695,14 +838,15 @@ class RestaurantSimulation:
                    zone_id=zone_id, created_time=self.env.now)
         self.active_tasks[task.id] = task
         if zone_id in self.server_zone_queues:
-            self.server_zone_queues[zone_id].append(task)
+            self.server_zone_queues[zone_id][task.id] = task
         
         # Log TASK_CREATED (CHECKOUT) event
-        self._take_event_snapshot(
-            EventType.TASK_CREATED, task.id,
-            to_state="pending",
-            details={"task_type": "CHECKOUT", "party_id": party.id}
-        )
+        if self._log_on:
+            self._take_event_snapshot(
+                EventType.TASK_CREATED, task.id,
+                to_state="pending",
+                details={"task_type": "CHECKOUT", "party_id": party.id}
+            )
         
         self._trigger_server_zone_queue(zone_id)
         return task
@@ -713,26 +857,25 @@ class RestaurantSimulation:
             del self.active_tasks[task_id]
         zone_id = task.zone_id
         if zone_id in self.server_zone_queues:
-            # Remove in-place to preserve references
-            queue = self.server_zone_queues[zone_id]
-            for i, t in enumerate(list(queue)):
-                if t.id == task_id:
-                    del queue[i]
-                    break
+            self.server_zone_queues[zone_id].pop(task_id, None)
         if task.task_type == TaskType.DELIVERY:
-            # Remove in-place
-            for i, t in enumerate(list(self.food_runner_queue)):
-                if t.id == task_id:
-                    del self.food_runner_queue[i]
-                    break
+            self._remove_task_by_id(self.food_runner_queue, task_id)
         if task.task_type == TaskType.CLEANING:
-            # Remove in-place
-            for i, t in enumerate(list(self.busser_queue)):
-                if t.id == task_id:
-                    del self.busser_queue[i]
-                    break
+            self._remove_task_by_id(self.busser_queue, task_id)
         task.assigned_to = claimed_by
     
+    @staticmethod
+    def _remove_task_by_id(queue: Deque[Task], task_id: int):
+        """Remove the first task with task_id from queue in place.
+        
+        Iterates the deque directly (no defensive copy): mutating it is safe
+        because we stop iterating immediately after the delete.
+        """
+        for i, t in enumerate(queue):
+            if t.id == task_id:
+                del queue[i]
+                break
+    
     def _trigger_server_zone_queue(self, zone_id: int):
         if self.server_queue_waiting.get(zone_id, False):
             trigger = self.server_queue_triggers.get(zone_id)
@@ -763,12 +906,11 @@ class RestaurantSimulation:
         while True:
             task = None
             while queue:
-                candidate = queue[0]
-                if candidate.id in self.active_tasks:
-                    task = queue.popleft()
+                # Oldest first; stale entries (claimed by a runner/busser) are dropped
+                task_id, candidate = queue.popitem(last=False)
+                if task_id in self.active_tasks:
+                    task = candidate
                     break
-                else:
-                    queue.popleft()
             if task:
                 self._remove_task_from_queues(task, f"server_zone_{zone_id}")
                 # Process task and WAIT for it to complete before processing next
@@ -780,87 +922,106 @@ class RestaurantSimulation:
                 self.server_queue_triggers[zone_id] = simpy.Event(self.env)
     
     def _server_process_task(self, zone_id: int, task: Task):
+        env = self.env
         server_req = self.servers.request()
         yield server_req
-        task.started_time = self.env.now
-        party = next((p for p in self.parties if p.id == task.party_id), None)
+        task.started_time = env.now
+        party = self.parties_by_id.get(task.party_id)
         
         # Log TASK_STARTED event
-        self._take_event_snapshot(
-            EventType.TASK_STARTED, task.id,
-            from_state="pending", to_state="in_progress",
-            details={"task_type": task.task_type.name, "party_id": task.party_id, "assigned_to": f"server_zone_{zone_id}"}
-        )
-        
-        if task.task_type == TaskType.ORDERING and party:
-            party.ordering_start = self.env.now
-            order_time = utils.draw_normal_positive(self.rng, self.p.ordering_taking_mean, self.p.ordering_taking_std)
-            yield self.env.timeout(order_time)
-            self.server_busy_time += order_time
-            party.ordering_complete = self.env.now
-        
-        elif task.task_type == TaskType.CHECKOUT and party:
-            party.payment_start = self.env.now
-            payment_mean = self.p.payment_base_mean + self.p.payment_per_person_mean * party.party_size
-            payment_time = utils.draw_normal_positive(self.rng, payment_mean, self.p.payment_std)
-            yield self.env.timeout(payment_time)
-            self.server_busy_time += payment_time
-            party.payment_complete = self.env.now
-        
-        elif task.task_type == TaskType.DELIVERY and party:
-            delivery_task = task
-            order_id = delivery_task.order_id
-            
-            # Track first delivery time and trigger first_delivery_event
-            if party.first_delivery_time is None:
-                party.first_delivery_time = self.env.now
-                party.delivery_start = self.env.now
-                if order_id in self.order_first_delivery_events:
-                    ev = self.order_first_delivery_events[order_id]
-                    if not ev.triggered:
-                        ev.succeed()
-            
-            # Simulate delivery time
-            delivery_time = utils.draw_normal_positive(self.rng, self.p.delivery_base_mean, self.p.delivery_std)
-            yield self.env.timeout(delivery_time)
-            self.server_busy_time += delivery_time
-            
-            # Track delivered dishes
-            if order_id not in self.order_delivered_dishes:
-                self.order_delivered_dishes[order_id] = set()
-            if delivery_task.dish_id is not None:
-                self.order_delivered_dishes[order_id].add(delivery_task.dish_id)
-            party.dishes_delivered_count += delivery_task.num_dishes
-            
-            # Check if all dishes have been delivered
-            if party.dishes_delivered_count >= party.total_dishes:
-                party.all_dishes_delivered = self.env.now
-                party.delivery_complete = self.env.now
-                if order_id in self.order_all_delivered_events:
-                    ev = self.order_all_delivered_events[order_id]
-                    if not ev.triggered:
-                        ev.succeed()
+        if self._log_on:
+            self._take_event_snapshot(
+                EventType.TASK_STARTED, task.id,
+                from_state="pending", to_state="in_progress",
+                details={"task_type": self._tasktype_names[task.task_type], "party_id": task.party_id, "assigned_to": f"server_zone_{zone_id}"}
+            )
         
-        elif task.task_type == TaskType.CLEANING and party:
-            cleaning_task = task
-            party.cleanup_start = self.env.now
-            cleanup_mean = self.p.cleanup_base_mean + self.p.cleanup_per_person_mean * party.party_size
-            cleanup_time = utils.draw_normal_positive(self.rng, cleanup_mean, self.p.cleanup_std)
-            yield self.env.timeout(cleanup_time)
-            self.server_busy_time += cleanup_time
-            self._release_tables(cleaning_task.table_ids, party.zone_id)
+        handler = self._server_task_handlers.get(task.task_type)
+        if handler is not None and party:
+            yield from handler(task, party)
         
-        task.completed_time = self.env.now
+        task.completed_time = env.now
         
         # Log TASK_COMPLETED event
-        self._take_event_snapshot(
-            EventType.TASK_COMPLETED, task.id,
-            from_state="in_progress", to_state="completed",
-            details={"task_type": task.task_type.name, "party_id": task.party_id}
-        )
+        if self._log_on:
+            self._take_event_snapshot(
+                EventType.TASK_COMPLETED, task.id,
+                from_state="in_progress", to_state="completed",
+                details={"task_type": self._tasktype_names[task.task_type], "party_id": task.party_id}
+            )
         
         self.servers.release(server_req)
     
+    def _do_ordering(self, task: Task, party: Party):
+        """Server takes the party's order."""
+        env = self.env
+        p = self.p
+        party.ordering_start = env.now
+        order_time = _draw_normal_positive(self.rng, p.ordering_taking_mean, p.ordering_taking_std)
+        yield env.timeout(order_time)
+        self.server_busy_time += order_time
+        party.ordering_complete = env.now
+    
+    def _do_checkout(self, task: Task, party: Party):
+        """Server processes the party's payment."""
+        env = self.env
+        p = self.p
+        party.payment_start = env.now
+        payment_mean = p.payment_base_mean + p.payment_per_person_mean * party.party_size
+        payment_time = _draw_normal_positive(self.rng, payment_mean, p.payment_std)
+        yield env.timeout(payment_time)
+        self.server_busy_time += payment_time
+        party.payment_complete = env.now
+    
+    def _do_delivery_as_server(self, task: DeliveryTask, party: Party):
+        """Server delivers a dish (when no food runner claimed the task first)."""
+        env = self.env
+        p = self.p
+        order_id = task.order_id
+        
+        # Track first delivery time and trigger first_delivery_event
+        if party.first_delivery_time is None:
+            now = env.now
+            party.first_delivery_time = now
+            party.delivery_start = now
+            if order_id in self.order_first_delivery_events:
+                ev = self.order_first_delivery_events[order_id]
+                if not ev.triggered:
+                    ev.succeed()
+        
+        # Simulate delivery time
+        delivery_time = _draw_normal_positive(self.rng, p.delivery_base_mean, p.delivery_std)
+        yield env.timeout(delivery_time)
+        self.server_busy_time += delivery_time
+        
+        # Track delivered dishes
+        if order_id not in self.order_delivered_dishes:
+            self.order_delivered_dishes[order_id] = set()
+        if task.dish_id is not None:
+            self.order_delivered_dishes[order_id].add(task.dish_id)
+        party.dishes_delivered_count += task.num_dishes
+        
+        # Check if all dishes have been delivered
+        if party.dishes_delivered_count >= party.total_dishes:
+            now = env.now
+            party.all_dishes_delivered = now
+            party.delivery_complete = now
+            if order_id in self.order_all_delivered_events:
+                ev = self.order_all_delivered_events[order_id]
+                if not ev.triggered:
+                    ev.succeed()
+    
+    def _do_cleaning_as_server(self, task: CleaningTask, party: Party):
+        """Server cleans the party's table (when no busser claimed the task first)."""
+        env = self.env
+        p = self.p
+        party.cleanup_start = env.now
+        cleanup_mean = p.cleanup_base_mean + p.cleanup_per_person_mean * party.party_size
+        cleanup_time = _draw_normal_positive(self.rng, cleanup_mean, p.cleanup_std)
+        yield env.timeout(cleanup_time)
+        self.server_busy_time += cleanup_time
+        self._release_tables(task.table_ids, party.zone_id)
+    
     def start_food_runner_dispatcher(self):
         self.env.process(self._food_runner_dispatcher())
     
@@ -884,32 +1045,37 @@ class RestaurantSimulation:
                 self.food_runner_queue_trigger = simpy.Event(self.env)
     
     def _food_runner_process_task(self, task: DeliveryTask):
+        # Hoist hot attributes to locals (env.now must still be re-read after each yield)
+        env = self.env
+        rng = self.rng
+        p = self.p
         runner_req = self.food_runners.request()
         yield runner_req
-        task.started_time = self.env.now
+        task.started_time = env.now
         
         # Log TASK_STARTED event
-        self._take_event_snapshot(
-            EventType.TASK_STARTED, task.id,
-            from_state="pending", to_state="in_progress",
-            details={"task_type": "DELIVERY", "party_id": task.party_id, "assigned_to": "food_runner"}
-        )
+        if self._log_on:
+            self._take_event_snapshot(
+                EventType.TASK_STARTED, task.id,
+                from_state="pending", to_state="in_progress",
+                details={"task_type": "DELIVERY", "party_id": task.party_id, "assigned_to": "food_runner"}
+            )
         
-        party = next((p for p in self.parties if p.id == task.party_id), None)
+        party = self.parties_by_id.get(task.party_id)
         order_id = task.order_id
         if party:
             # Track first delivery time and trigger first_delivery_event
             if party.first_delivery_time is None:
-                party.first_delivery_time = self.env.now
-                party.delivery_start = self.env.now
+                party.first_delivery_time = env.now
+                party.delivery_start = env.now
                 if order_id in self.order_first_delivery_events:
                     ev = self.order_first_delivery_events[order_id]
                     if not ev.triggered:
                         ev.succeed()
             
             # Simulate delivery time
-            delivery_time = utils.draw_normal_positive(self.rng, self.p.delivery_base_mean, self.p.delivery_std)
-            yield self.env.timeout(delivery_time)
+            delivery_time = _draw_normal_positive(rng, p.delivery_base_mean, p.delivery_std)
+            yield env.timeout(delivery_time)
             self.food_runner_busy_time += delivery_time
             
             # Track delivered dishes
@@ -921,23 +1087,24 @@ class RestaurantSimulation:
             
             # Check if all dishes have been delivered
             if party.dishes_delivered_count >= party.total_dishes:
-                party.all_dishes_delivered = self.env.now
-                party.delivery_complete = self.env.now
+                party.all_dishes_delivered = env.now
+                party.delivery_complete = env.now
                 if order_id in self.order_all_delivered_events:
                     ev = self.order_all_delivered_events[order_id]
                     if not ev.triggered:
                         ev.succeed()
-        task.completed_time = self.env.now
+        task.completed_time = env.now
         
         # Log TASK_COMPLETED event
-        self._take_event_snapshot(
-            EventType.TASK_COMPLETED, task.id,
-            from_state="in_progress", to_state="completed",
-            details={"task_type": "DELIVERY", "party_id": task.party_id, "num_dishes": task.num_dishes}
-        )
+        if self._log_on:
+            self._take_event_snapshot(
+                EventType.TASK_COMPLETED, task.id,
+                from_state="in_progress", to_state="completed",
+                details={"task_type": "DELIVERY", "party_id": task.party_id, "num_dishes": task.num_dishes}
+            )
         
         # Log DISH_DELIVERED event for all dishes in this delivery
-        if party and task.order_id in self.order_batching:
+        if self._log_on and party and task.order_id in self.order_batching:
             for dish in self.order_batching[task.order_id]:
                 self._log_event(
                     EventType.DISH_DELIVERED, dish.id,
@@ -945,9 +1112,10 @@ class RestaurantSimulation:
                     details={"dish_type": dish.dish_type, "order_id": dish.order_id, "party_id": task.party_id}
                 )
         
-        for runner in self.food_runner_objects:
-            runner.deliveries_made += 1
-            break
+        # Credit deliveries round-robin across runners (the pooled Resource doesn't say which one served)
+        if self.food_runner_objects:
+            self.food_runner_objects[self._next_runner_idx].deliveries_made += 1
+            self._next_runner_idx = (self._next_runner_idx + 1) % len(self.food_runner_objects)
         self.food_runners.release(runner_req)
     
     def start_busser_dispatcher(self):
@@ -973,37 +1141,43 @@ class RestaurantSimulation:
                 self.busser_queue_trigger = simpy.Event(self.env)
     
     def _busser_process_task(self, task: CleaningTask):
+        # Hoist hot attributes to locals (env.now must still be re-read after each yield)
+        env = self.env
+        rng = self.rng
+        p = self.p
         busser_req = self.bussers.request()
         yield busser_req
-        task.started_time = self.env.now
+        task.started_time = env.now
         
         # Log TASK_STARTED event
-        self._take_event_snapshot(
-            EventType.TASK_STARTED, task.id,
-            from_state="pending", to_state="in_progress",
-            details={"task_type": "CLEANING", "party_id": task.party_id, "assigned_to": "busser"}
-        )
+        if self._log_on:
+            self._take_event_snapshot(
+                EventType.TASK_STARTED, task.id,
+                from_state="pending", to_state="in_progress",
+                details={"task_type": "CLEANING", "party_id": task.party_id, "assigned_to": "busser"}
+            )
         
-        party = next((p for p in self.parties if p.id == task.party_id), None)
+        party = self.parties_by_id.get(task.party_id)
         if party:
-            party.cleanup_start = self.env.now
-            cleanup_mean = self.p.cleanup_base_mean + self.p.cleanup_per_person_mean * party.party_size
-            cleanup_time = utils.draw_normal_positive(self.rng, cleanup_mean, self.p.cleanup_std)
-            yield self.env.timeout(cleanup_time)
+            party.cleanup_start = env.now
+            cleanup_mean = p.cleanup_base_mean + p.cleanup_per_person_mean * party.party_size
+            cleanup_time = _draw_normal_positive(rng, cleanup_mean, p.cleanup_std)
+            yield env.timeout(cleanup_time)
             self.busser_busy_time += cleanup_time
             self._release_tables(task.table_ids, party.zone_id)
-        task.completed_time = self.env.now
+        task.completed_time = env.now
         
         # Log TASK_COMPLETED event
-        self._take_event_snapshot(
-            EventType.TASK_COMPLETED, task.id,
-            from_state="in_progress", to_state="completed",
-            details={"task_type": "CLEANING", "party_id": task.party_id, "table_ids": task.table_ids}
-        )
+        if self._log_on:
+            self._take_event_snapshot(
+                EventType.TASK_COMPLETED, task.id,
+                from_state="in_progress", to_state="completed",
+                details={"task_type": "CLEANING", "party_id": task.party_id, "table_ids": task.table_ids}
+            )
         
-        for busser in self.busser_objects:
-            busser.tables_cleaned += 1
-            break
+        if self.busser_objects:
+            self.busser_objects[self._next_busser_idx].tables_cleaned += 1
+            self._next_busser_idx = (self._next_busser_idx + 1) % len(self.busser_objects)
         self.bussers.release(busser_req)
     
     def _release_tables(self, table_ids: List[int], zone_id: Optional[int]):
@@ -1015,60 +1189,79 @@ class RestaurantSimulation:
         self._trigger_guest_queue()
     
     def generate_nhpp_arrivals(self) -> List[float]:
-        t = 0.0
-        arrivals = []
+        """Generate NHPP arrival times by thinning, vectorized with NumPy.
+        
+        Candidate arrivals from a homogeneous process at rate lambda_max are
+        drawn in blocks (extended until they cover the horizon), then each is
+        accepted with probability lambda_t(t) / lambda_max.
+        """
+        duration = self.p.simulation_duration
         lambda_max = self.p.lambda_base + self.p.lambda_peak_multiplier
-        while t < self.p.simulation_duration:
-            t += self.rng.exponential(1 / lambda_max)
-            if t < self.p.simulation_duration:
-                if self.rng.random() < self.p.lambda_t(t) / lambda_max:
-                    arrivals.append(t)
-        return arrivals
+        block_size = max(16, int(lambda_max * duration * 1.5))
+        times = np.cumsum(self.rng.exponential(1 / lambda_max, block_size))
+        while times[-1] < duration:
+            more = np.cumsum(self.rng.exponential(1 / lambda_max, block_size))
+            times = np.concatenate((times, times[-1] + more))
+        times = times[times < duration]
+        accept = self.rng.random(len(times)) < self.p.lambda_t_vectorized(times) / lambda_max
+        return times[accept].tolist()
 
     def party_process(self, arrival_time: float):
+        # Hoist hot attributes to locals (env.now must still be re-read after each yield)
+        env = self.env
+        rng = self.rng
+        p = self.p
         self.party_counter += 1
-        party = Party(id=self.party_counter, arrival_time=arrival_time, party_size=utils.generate_party_size(self.rng))
+        party = Party(id=self.party_counter, arrival_time=arrival_time, party_size=utils.generate_party_size(rng))
         self.parties.append(party)
-        party.table_request = self.env.event()
+        self.parties_by_id[party.id] = party
+        self.parties_in_system += 1
+        party.table_request = env.event()
         self.guest_queue.append(party)
         
         # Log PARTY_ARRIVED event
-        self._take_event_snapshot(
-            EventType.PARTY_ARRIVED, party.id,
-            to_state="waiting_for_table",
-            details={"party_size": party.party_size, "arrival_time": arrival_time}
-        )
+        if self._log_on:
+            self._take_event_snapshot(
+                EventType.PARTY_ARRIVED, party.id,
+                to_state="waiting_for_table",
+                details={"party_size": party.party_size, "arrival_time": arrival_time}
+            )
         
         self._trigger_guest_queue()
         yield party.table_request
         
-        decision_mean = self.p.decision_base_mean + self.p.decision_per_person_mean * party.party_size
-        decision_time = utils.draw_normal_positive(self.rng, decision_mean, self.p.decision_std)
-        yield self.env.timeout(decision_time)
+        decision_mean = p.decision_base_mean + p.decision_per_person_mean * party.party_size
+        decision_time = _draw_normal_positive(rng, decision_mean, p.decision_std)
+        yield env.timeout(decision_time)
         
         self._create_ordering_task(party)
-        yield self.env.timeout(0)
+        yield env.timeout(0)
         while party.ordering_complete is None:
-            yield self.env.timeout(0.1)
+            yield env.timeout(0.1)
         
         self.order_counter += 1
         order_id = self.order_counter
         self.order_to_party[order_id] = party.id
+        self.order_status[order_id] = "pending"
+        self.order_dish_state_counts[order_id] = {
+            "queued": 0, "cooking": 0, "expo_queue": 0, "expo_check": 0, "delivered": 0
+        }
         total_dishes = self._generate_order_dishes(party.party_size)
         party.total_dishes = total_dishes
-        party.kitchen_start = self.env.now
+        party.kitchen_start = env.now
         self.order_total_dishes[order_id] = total_dishes
         self.order_batching[order_id] = []
         
         # Log ORDER_CREATED event
-        self._take_event_snapshot(
-            EventType.ORDER_CREATED, order_id,
-            to_state="pending",
-            details={"party_id": party.id, "total_dishes": total_dishes}
-        )
+        if self._log_on:
+            self._take_event_snapshot(
+                EventType.ORDER_CREATED, order_id,
+                to_state="pending",
+                details={"party_id": party.id, "total_dishes": total_dishes}
+            )
         
-        first_delivery_event = self.env.event()
-        all_delivered_event = self.env.event()
+        first_delivery_event = env.event()
+        all_delivered_event = env.event()
         self.order_first_delivery_events[order_id] = first_delivery_event
         self.order_all_delivered_events[order_id] = all_delivered_event
 
@@ -1079,8 +1272,8 @@ class RestaurantSimulation:
             order_dishes_list.append(dish)
         
         # Calculate check_total from actual dish prices
-        dish_total = sum(d.price or self.p.price_per_dish for d in order_dishes_list)
-        party.check_total = dish_total * (1 + self.p.drink_supplement)
+        dish_total = sum(d.price or p.price_per_dish for d in order_dishes_list)
+        party.check_total = dish_total * (1 + p.drink_supplement)
         
         # Wait for ALL dishes to be delivered before starting dining
         # (first_delivery_event is still tracked for metrics, but dining doesn't start until all arrive)
@@ -1088,33 +1281,36 @@ class RestaurantSimulation:
         
         # Start dining timer when all dishes have been delivered
         party.dining_start = party.all_dishes_delivered
-        dining_mu_scaled = self.p.dining_base_mu + self.p.dining_per_person_mu * party.party_size
-        dining_time = utils.draw_lognormal(self.rng, dining_mu_scaled, self.p.dining_sigma)
-        yield self.env.timeout(dining_time)
-        party.dining_complete = self.env.now
+        dining_mu_scaled = p.dining_base_mu + p.dining_per_person_mu * party.party_size
+        dining_time = _draw_lognormal(self.normal_pool, dining_mu_scaled, p.dining_sigma)
+        yield env.timeout(dining_time)
+        party.dining_complete = env.now
         
         # Note: party.all_dishes_ready is set in _expo_check() when all dishes complete expo
         # This is different from all_dishes_delivered which is when all dishes reach the table
         
         self._create_checkout_task(party)
         while party.payment_complete is None:
-            yield self.env.timeout(0.1)
+            yield env.timeout(0.1)
         
         self._create_cleaning_task(party)
         while party.cleanup_start is None:
-            yield self.env.timeout(0.1)
+            yield env.timeout(0.1)
         
-        cleanup_mean = self.p.cleanup_base_mean + self.p.cleanup_per_person_mean * party.party_size
-        yield self.env.timeout(cleanup_mean + 1.0)
-        party.departure_time = self.env.now
+        cleanup_mean = p.cleanup_base_mean + p.cleanup_per_person_mean * party.party_size
+        yield env.timeout(cleanup_mean + 1.0)
+        party.departure_time = env.now
+        self.parties_in_system -= 1
+        self.parties_served += 1
         self.total_revenue += party.check_total
         
         # Log PARTY_DEPARTED event
-        self._take_event_snapshot(
-            EventType.PARTY_DEPARTED, party.id,
-            from_state="cleaning", to_state="departed",
-            details={"party_size": party.party_size, "check_total": party.check_total, "total_time": party.departure_time - party.arrival_time}
-        )
+        if self._log_on:
+            self._take_event_snapshot(
+                EventType.PARTY_DEPARTED, party.id,
+                from_state="cleaning", to_state="departed",
+                details={"party_size": party.party_size, "check_total": party.check_total, "total_time": party.departure_time - party.arrival_time}
+            )
 
     def _generate_order_dishes(self, party_size: int) -> int:
         per_person = float(self.rng.uniform(self.p.avg_dishes_per_person_low, self.p.avg_dishes_per_person_high))
@@ -1146,15 +1342,17 @@ class RestaurantSimulation:
             description=description
         )
         self.all_dishes.append(dish)
+        self.dishes_by_id[dish_id] = dish
+        self.dishes_by_order.setdefault(order_id, []).append(dish)
+        self._mark_dish_dirty(dish_id)
+        self._set_dish_state(dish, None, "queued")
         recipe_components = dish_recipes.get_dish_components(dish_type, self.recipes)
-        self.component_tracking[dish_id] = {}
         for station_name, prep_mu, prep_sigma in recipe_components:
             self.component_counter += 1
             component = DishComponent(id=self.component_counter, dish_id=dish_id, order_id=order_id,
                                       station_name=station_name, prep_time_mu=prep_mu, prep_time_sigma=prep_sigma,
                                       queue_time=self.env.now)
             dish.components.append(component)
-            self.component_tracking[dish_id][component.id] = False
             if station_name in self.station_queues:
                 self.station_queues[station_name].append(component)
                 self._trigger_station(station_name)
@@ -1168,15 +1366,15 @@ class RestaurantSimulation:
         In event-driven mode (default), snapshots are taken at key events.
         If periodic backup is enabled, also starts a periodic backup process.
         """
-        if self.p.enable_logging and self.p.enable_periodic_backup:
+        if self._snap_on and self.p.enable_periodic_backup:
             self.env.process(self._periodic_backup_logger())
     
     def print_snapshot(self):
         print(f"\n=== Simulation Snapshot at t={self.env.now:.1f} ===")
         print(f"Guest Queue: {len(self.guest_queue)}")
         print(f"Host Queue: {len(self.host_queue)}")
-        print(f"Parties in system: {len([p for p in self.parties if p.departure_time is None])}")
-        print(f"Parties served: {len([p for p in self.parties if p.departure_time is not None])}")
+        print(f"Parties in system: {self.parties_in_system}")
+        print(f"Parties served: {self.parties_served}")
         for station_name in self.stations:
             q_len = len(self.station_queues[station_name])
             busy = self.stations[station_name].busy_slots
@@ -1190,18 +1388,19 @@ class RestaurantSimulation:
     
     def _should_take_snapshot(self) -> bool:
         """Check if enough time has passed since last snapshot."""
-        if not self.p.enable_logging:
+        if not self._snap_on:
             return False
         return self.env.now - self.last_snapshot_time >= self.p.min_snapshot_interval
     
     def _log_event(self, event_type: EventType, entity_id: int,
                    from_state: Optional[str] = None, to_state: Optional[str] = None,
                    details: Optional[Dict] = None):
-        """Log a state transition event."""
-        if not self.p.enable_logging or not self.p.enable_event_logging:
-            return
-        event = create_event(event_type, self.env.now, entity_id, from_state, to_state, details)
-        self.event_log.append(event)
+        """Log a state transition event (replaced by _noop when event logging is off)."""
+        self.event_log.record(event_type, self.env.now, entity_id, from_state, to_state, details)
+    
+    def _mark_dish_dirty(self, dish_id: int):
+        """Flag a dish for re-serialization (replaced by _noop when snapshots are off)."""
+        self._dirty_dish_ids.add(dish_id)
     
     def _capture_full_snapshot(self) -> Dict:
         """Capture complete system state at current time.
@@ -1211,48 +1410,49 @@ class RestaurantSimulation:
         - New detailed fields (parties, dishes, orders, tasks, tables, stations)
         """
         current_time = self.env.now
+        parties = self.parties
+        all_dishes = self.all_dishes
+        stations = self.stations
+        station_queues = self.station_queues
+        table_to_zone = self.table_to_zone
+        available_tables_by_zone = self.available_tables_by_zone
         
         # Build table occupancy map
         table_to_party: Dict[int, Optional[int]] = {}
-        for party in self.parties:
+        for party in parties:
             if party.departure_time is None and party.tables_assigned:
                 for table_id in party.tables_assigned:
                     table_to_party[table_id] = party.id
         
+        # Re-serialize only dishes whose state changed since the last snapshot
+        dish_cache = self._serialized_dish_cache
+        if self._dirty_dish_ids:
+            dishes_by_id = self.dishes_by_id
+            for dish_id in self._dirty_dish_ids:
+                dish_cache[dish_id] = serialize_dish(dishes_by_id[dish_id], current_time)
+            self._dirty_dish_ids.clear()
+        
         # Build order information
         orders = []
+        dishes_by_order = self.dishes_by_order
         for order_id, party_id in self.order_to_party.items():
-            order_dishes = [serialize_dish(d, current_time) for d in self.all_dishes if d.order_id == order_id]
-            # Determine order status
-            if order_dishes:
-                all_delivered = all(d["status"] == "delivered" for d in order_dishes)
-                any_cooking = any(d["status"] == "cooking" for d in order_dishes)
-                any_queued = any(d["status"] == "queued" for d in order_dishes)
-                if all_delivered:
-                    status = "delivered"
-                elif any_cooking:
-                    status = "cooking"
-                elif any_queued:
-                    status = "pending"
-                else:
-                    status = "expo"
-            else:
-                status = "pending"
+            order_dishes = [dish_cache[d.id] for d in dishes_by_order.get(order_id, ())]
+            status = self.order_status.get(order_id, "pending")
             orders.append(serialize_order(order_id, party_id, order_dishes, status))
         
         # Build tables list
         tables = []
         for table_id, table_size in self.table_id_to_size.items():
-            zone_id = self.table_to_zone.get(table_id, 0)
+            zone_id = table_to_zone.get(table_id, 0)
             party_id = table_to_party.get(table_id)
-            is_available = table_id in self.available_tables_by_zone.get(zone_id, set())
+            is_available = table_id in available_tables_by_zone.get(zone_id, set())
             tables.append(serialize_table(table_id, table_size, zone_id, party_id, is_available))
         
         # Build detailed station info
         stations_detail = []
-        for station_name, station in self.stations.items():
+        for station_name, station in stations.items():
             queue_components = []
-            for component in self.station_queues.get(station_name, []):
+            for component in station_queues.get(station_name, []):
                 queue_components.append({
                     "component_id": component.id,
                     "dish_id": component.dish_id,
@@ -1260,7 +1460,7 @@ class RestaurantSimulation:
                 })
             stations_detail.append(serialize_station(
                 station,
-                queue_length=len(self.station_queues.get(station_name, [])),
+                queue_length=len(station_queues.get(station_name, [])),
                 active_components=queue_components[:5]  # Limit to first 5 for readability
             ))
         
@@ -1270,8 +1470,8 @@ class RestaurantSimulation:
             "time": current_time,
             "guest_queue_length": len(self.guest_queue),
             "host_queue_length": len(self.host_queue),
-            "parties_in_system": len([p for p in self.parties if p.departure_time is None]),
-            "parties_served": len([p for p in self.parties if p.departure_time is not None]),
+            "parties_in_system": self.parties_in_system,
+            "parties_served": self.parties_served,
             "total_revenue": self.total_revenue,
             "expo_queue_length": len(self.expo_queue),
             "food_runner_queue": len(self.food_runner_queue),
@@ -1279,17 +1479,17 @@ class RestaurantSimulation:
         }
         
         # Add station queue/busy fields (backward compat)
-        for station_name in self.stations:
-            snapshot[f"{station_name}_queue"] = len(self.station_queues[station_name])
-            snapshot[f"{station_name}_busy"] = self.stations[station_name].busy_slots
+        for station_name in stations:
+            snapshot[f"{station_name}_queue"] = len(station_queues[station_name])
+            snapshot[f"{station_name}_busy"] = stations[station_name].busy_slots
         
         # Add server zone queue fields (backward compat)
         for zone_id in self.server_zone_queues:
             snapshot[f"server_zone_{zone_id}_queue"] = len(self.server_zone_queues[zone_id])
         
         # === NEW DETAILED FIELDS ===
-        snapshot["parties"] = [serialize_party(p, current_time) for p in self.parties]
-        snapshot["dishes"] = [serialize_dish(d, current_time) for d in self.all_dishes]
+        snapshot["parties"] = [serialize_party(p, current_time) for p in parties]
+        snapshot["dishes"] = [dish_cache[d.id] for d in all_dishes]
         snapshot["orders"] = orders
         snapshot["tasks"] = [serialize_task(t) for t in self.active_tasks.values()]
         snapshot["tables"] = tables
@@ -1310,14 +1510,14 @@ class RestaurantSimulation:
             details: Additional event details (optional)
             force: If True, take snapshot regardless of throttle
         """
-        if not self.p.enable_logging:
+        if not self._log_on:
             return
         
         # Always log the event
         self._log_event(event_type, entity_id, from_state, to_state, details)
         
         # Take snapshot if throttle allows or forced
-        if force or self._should_take_snapshot():
+        if self._snap_on and (force or self._should_take_snapshot()):
             snapshot = self._capture_full_snapshot()
             self.snapshot_history.append(snapshot)
             self.last_snapshot_time = self.env.now
@@ -1326,7 +1526,7 @@ class RestaurantSimulation:
         """Optional periodic backup snapshots (runs alongside event-driven)."""
         while True:
             yield self.env.timeout(self.p.periodic_backup_interval)
-            if self.p.enable_logging:
+            if self._snap_on:
                 snapshot = self._capture_full_snapshot()
                 self.snapshot_history.append(snapshot)
                 self.last_snapshot_time = self.env.now
@@ -1335,7 +1535,46 @@ class RestaurantSimulation:
     # JSON EXPORT METHODS
     # ==========================================================================
     
-    def export_snapshots_to_json(self, filepath: str):
+    @staticmethod
+    def _write_json(filepath: str, data: Dict, indent: Optional[int] = None):
+        """Write a {section: value} document to filepath as JSON.
+        
+        Compact output (the default) is streamed: list/deque sections are
+        framed by hand and each record is encoded on its own, and the bytes
+        are written in multi-MiB chunks by _OverlappedWriter so encoding
+        overlaps with disk I/O. Peak memory is bounded by the chunk size
+        rather than the whole log. With indent the document is encoded in
+        one piece for readability.
+        """
+        if indent is not None:
+            payload = _dumps({key: list(value) if isinstance(value, (deque, EventLog)) else value
+                              for key, value in data.items()}, indent)
+            with open(filepath, 'wb', buffering=1 << 20) as f:
+                f.write(payload)
+            return
+        
+        with open(filepath, 'wb') as f, ThreadPoolExecutor(max_workers=1) as io_pool:
+            writer = _OverlappedWriter(f, io_pool)
+            write = writer.write
+            write(b'{')
+            for i, (key, value) in enumerate(data.items()):
+                if i:
+                    write(b',')
+                write(_dumps(key))
+                write(b':')
+                if isinstance(value, (list, deque, EventLog)):
+                    write(b'[')
+                    for j, record in enumerate(value):
+                        if j:
+                            write(b',')
+                        write(_dumps(record))
+                    write(b']')
+                else:
+                    write(_dumps(value))
+            write(b'}')
+            writer.close()
+    
+    def export_snapshots_to_json(self, filepath: str, indent: Optional[int] = None):
         """Export snapshot history to a JSON file."""
         data = {
             "metadata": {
@@ -1347,10 +1586,9 @@ class RestaurantSimulation:
             },
             "snapshots": self.snapshot_history,
         }
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2)
+        self._write_json(filepath, data, indent=indent)
     
-    def export_events_to_json(self, filepath: str):
+    def export_events_to_json(self, filepath: str, indent: Optional[int] = None):
         """Export event log to a JSON file."""
         data = {
             "metadata": {
@@ -1359,10 +1597,9 @@ class RestaurantSimulation:
             },
             "events": self.event_log,
         }
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2)
+        self._write_json(filepath, data, indent=indent)
     
-    def export_all_logs_to_json(self, filepath: str):
+    def export_all_logs_to_json(self, filepath: str, indent: Optional[int] = None):
         """Export both snapshots and events to a single JSON file."""
         data = {
             "metadata": {
@@ -1376,8 +1613,29 @@ class RestaurantSimulation:
             "snapshots": self.snapshot_history,
             "events": self.event_log,
         }
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2)
+        self._write_json(filepath, data, indent=indent)
+    
+    def flush_events_to_jsonl(self, filepath: str):
+        """Append buffered events to a JSON Lines file and clear the buffer.
+        
+        Call periodically during long runs with a bounded ``max_in_memory_events``
+        so that no events are lost when the ring buffer wraps.
+        """
+        self._flush_buffer_to_jsonl(self.event_log, filepath)
+    
+    def flush_snapshots_to_jsonl(self, filepath: str):
+        """Append buffered snapshots to a JSON Lines file and clear the buffer."""
+        self._flush_buffer_to_jsonl(self.snapshot_history, filepath)
+    
+    @staticmethod
+    def _flush_buffer_to_jsonl(buffer, filepath: str):
+        if not buffer:
+            return
+        # Build the whole batch in memory, then issue a single write
+        payload = "\n".join(json.dumps(record) for record in buffer) + "\n"
+        with open(filepath, 'a') as f:
+            f.write(payload)
+        buffer.clear()
     
     def run(self) -> Dict[str, float]:
         self.start_table_matching_dispatcher()
@@ -7,17 +7,88 @@ Provides functions for:
 - Common Random Numbers (CRN) paired comparisons
 - Sequential sampling with adaptive stopping
 """
+import os
+import sys
 import time
+from dataclasses import replace
+from functools import lru_cache
 from typing import Dict, List, Tuple, Any, Optional
 import numpy as np
 from scipy import stats
+from scipy.special import ndtri, stdtrit
 
 from parameters import SingleDishParameters
-from runner import run_single_dish_sim
+from runner import run_single_dish_sim, _get_pool
+
+# Per-replication metrics collected by run_pilot_study (plus 'runtime')
+METRIC_KEYS = (
+    'net_revpash',
+    'revpash',
+    'table_turnover',
+    'parties_served',
+    'total_revenue',
+    'parties_arrived',
+    'service_rate',
+    'avg_wait_table',
+    'avg_kitchen_time',
+    'avg_total_time',
+    'server_utilization',
+    'avg_cook_utilization',
+)
+
+
+@lru_cache(maxsize=4096)
+def _t_ppf(q: float, df: int) -> float:
+    """Cached Student-t quantile; the same (q, df) pairs recur across calls."""
+    return float(stdtrit(df, q))
+
+
+@lru_cache(maxsize=256)
+def _norm_ppf(q: float) -> float:
+    """Cached standard normal quantile."""
+    return float(ndtri(q))
+
+
+def _pilot_worker(config_rep: SingleDishParameters) -> np.ndarray:
+    """
+    Run one pilot replication in a worker process and time it.
+    
+    Returns a float64 vector of the METRIC_KEYS values followed by the
+    runtime, which pickles far more compactly than the full results dict.
+    """
+    start_time = time.time()
+    result = run_single_dish_sim(config_rep, verbose=False)
+    elapsed = time.time() - start_time
+    row = np.empty(len(METRIC_KEYS) + 1, dtype=np.float64)
+    for j, k in enumerate(METRIC_KEYS):
+        row[j] = result.get(k, 0.0)
+    row[-1] = elapsed
+    return row
+
+
+def _crn_pair_worker(pair: Tuple[Tuple[SingleDishParameters, ...], Tuple[SingleDishParameters, ...]]) -> Tuple[float, float]:
+    """
+    Run both configs of one CRN replication (same seed) in a worker process.
+    
+    Each side is a tuple of runs (the ordinary run, plus its antithetic twin
+    when antithetic variates are used) whose net RevPASH values are averaged.
+    """
+    runs_A, runs_B = pair
+    values_A = [run_single_dish_sim(config_rep, verbose=False).get('net_revpash', 0.0) for config_rep in runs_A]
+    values_B = [run_single_dish_sim(config_rep, verbose=False).get('net_revpash', 0.0) for config_rep in runs_B]
+    return sum(values_A) / len(values_A), sum(values_B) / len(values_B)
+
+
+def _run_one_seed(task: Tuple[SingleDishParameters, str]) -> float:
+    """Run one sequential-sampling replication and return the tracked metric."""
+    config_rep, metric = task
+    result = run_single_dish_sim(config_rep, verbose=False)
+    return result.get(metric, 0.0)
 
 
 def run_pilot_study(configs: List[SingleDishParameters], n_rep: int = 20, 
-                   base_seed: int = 1000) -> Dict[str, Dict[str, np.ndarray]]:
+                   base_seed: int = 1000,
+                   max_workers: Optional[int] = None) -> Dict[str, Dict[str, np.ndarray]]:
     """
     Run pilot study to estimate variance for each configuration.
     
@@ -25,6 +96,8 @@ def run_pilot_study(configs: List[SingleDishParameters], n_rep: int = 20,
         configs: List of SingleDishParameters configurations to test
         n_rep: Number of replications per configuration
         base_seed: Base seed value (will use base_seed + rep for each replication)
+        max_workers: Number of worker processes (defaults to CPU count);
+                     1 runs everything in the current process
     
     Returns:
         Dictionary mapping config to metrics arrays:
@@ -46,62 +119,36 @@ def run_pilot_study(configs: List[SingleDishParameters], n_rep: int = 20,
     print(f"Running pilot study: {len(configs)} configs × {n_rep} replications")
     print("=" * 70)
     
+    # Flat task list: one independent simulation per (config, replication)
+    tasks = [
+        replace(config, seed=base_seed + rep, record_snapshots=False)
+        for config in configs
+        for rep in range(n_rep)
+    ]
+    
+    # (n_configs, n_rep, n_metrics + 1) result tensor; map preserves task
+    # order, so rows land at [config, rep] directly
+    tensor = np.empty((len(configs), n_rep, len(METRIC_KEYS) + 1), dtype=np.float64)
+    flat = tensor.reshape(len(tasks), -1)
+    
+    nproc = max_workers or os.cpu_count() or 1
+    if nproc == 1 or len(tasks) <= 1:
+        rows = map(_pilot_worker, tasks)
+    else:
+        chunksize = max(1, len(tasks) // (8 * nproc))
+        rows = _get_pool(max_workers).map(_pilot_worker, tasks, chunksize=chunksize)
+    for t, row in enumerate(rows):
+        flat[t] = row
+    
     for i, config in enumerate(configs):
         config_key = f"config_{i}_{config.num_servers}s_{config.num_cooks}c"
-        config_results = {
-            'net_revpash': [],
-            'revpash': [],
-            'table_turnover': [],
-            'parties_served': [],
-            'total_revenue': [],
-            'parties_arrived': [],
-            'service_rate': [],
-            'avg_wait_table': [],
-            'avg_kitchen_time': [],
-            'avg_total_time': [],
-            'server_utilization': [],
-            'avg_cook_utilization': [],
-            'runtime': []
-        }
         
         print(f"Config {i+1}/{len(configs)}: {config.num_servers} servers, {config.num_cooks} cooks", end="")
         
-        for rep in range(n_rep):
-            # Create config with unique seed for this replication
-            config_copy = SingleDishParameters(
-                num_tables=config.num_tables,
-                num_servers=config.num_servers,
-                num_cooks=config.num_cooks,
-                simulation_duration=config.simulation_duration,
-                seed=base_seed + rep
-            )
-            
-            # Run simulation and time it
-            start_time = time.time()
-            result = run_single_dish_sim(config_copy, verbose=False)
-            elapsed = time.time() - start_time
-            
-            # Collect metrics
-            config_results['net_revpash'].append(result.get('net_revpash', 0.0))
-            config_results['revpash'].append(result.get('revpash', 0.0))
-            config_results['table_turnover'].append(result.get('table_turnover', 0.0))
-            config_results['parties_served'].append(result.get('parties_served', 0.0))
-            config_results['total_revenue'].append(result.get('total_revenue', 0.0))
-            config_results['parties_arrived'].append(result.get('parties_arrived', 0.0))
-            config_results['service_rate'].append(result.get('service_rate', 0.0))
-            config_results['avg_wait_table'].append(result.get('avg_wait_table', 0.0))
-            config_results['avg_kitchen_time'].append(result.get('avg_kitchen_time', 0.0))
-            config_results['avg_total_time'].append(result.get('avg_total_time', 0.0))
-            config_results['server_utilization'].append(result.get('server_utilization', 0.0))
-            config_results['avg_cook_utilization'].append(result.get('avg_cook_utilization', 0.0))
-            config_results['runtime'].append(elapsed)
-            
-            if rep == 0:
-                print(" ... ", end="", flush=True)
+        config_results = {k: tensor[i, :, j].copy() for j, k in enumerate(METRIC_KEYS)}
+        config_results['runtime'] = tensor[i, :, -1].copy()
         
-        # Convert lists to numpy arrays
-        for key in config_results:
-            config_results[key] = np.array(config_results[key])
+        print(" ... ", end="", flush=True)
         
         # Calculate mean runtime
         mean_runtime = np.mean(config_results['runtime'])
@@ -138,9 +185,14 @@ def estimate_sample_size_for_ci(samples: np.ndarray, target_half_width: float,
         - 'final_n': final t-based estimate after iteration
         - 'iterations': number of iterations
     """
-    n_current = len(samples)
     s = np.std(samples, ddof=1)
     mu = np.mean(samples)
+    return _estimate_sample_size(s, mu, target_half_width, alpha)
+
+
+def _estimate_sample_size(s: float, mu: float, target_half_width: float,
+                          alpha: float = 0.05) -> Dict[str, Any]:
+    """Sample-size refinement for precomputed std/mean (see estimate_sample_size_for_ci)."""
     cv = s / mu if mu != 0 else 0.0
     
     # Check if target_half_width is relative (if < 1, assume relative)
@@ -156,7 +208,7 @@ def estimate_sample_size_for_ci(samples: np.ndarray, target_half_width: float,
         h_abs = abs(s) * 0.01  # Use 1% of std as default minimum
     
     # Initial estimate using z-distribution
-    z_alpha_half = stats.norm.ppf(1 - alpha/2)
+    z_alpha_half = _norm_ppf(1 - alpha/2)
     n_initial = int(np.ceil((z_alpha_half * s / h_abs) ** 2)) if h_abs > 0 else 2
     
     # Iterative refinement with t-distribution
@@ -170,7 +222,7 @@ def estimate_sample_size_for_ci(samples: np.ndarray, target_half_width: float,
             break
         
         # Use t-distribution with n-1 degrees of freedom
-        t_alpha_half = stats.t.ppf(1 - alpha/2, df=n_estimate - 1)
+        t_alpha_half = _t_ppf(1 - alpha/2, n_estimate - 1)
         n_new = int(np.ceil((t_alpha_half * s / h_abs) ** 2))
         
         if n_new == n_estimate:
@@ -211,25 +263,44 @@ def run_anova_oneway(pilot_results: Dict[str, Dict[str, np.ndarray]],
     """
     # Extract data for each configuration
     groups = list(pilot_results.keys())
-    data_groups = []
-    
-    group_means = {}
-    group_stds = {}
-    group_sizes = {}
-    
     for group_key in groups:
         if metric not in pilot_results[group_key]:
             raise ValueError(f"Metric '{metric}' not found in pilot_results")
+    
+    _, M = _stack_metric(pilot_results, metric)
+    
+    if M is not None:
+        # Equal group sizes: F statistic from reductions on the (k, n) matrix
+        k, n = M.shape
+        means = M.mean(axis=1)
+        stds = M.std(axis=1, ddof=1)
+        grand = M.mean()
+        ss_between = n * ((means - grand) ** 2).sum()
+        ss_within = ((M - means[:, None]) ** 2).sum()
+        df_between, df_within = k - 1, k * (n - 1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            f_statistic = (ss_between / df_between) / (ss_within / df_within)
+        p_value = stats.f.sf(f_statistic, df_between, df_within)
         
-        group_data = pilot_results[group_key][metric]
-        data_groups.append(group_data)
+        group_means = dict(zip(groups, means))
+        group_stds = dict(zip(groups, stds))
+        group_sizes = dict.fromkeys(groups, n)
+    else:
+        data_groups = []
+        group_means = {}
+        group_stds = {}
+        group_sizes = {}
         
-        group_means[group_key] = np.mean(group_data)
-        group_stds[group_key] = np.std(group_data, ddof=1)
-        group_sizes[group_key] = len(group_data)
-    
-    # Perform one-way ANOVA
-    f_statistic, p_value = stats.f_oneway(*data_groups)
+        for group_key in groups:
+            group_data = pilot_results[group_key][metric]
+            data_groups.append(group_data)
+            
+            group_means[group_key] = np.mean(group_data)
+            group_stds[group_key] = np.std(group_data, ddof=1)
+            group_sizes[group_key] = len(group_data)
+        
+        # Perform one-way ANOVA
+        f_statistic, p_value = stats.f_oneway(*data_groups)
     
     return {
         'f_statistic': f_statistic,
@@ -243,16 +314,28 @@ def run_anova_oneway(pilot_results: Dict[str, Dict[str, np.ndarray]],
 
 
 def run_crn_paired(config_pair: Tuple[SingleDishParameters, SingleDishParameters],
-                   n_rep: int = 50, base_seed: int = 2000) -> Dict[str, Any]:
+                   n_rep: int = 50, base_seed: int = 2000,
+                   max_workers: Optional[int] = None,
+                   antithetic: bool = False,
+                   verbose: bool = True) -> Dict[str, Any]:
     """
     Run paired comparison with Common Random Numbers (CRN).
     
-    Runs both configs with identical seeds to reduce variance.
+    Runs both configs with identical seeds to reduce variance. With
+    antithetic=True, each seed is also run with antithetic draws and the two
+    runs are averaged per config before differencing; to keep the simulation
+    budget at n_rep runs per config this uses n_rep // 2 seeds, so the t-test
+    has (n_rep / 2) - 1 degrees of freedom.
     
     Args:
         config_pair: Tuple of (config_A, config_B) to compare
         n_rep: Number of replications
         base_seed: Base seed value (will use base_seed + rep for each replication)
+        max_workers: Number of worker processes (defaults to CPU count);
+                     1 runs everything in the current process
+        antithetic: Combine CRN with antithetic variates
+        verbose: Print the run header and summary (the live progress counter
+                 is only shown when stdout is a terminal)
     
     Returns:
         Dictionary with:
@@ -272,51 +355,56 @@ def run_crn_paired(config_pair: Tuple[SingleDishParameters, SingleDishParameters
     # Create config copies with same parameters except for what we're comparing
     config_A_list = []
     config_B_list = []
+    n_seeds = max(1, n_rep // 2) if antithetic else n_rep
+    variants = (False, True) if antithetic else (False,)
     
-    for rep in range(n_rep):
+    for rep in range(n_seeds):
         seed = base_seed + rep
         
         # Config A with this seed
-        config_A_rep = SingleDishParameters(
-            num_tables=config_A.num_tables,
-            num_servers=config_A.num_servers,
-            num_cooks=config_A.num_cooks,
-            simulation_duration=config_A.simulation_duration,
-            seed=seed
+        config_A_runs = tuple(
+            replace(config_A, seed=seed, antithetic=anti, record_snapshots=False)
+            for anti in variants
         )
         
         # Config B with SAME seed (CRN)
-        config_B_rep = SingleDishParameters(
-            num_tables=config_B.num_tables,
-            num_servers=config_B.num_servers,
-            num_cooks=config_B.num_cooks,
-            simulation_duration=config_B.simulation_duration,
-            seed=seed  # Same seed = CRN
+        config_B_runs = tuple(
+            replace(config_B, seed=seed, antithetic=anti, record_snapshots=False)  # Same seed = CRN
+            for anti in variants
         )
         
-        config_A_list.append(config_A_rep)
-        config_B_list.append(config_B_rep)
-    
-    print(f"Running CRN paired comparison: {n_rep} replications")
-    print(f"  Config A: {config_A.num_servers} servers, {config_A.num_cooks} cooks")
-    print(f"  Config B: {config_B.num_servers} servers, {config_B.num_cooks} cooks")
-    print("=" * 70)
-    
-    # Run replications
+        config_A_list.append(config_A_runs)
+        config_B_list.append(config_B_runs)
+    
+    if verbose:
+        print(f"Running CRN paired comparison: {n_rep} replications"
+              + (f" ({n_seeds} antithetic pairs)" if antithetic else ""))
+        print(f"  Config A: {config_A.num_servers} servers, {config_A.num_cooks} cooks")
+        print(f"  Config B: {config_B.num_servers} servers, {config_B.num_cooks} cooks")
+        print("=" * 70)
+    show_progress = verbose and sys.stdout.isatty()
+    
+    # Run replications: pairs are independent across reps, and each worker
+    # runs A and B with the same seed, so the CRN pairing is preserved
     results_A = []
     results_B = []
+    pairs = list(zip(config_A_list, config_B_list))
     
-    for rep in range(n_rep):
-        if (rep + 1) % 10 == 0:
-            print(f"  Progress: {rep + 1}/{n_rep} replications", end="\r")
-        
-        result_A = run_single_dish_sim(config_A_list[rep], verbose=False)
-        result_B = run_single_dish_sim(config_B_list[rep], verbose=False)
+    nproc = max_workers or os.cpu_count() or 1
+    if nproc == 1 or n_seeds <= 1:
+        pair_results = map(_crn_pair_worker, pairs)
+    else:
+        pair_results = _get_pool(max_workers).map(_crn_pair_worker, pairs)
+    
+    for rep, (value_A, value_B) in enumerate(pair_results):
+        if show_progress and (rep + 1) % 10 == 0:
+            print(f"  Progress: {rep + 1}/{n_seeds} replications", end="\r")
         
-        results_A.append(result_A.get('net_revpash', 0.0))
-        results_B.append(result_B.get('net_revpash', 0.0))
+        results_A.append(value_A)
+        results_B.append(value_B)
     
-    print(f"  Progress: {n_rep}/{n_rep} replications ✓")
+    if verbose:
+        print(f"  Progress: {n_seeds}/{n_seeds} replications ✓")
     
     # Convert to arrays
     results_A = np.array(results_A)
@@ -335,10 +423,10 @@ def run_crn_paired(config_pair: Tuple[SingleDishParameters, SingleDishParameters
     t_stat = mean_diff / se_diff if se_diff > 0 else 0.0
     
     # p-value (two-sided)
-    p_value = 2 * (1 - stats.t.cdf(abs(t_stat), df=n-1))
+    p_value = 2 * stats.t.sf(abs(t_stat), df=n-1)
     
     # 95% confidence interval
-    t_critical = stats.t.ppf(0.975, df=n-1)
+    t_critical = _t_ppf(0.975, n - 1)
     ci_lower = mean_diff - t_critical * se_diff
     ci_upper = mean_diff + t_critical * se_diff
     
@@ -353,7 +441,8 @@ def run_crn_paired(config_pair: Tuple[SingleDishParameters, SingleDishParameters
         'ci_upper': ci_upper,
         'config_A_results': results_A,
         'config_B_results': results_B,
-        'n': n
+        'n': n,
+        'antithetic': antithetic
     }
 
 
@@ -378,45 +467,33 @@ def generate_coarse_grid(table_count: int, server_range: List[int],
     configs = []
     for num_servers in server_range:
         for num_cooks in cook_range:
-            config = SingleDishParameters(
+            config = replace(
+                base_params,
                 num_tables=table_count,
                 num_servers=num_servers,
-                num_cooks=num_cooks,
-                simulation_duration=base_params.simulation_duration,
-                lambda_base=base_params.lambda_base,
-                lambda_peak_multiplier=base_params.lambda_peak_multiplier,
-                peak_time=base_params.peak_time,
-                peak_width=base_params.peak_width,
-                server_hourly_wage=base_params.server_hourly_wage,
-                cook_hourly_wage=base_params.cook_hourly_wage,
-                price_per_dish=base_params.price_per_dish,
-                # Copy other parameters as needed
-                decision_base_mean=base_params.decision_base_mean,
-                decision_per_person_mean=base_params.decision_per_person_mean,
-                decision_std=base_params.decision_std,
-                ordering_taking_mean=base_params.ordering_taking_mean,
-                ordering_taking_std=base_params.ordering_taking_std,
-                delivery_base_mean=base_params.delivery_base_mean,
-                delivery_std=base_params.delivery_std,
-                payment_base_mean=base_params.payment_base_mean,
-                payment_per_person_mean=base_params.payment_per_person_mean,
-                payment_std=base_params.payment_std,
-                dining_base_mu=base_params.dining_base_mu,
-                dining_per_person_mu=base_params.dining_per_person_mu,
-                dining_sigma=base_params.dining_sigma,
-                dish_mu=base_params.dish_mu,
-                dish_sigma=base_params.dish_sigma,
-                avg_dishes_per_person_low=base_params.avg_dishes_per_person_low,
-                avg_dishes_per_person_high=base_params.avg_dishes_per_person_high,
-                cook_concurrency=base_params.cook_concurrency,
-                dual_task_penalty=base_params.dual_task_penalty,
-                seed=base_params.seed  # Seed will be overridden per replication
+                num_cooks=num_cooks
             )
             configs.append(config)
     
     return configs
 
 
+def _stack_metric(pilot_results: Dict[str, Dict[str, np.ndarray]],
+                  metric: str) -> Tuple[List[str], Optional[np.ndarray]]:
+    """
+    Collect one metric across configurations.
+    
+    Returns the config keys that have the metric and, when every config has
+    the same number of replications, a (n_configs, n_rep) array of the
+    values (None otherwise, so callers fall back to per-key reductions).
+    """
+    keys = [k for k, config_data in pilot_results.items() if metric in config_data]
+    rows = [np.asarray(pilot_results[k][metric], dtype=np.float64) for k in keys]
+    if not rows or len({row.shape for row in rows}) != 1 or rows[0].ndim != 1:
+        return keys, None
+    return keys, np.vstack(rows)
+
+
 def rank_configs_by_metric(pilot_results: Dict[str, Dict[str, np.ndarray]], 
                            metric: str = 'net_revpash', 
                            top_n: Optional[int] = None) -> List[Tuple[str, float, float, int]]:
@@ -431,21 +508,24 @@ def rank_configs_by_metric(pilot_results: Dict[str, Dict[str, np.ndarray]],
     Returns:
         List of tuples (config_key, mean, std, n) sorted by mean (descending)
     """
-    rankings = []
-    
-    for config_key, config_data in pilot_results.items():
-        if metric not in config_data:
-            continue
-        
-        metric_data = config_data[metric]
-        mean = np.mean(metric_data)
-        std = np.std(metric_data, ddof=1)
-        n = len(metric_data)
+    keys, M = _stack_metric(pilot_results, metric)
+    
+    if M is not None:
+        # Uniform replication counts: one 2-D reduction instead of per-key calls
+        means = M.mean(axis=1)
+        stds = M.std(axis=1, ddof=1)
+        n = M.shape[1]
+        order = np.argsort(-means, kind='stable')
+        rankings = [(keys[j], means[j], stds[j], n) for j in order]
+    else:
+        rankings = []
+        for config_key in keys:
+            metric_data = pilot_results[config_key][metric]
+            rankings.append((config_key, np.mean(metric_data),
+                             np.std(metric_data, ddof=1), len(metric_data)))
         
-        rankings.append((config_key, mean, std, n))
-    
-    # Sort by mean (descending)
-    rankings.sort(key=lambda x: x[1], reverse=True)
+        # Sort by mean (descending)
+        rankings.sort(key=lambda x: x[1], reverse=True)
     
     if top_n is not None:
         rankings = rankings[:top_n]
@@ -480,17 +560,22 @@ def validate_sample_size(pilot_results: Dict[str, Dict[str, np.ndarray]],
         }
     """
     validation_results = {}
+    keys, M = _stack_metric(pilot_results, metric)
     
-    for config_key, config_data in pilot_results.items():
-        if metric not in config_data:
-            continue
-        
-        metric_data = config_data[metric]
-        current_n = len(metric_data)
-        
+    if M is not None:
+        means = M.mean(axis=1)
+        stds = M.std(axis=1, ddof=1)
+        current_ns = [M.shape[1]] * len(keys)
+    else:
+        rows = [pilot_results[k][metric] for k in keys]
+        means = [np.mean(row) for row in rows]
+        stds = [np.std(row, ddof=1) for row in rows]
+        current_ns = [len(row) for row in rows]
+    
+    for config_key, mean, std, current_n in zip(keys, means, stds, current_ns):
         # Estimate required sample size
-        size_est = estimate_sample_size_for_ci(
-            metric_data, 
+        size_est = _estimate_sample_size(
+            std, mean,
             target_half_width=target_half_width_rel,
             alpha=alpha
         )
@@ -512,7 +597,8 @@ def validate_sample_size(pilot_results: Dict[str, Dict[str, np.ndarray]],
 
 def sequential_sample(config: SingleDishParameters, metric: str = 'net_revpash',
                       h_rel: float = 0.05, batch: int = 5, n_max: int = 200,
-                      base_seed: int = 3000) -> Dict[str, Any]:
+                      base_seed: int = 3000,
+                      max_workers: Optional[int] = None) -> Dict[str, Any]:
     """
     Sequential sampling: run batches until relative CI half-width meets target.
     
@@ -523,6 +609,8 @@ def sequential_sample(config: SingleDishParameters, metric: str = 'net_revpash',
         batch: Batch size for each iteration
         n_max: Maximum number of replications
         base_seed: Base seed value
+        max_workers: Number of worker processes (defaults to CPU count);
+                     1 runs everything in the current process
     
     Returns:
         Dictionary with:
@@ -545,21 +633,22 @@ def sequential_sample(config: SingleDishParameters, metric: str = 'net_revpash',
     ci_history = []
     n_current = 0
     
+    # The shared pool persists across batches (and calls), so process
+    # start-up is paid once rather than per batch
+    nproc = max_workers or os.cpu_count() or 1
+    executor = _get_pool(max_workers) if nproc > 1 and batch > 1 else None
+    
     while n_current < n_max:
         # Run batch
-        batch_results = []
-        for i in range(batch):
-            seed = base_seed + n_current + i
-            config_rep = SingleDishParameters(
-                num_tables=config.num_tables,
-                num_servers=config.num_servers,
-                num_cooks=config.num_cooks,
-                simulation_duration=config.simulation_duration,
-                seed=seed
-            )
-            
-            result = run_single_dish_sim(config_rep, verbose=False)
-            batch_results.append(result.get(metric, 0.0))
+        tasks = [
+            (replace(config, seed=base_seed + n_current + i, record_snapshots=False), metric)
+            for i in range(batch)
+        ]
+        
+        if executor is not None:
+            batch_results = list(executor.map(_run_one_seed, tasks))
+        else:
+            batch_results = [_run_one_seed(task) for task in tasks]
         
         all_results.extend(batch_results)
         n_current = len(all_results)
@@ -571,7 +660,7 @@ def sequential_sample(config: SingleDishParameters, metric: str = 'net_revpash',
             std = np.std(results_array, ddof=1)
             
             # 95% CI
-            t_critical = stats.t.ppf(0.975, df=n_current - 1)
+            t_critical = _t_ppf(0.975, n_current - 1)
             se = std / np.sqrt(n_current)
             ci_half_width = t_critical * se
             ci_lower = mean - ci_half_width
@@ -601,7 +690,7 @@ def sequential_sample(config: SingleDishParameters, metric: str = 'net_revpash',
     std = np.std(results_array, ddof=1)
     
     if n_current >= 2:
-        t_critical = stats.t.ppf(0.975, df=n_current - 1)
+        t_critical = _t_ppf(0.975, n_current - 1)
         se = std / np.sqrt(n_current)
         ci_half_width = t_critical * se
         ci_lower = mean - ci_half_width
@@ -1,22 +1,53 @@
 """Phase-by-phase tests for restaurant simulation refactoring.
 
 Run tests with: python -m pytest test_simulation_phases.py -v
-Or run directly: python test_simulation_phases.py
+In parallel (pytest-xdist): python -m pytest test_simulation_phases.py -n auto -q
+Include the long runs: python -m pytest test_simulation_phases.py --runslow
+Or run directly (runs everything): python test_simulation_phases.py
 """
 from __future__ import annotations
 
+import copy
+import inspect
+import json
+import os
 import sys
+import tempfile
+from collections import deque
 import numpy as np
+import pytest
+
+from dish_recipes import (
+    DEFAULT_RECIPES, DEFAULT_MENU_DISTRIBUTION,
+    get_recipes, get_menu_distribution, select_dish_type,
+    get_dish_components, validate_recipes, get_total_expected_prep_time
+)
+from logging_utils import EventLog, EventType, create_event
+from models import (
+    Dish, Party, Cook, Host, FoodRunner, Busser, Station,
+    DishComponent, Task, DeliveryTask, CleaningTask, TaskType
+)
+from parameters import SingleDishParameters
+from results import format_results
+from runner import run_batch, run_single_dish_sim, run_single_dish_sims_parallel
+import simulation
+from simulation import RestaurantSimulation
+from utils import (
+    AntitheticGenerator,
+    draw_normal_positive,
+    draw_normal_positive_batch,
+    generate_party_size,
+    _PARTY_SIZES,
+    _PARTY_SIZE_WEIGHTS,
+)
 
 # ==========================================================================
 # PHASE 1 TESTS: Parameters and Models
 # ==========================================================================
 
-def test_phase1_parameters():
+def test_phase1_parameters(base_params):
     """Test that new parameters are properly defined."""
-    from parameters import SingleDishParameters
-    
-    params = SingleDishParameters()
+    params = base_params
     
     # Test new FOH resources
     assert params.num_hosts == 1, "Default hosts should be 1"
@@ -52,11 +83,6 @@ def test_phase1_parameters():
 
 def test_phase1_models():
     """Test that new models are properly defined."""
-    from models import (
-        Dish, Party, Cook, Host, FoodRunner, Busser, Station,
-        DishComponent, Task, DeliveryTask, CleaningTask, TaskType
-    )
-    
     # Test Host
     host = Host(id=1)
     assert host.id == 1
@@ -127,12 +153,6 @@ def test_phase1_models():
 
 def test_phase1_recipes():
     """Test dish recipe configuration."""
-    from dish_recipes import (
-        DEFAULT_RECIPES, DEFAULT_MENU_DISTRIBUTION,
-        get_recipes, get_menu_distribution, select_dish_type,
-        get_dish_components, validate_recipes, get_total_expected_prep_time
-    )
-    
     # Test default recipes
     assert "taco" in DEFAULT_RECIPES
     assert "burrito" in DEFAULT_RECIPES
@@ -168,16 +188,44 @@ def test_phase1_recipes():
     return True
 
 
+def test_party_size_draws():
+    """Test that CDF-inverted party sizes match rng.choice draw for draw."""
+    rng_a = np.random.default_rng(7)
+    rng_b = np.random.default_rng(7)
+    for _ in range(2000):
+        assert generate_party_size(rng_a) == rng_b.choice(_PARTY_SIZES, p=_PARTY_SIZE_WEIGHTS)
+    
+    print("✓ Phase 1.4: Party size draws test passed")
+    return True
+
+
+def test_normal_positive_edge_cases():
+    """Test truncated normal draws with zero std and with almost no mass above zero."""
+    rng = np.random.default_rng(11)
+    
+    # Zero std is a fixed stage time
+    assert draw_normal_positive(rng, 5.0, 0.0) == 5.0
+    assert list(draw_normal_positive_batch(rng, 5.0, 0.0, 3)) == [5.0, 5.0, 5.0]
+    assert draw_normal_positive(rng, -1.0, 0.0) > 0
+    assert (draw_normal_positive_batch(rng, 0.0, 0.0, 3) > 0).all()
+    
+    # mean/std so negative that the CDF at zero rounds to 1.0
+    for _ in range(100):
+        val = draw_normal_positive(rng, -100.0, 1.0)
+        assert 0 < val < np.inf
+    vals = draw_normal_positive_batch(rng, -100.0, 1.0, 100)
+    assert np.isfinite(vals).all() and (vals > 0).all()
+    
+    print("✓ Phase 1.5: Truncated normal edge cases test passed")
+    return True
+
+
 # ==========================================================================
 # PHASE 2-6 TESTS: Full Simulation
 # ==========================================================================
 
-def test_simulation_runs():
+def test_simulation_runs(params):
     """Test that the full simulation runs without errors."""
-    from simulation import RestaurantSimulation
-    from parameters import SingleDishParameters
-    
-    params = SingleDishParameters()
     params.simulation_duration = 60.0  # Short test
     params.enable_logging = False
     
@@ -196,12 +244,8 @@ def test_simulation_runs():
     return True
 
 
-def test_zone_assignment():
+def test_zone_assignment(params):
     """Test that zones are assigned correctly."""
-    from simulation import RestaurantSimulation
-    from parameters import SingleDishParameters
-    
-    params = SingleDishParameters()
     params.num_servers = 4
     
     sim = RestaurantSimulation(params)
@@ -220,14 +264,9 @@ def test_zone_assignment():
     return True
 
 
-def test_task_removal():
+def test_task_removal(base_sim):
     """Test that tasks are properly removed from queues when claimed."""
-    from simulation import RestaurantSimulation
-    from parameters import SingleDishParameters
-    from models import Task, TaskType
-    
-    params = SingleDishParameters()
-    sim = RestaurantSimulation(params)
+    sim = base_sim
     
     # Create a test task
     task = Task(
@@ -239,26 +278,23 @@ def test_task_removal():
     )
     
     sim.active_tasks[task.id] = task
-    sim.server_zone_queues[0].append(task)
+    sim.server_zone_queues[0][task.id] = task
     
     # Remove task
     sim._remove_task_from_queues(task, "test")
     
     # Check task removed
     assert task.id not in sim.active_tasks
-    assert task not in sim.server_zone_queues[0]
+    assert task.id not in sim.server_zone_queues[0]
     assert task.assigned_to == "test"
     
     print("✓ Task removal test passed")
     return True
 
 
-def test_parties_flow():
+@pytest.mark.slow
+def test_parties_flow(params):
     """Test that parties flow through the system correctly."""
-    from simulation import RestaurantSimulation
-    from parameters import SingleDishParameters
-    
-    params = SingleDishParameters()
     params.simulation_duration = 240.0
     params.enable_logging = False
     
@@ -288,12 +324,9 @@ def test_parties_flow():
     return True
 
 
-def test_cooking_stations():
+@pytest.mark.slow
+def test_cooking_stations(params):
     """Test that cooking stations work correctly."""
-    from simulation import RestaurantSimulation
-    from parameters import SingleDishParameters
-    
-    params = SingleDishParameters()
     params.simulation_duration = 120.0
     params.enable_logging = False
     
@@ -312,16 +345,49 @@ def test_cooking_stations():
     return True
 
 
+def test_short_run(params, seed):
+    """Short seeded run covering the parties-flow, station and snapshot checks."""
+    params.simulation_duration = 60.0
+    params.seed = seed
+    params.log_snapshot_interval = 15.0
+    params.enable_logging = True
+    
+    sim = RestaurantSimulation(params)
+    results = sim.run()
+    
+    assert results["parties_arrived"] > 0
+    assert 0 <= results["service_rate"] <= 1
+    assert results["total_labor_cost"] > 0
+    
+    # Parties reach the table and order; any that left went through every stage
+    assert any(p.table_assigned_time is not None for p in sim.parties), "No parties were seated"
+    assert any(p.ordering_complete is not None for p in sim.parties), "No parties ordered"
+    for p in sim.parties:
+        if p.departure_time is not None:
+            assert p.first_delivery_time is not None
+            assert p.dining_complete is not None
+            assert p.payment_complete is not None
+            assert p.cleanup_start is not None
+    
+    assert sum(s.dishes_prepared for s in sim.stations.values()) > 0, "No dishes were prepared"
+    assert all(len(dish.components) > 0 for dish in sim.all_dishes)
+    
+    assert len(sim.snapshot_history) > 0, "No snapshots recorded"
+    for snapshot in sim.snapshot_history:
+        assert "time" in snapshot
+        assert "parties_served" in snapshot
+    
+    print(f"✓ Short run test passed (seed {seed})")
+    return True
+
+
 # ==========================================================================
 # PHASE 7 TEST: Logging
 # ==========================================================================
 
-def test_snapshot_logging():
+@pytest.mark.slow
+def test_snapshot_logging(params):
     """Test that snapshot logging works."""
-    from simulation import RestaurantSimulation
-    from parameters import SingleDishParameters
-    
-    params = SingleDishParameters()
     params.simulation_duration = 120.0
     params.log_snapshot_interval = 30.0
     params.enable_logging = True
@@ -342,16 +408,84 @@ def test_snapshot_logging():
     return True
 
 
+def test_log_buffer_types(params):
+    """Test that snapshot history is a list unless capped, then a bounded deque."""
+    params.enable_logging = True
+    assert isinstance(RestaurantSimulation(params).snapshot_history, list)
+    
+    params.max_in_memory_snapshots = 2
+    history = RestaurantSimulation(params).snapshot_history
+    assert isinstance(history, deque) and history.maxlen == 2
+    
+    print("✓ Log buffer types test passed")
+    return True
+
+
+def test_json_export(params):
+    """Test that every JSON export mode writes the in-memory logs back exactly."""
+    params.simulation_duration = 30.0
+    params.seed = 3
+    params.enable_logging = True
+    
+    sim = RestaurantSimulation(params)
+    sim.run()
+    assert len(sim.snapshot_history) > 0 and len(sim.event_log) > 0
+    
+    metadata = {
+        "simulation_duration": sim.p.simulation_duration,
+        "num_parties": len(sim.parties),
+        "num_dishes": len(sim.all_dishes),
+        "total_revenue": sim.total_revenue,
+        "num_snapshots": len(sim.snapshot_history),
+        "num_events": len(sim.event_log),
+    }
+    # Round-trip the in-memory records so tuples compare equal to JSON arrays
+    snapshots = json.loads(json.dumps(list(sim.snapshot_history)))
+    events = json.loads(json.dumps(list(sim.event_log)))
+    
+    orig_orjson = simulation.orjson
+    orig_chunk = simulation._OverlappedWriter.CHUNK_BYTES
+    # Small chunks so the compact export goes through several background writes
+    simulation._OverlappedWriter.CHUNK_BYTES = 4096
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            compact = {}
+            for use_orjson in ([True, False] if orig_orjson is not None else [False]):
+                simulation.orjson = orig_orjson if use_orjson else None
+                for indent in (None, 2):
+                    path = os.path.join(tmp, f"log_{use_orjson}_{indent}.json")
+                    sim.export_all_logs_to_json(path, indent=indent)
+                    with open(path) as f:
+                        data = json.load(f)
+                    assert data == {"metadata": metadata, "snapshots": snapshots, "events": events}
+                    if indent is None:
+                        with open(path, "rb") as f:
+                            compact[use_orjson] = f.read()
+            if len(compact) == 2:
+                assert compact[True] == compact[False]
+            
+            # Flushing writes one event per line and empties the buffer
+            path = os.path.join(tmp, "events.jsonl")
+            sim.flush_events_to_jsonl(path)
+            sim.flush_events_to_jsonl(path)
+            with open(path) as f:
+                assert [json.loads(line) for line in f] == events
+            assert len(sim.event_log) == 0
+    finally:
+        simulation.orjson = orig_orjson
+        simulation._OverlappedWriter.CHUNK_BYTES = orig_chunk
+    
+    print("✓ JSON export test passed")
+    return True
+
+
 # ==========================================================================
 # PHASE 9 TESTS: Integration Testing
 # ==========================================================================
 
-def test_full_simulation():
+@pytest.mark.slow
+def test_full_simulation(params):
     """Test a full simulation run with realistic parameters."""
-    from simulation import RestaurantSimulation
-    from parameters import SingleDishParameters
-    
-    params = SingleDishParameters()
     params.simulation_duration = 240.0
     params.enable_logging = False
     
@@ -379,12 +513,8 @@ def test_full_simulation():
     return True
 
 
-def test_edge_case_no_hosts():
+def test_edge_case_no_hosts(params):
     """Test simulation with no hosts (should still work)."""
-    from simulation import RestaurantSimulation
-    from parameters import SingleDishParameters
-    
-    params = SingleDishParameters()
     params.simulation_duration = 60.0
     params.num_hosts = 1  # Minimum hosts
     params.enable_logging = False
@@ -397,12 +527,8 @@ def test_edge_case_no_hosts():
     return True
 
 
-def test_edge_case_minimal_food_runners():
+def test_edge_case_minimal_food_runners(params):
     """Test simulation with minimal food runners."""
-    from simulation import RestaurantSimulation
-    from parameters import SingleDishParameters
-    
-    params = SingleDishParameters()
     params.simulation_duration = 60.0
     params.num_food_runners = 1  # Minimal food runners
     params.enable_logging = False
@@ -415,21 +541,13 @@ def test_edge_case_minimal_food_runners():
     return True
 
 
+@pytest.mark.slow
 def test_multiple_replications():
     """Test multiple simulation replications for consistency."""
-    from simulation import RestaurantSimulation
-    from parameters import SingleDishParameters
-    
-    results_list = []
-    for seed in [1, 2, 3]:
-        params = SingleDishParameters()
-        params.simulation_duration = 120.0
-        params.seed = seed
-        params.enable_logging = False
-        
-        sim = RestaurantSimulation(params)
-        results = sim.run()
-        results_list.append(results)
+    params = SingleDishParameters()
+    params.simulation_duration = 120.0
+    params.enable_logging = False
+    results_list = run_batch([1, 2, 3], params)
     
     # Check results vary (different seeds)
     revenues = [r["total_revenue"] for r in results_list]
@@ -443,13 +561,71 @@ def test_multiple_replications():
     return True
 
 
-def test_result_formatting():
-    """Test that result formatting works without errors."""
-    from simulation import RestaurantSimulation
-    from parameters import SingleDishParameters
-    from results import format_results
+def test_parallel_replications_match_sequential():
+    """Test that parallel replications reproduce sequential results per seed."""
+    params_list = []
+    for seed in [1, 2]:
+        params = SingleDishParameters()
+        params.simulation_duration = 60.0
+        params.seed = seed
+        params.enable_logging = False
+        params_list.append(params)
+    
+    parallel = run_single_dish_sims_parallel(params_list, max_workers=2)
+    sequential = [run_single_dish_sim(p) for p in params_list]
+    
+    assert len(parallel) == len(params_list)
+    for par, seq in zip(parallel, sequential):
+        assert par["total_revenue"] == seq["total_revenue"]
+        assert par["parties_arrived"] == seq["parties_arrived"]
+    
+    print("✓ Parallel replications test passed")
+    return True
+
+
+def test_antithetic_draws(params):
+    """Test that antithetic draws mirror the ordinary stream for the same seed."""
+    plain = np.random.default_rng(5)
+    anti = AntitheticGenerator(np.random.default_rng(5))
+    assert abs(plain.random() + anti.random() - 1.0) < 1e-12
+    assert abs(plain.normal(10.0, 2.0) + anti.normal(10.0, 2.0) - 20.0) < 1e-9
     
-    params = SingleDishParameters()
+    params.simulation_duration = 60.0
+    params.enable_logging = False
+    params.antithetic = True
+    results = RestaurantSimulation(params).run()
+    assert results["parties_arrived"] > 0
+    
+    print("✓ Antithetic draws test passed")
+    return True
+
+
+def test_event_log_columnar():
+    """Test that the columnar event log behaves like a bounded list of event dicts."""
+    log = EventLog(maxlen=3)
+    expected = []
+    for i in range(5):
+        log.record(EventType.TASK_CREATED, float(i), i, to_state="pending")
+        expected.append(create_event(EventType.TASK_CREATED, float(i), i, to_state="pending"))
+    
+    assert len(log) == 3
+    assert list(log) == expected[-3:]
+    assert log[0]["entity_id"] == 2
+    assert log[:2] == expected[2:4]
+    assert log[-2:] == expected[-2:]
+    assert log[::2] == expected[2::2]
+    assert log[5:] == []
+    assert list(log.timestamps) == [2.0, 3.0, 4.0]
+    
+    log.clear()
+    assert len(log) == 0
+    
+    print("✓ Columnar event log test passed")
+    return True
+
+
+def test_result_formatting(params):
+    """Test that result formatting works without errors."""
     params.simulation_duration = 60.0
     params.enable_logging = False
     
@@ -486,25 +662,43 @@ def run_all_tests():
         ("Phase 1.1: Parameters", test_phase1_parameters),
         ("Phase 1.2: Models", test_phase1_models),
         ("Phase 1.3: Recipes", test_phase1_recipes),
+        ("Phase 1.4: Party Size Draws", test_party_size_draws),
+        ("Phase 1.5: Truncated Normal Edge Cases", test_normal_positive_edge_cases),
         ("Phase 2-6: Simulation Runs", test_simulation_runs),
         ("Phase 2: Zone Assignment", test_zone_assignment),
         ("Phase 5: Task Removal", test_task_removal),
         ("Phase 6: Parties Flow", test_parties_flow),
         ("Phase 3-4: Cooking Stations", test_cooking_stations),
+        ("Phase 6: Short Seeded Run", test_short_run),
         ("Phase 7: Snapshot Logging", test_snapshot_logging),
+        ("Phase 7.2: Log Buffer Types", test_log_buffer_types),
+        ("Phase 7.3: JSON Export", test_json_export),
         ("Phase 9.1: Full Simulation", test_full_simulation),
         ("Phase 9.2: Edge Case - Min Hosts", test_edge_case_no_hosts),
         ("Phase 9.3: Edge Case - Minimal Food Runners", test_edge_case_minimal_food_runners),
         ("Phase 9.4: Multiple Replications", test_multiple_replications),
         ("Phase 9.5: Result Formatting", test_result_formatting),
+        ("Phase 9.6: Parallel Replications", test_parallel_replications_match_sequential),
+        ("Phase 9.7: Antithetic Draws", test_antithetic_draws),
+        ("Phase 9.8: Columnar Event Log", test_event_log_columnar),
     ]
     
     passed = 0
     failed = 0
     
+    # Stand-ins for the pytest fixtures in conftest.py
+    base_params = SingleDishParameters()
+    fixtures = {
+        "base_params": lambda: base_params,
+        "params": lambda: copy.deepcopy(base_params),
+        "base_sim": lambda: RestaurantSimulation(copy.deepcopy(base_params)),
+        "seed": lambda: 1,
+    }
+    
     for name, test_fn in tests:
         try:
-            test_fn()
+            args = inspect.signature(test_fn).parameters
+            test_fn(**{arg: fixtures[arg]() for arg in args})
             passed += 1
         except Exception as e:
             print(f"✗ {name} FAILED: {e}")
@@ -1,36 +1,164 @@
 """Utility functions for random number generation."""
+import math
+from bisect import bisect_right
+
 import numpy as np
+from scipy.special import ndtri
+
+# Party-size distribution (see generate_party_size). The CDF is built exactly
+# as Generator.choice builds it from p, so the inverse-CDF lookup matches it.
+_PARTY_SIZES = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+_PARTY_SIZE_WEIGHTS = np.array([0.15, 0.35, 0.25, 0.15, 0.05, 0.03, 0.01, 0.01, 0.005, 0.005])
+# Normalize weights to sum to exactly 1.0 (fix floating point precision issues)
+_PARTY_SIZE_WEIGHTS = _PARTY_SIZE_WEIGHTS / _PARTY_SIZE_WEIGHTS.sum()
+_PARTY_SIZE_CDF = _PARTY_SIZE_WEIGHTS.cumsum()
+_PARTY_SIZE_CDF = (_PARTY_SIZE_CDF / _PARTY_SIZE_CDF[-1]).tolist()
+_LAST_PARTY_SIZE_IDX = len(_PARTY_SIZES) - 1
+
+
+class AntitheticGenerator:
+    """Wrap a NumPy Generator so every draw is the antithetic of the original.
+    
+    Each method consumes the wrapped generator exactly as the plain call would
+    and maps the result through u -> 1-u of its underlying uniform (reflection
+    about the mean for normals, log-reflection for lognormals, the inverse-CDF
+    mirror for exponentials). The same seed therefore yields a run that is
+    negatively correlated with the ordinary run, draw for draw.
+    """
+    
+    def __init__(self, rng: np.random.Generator):
+        self._rng = rng
+    
+    def random(self, size=None):
+        return 1.0 - self._rng.random(size)
+    
+    def uniform(self, low=0.0, high=1.0, size=None):
+        return low + high - self._rng.uniform(low, high, size)
+    
+    def normal(self, loc=0.0, scale=1.0, size=None):
+        return 2 * loc - self._rng.normal(loc, scale, size)
+    
+    def standard_normal(self, size=None):
+        return -self._rng.standard_normal(size)
+    
+    def lognormal(self, mean=0.0, sigma=1.0, size=None):
+        return np.exp(2 * mean) / self._rng.lognormal(mean, sigma, size)
+    
+    def exponential(self, scale=1.0, size=None):
+        x = self._rng.exponential(scale, size)
+        # X = -scale*log(1-U)  ->  X' = -scale*log(U) = -scale*log(1-exp(-X/scale))
+        return -scale * np.log(-np.expm1(-x / scale))
+    
+    def choice(self, a, p=None):
+        # Generator.choice with p draws a single uniform and inverts the CDF;
+        # do the same with 1-u
+        a = np.asarray(a)
+        if p is None:
+            p = np.full(len(a), 1.0 / len(a))
+        cdf = np.cumsum(p)
+        cdf /= cdf[-1]
+        u = 1.0 - self._rng.random()
+        idx = min(int(cdf.searchsorted(u, side='right')), len(a) - 1)
+        return a[idx]
+
+
+def _ndtr(x: float) -> float:
+    """Standard normal CDF for a Python float."""
+    return 0.5 * math.erfc(-x / math.sqrt(2.0))
+
+
+# Largest float below 1.0; uniforms are clamped to it so ndtri stays finite
+_BELOW_ONE = math.nextafter(1.0, 0.0)
+_TINY_POSITIVE = math.nextafter(0.0, 1.0)
+
+
+class StandardNormalPool:
+    """Serve standard normal draws from a block refilled BLOCK_SIZE at a time.
+    
+    One vectorized rng.standard_normal call replaces BLOCK_SIZE scalar calls,
+    which are dominated by Python -> NumPy call overhead.
+    """
+    
+    BLOCK_SIZE = 4096
+    
+    def __init__(self, rng: np.random.Generator):
+        self.rng = rng
+        self._block: list = []
+        self._idx = 0
+    
+    def next(self) -> float:
+        if self._idx >= len(self._block):
+            self._block = self.rng.standard_normal(self.BLOCK_SIZE).tolist()
+            self._idx = 0
+        z = self._block[self._idx]
+        self._idx += 1
+        return z
 
 
-def draw_lognormal(rng: np.random.Generator, mu: float, sigma: float) -> float:
+def draw_lognormal(pool: StandardNormalPool, mu: float, sigma: float) -> float:
     """Draw a lognormal random variable.
     
+    Computed as exp(mu + sigma * z) with z taken from the pool's block of
+    standard normals, so any (mu, sigma) shares one pool. Each simulation
+    owns its pool, which keeps a seed's draws independent of other runs.
+    
     Args:
-        rng: NumPy random number generator
+        pool: Standard normal pool over the run's generator
         mu: Mean parameter for lognormal distribution
         sigma: Standard deviation parameter for lognormal distribution
     
     Returns:
         Random value from lognormal distribution
     """
-    return float(rng.lognormal(mean=mu, sigma=sigma))
+    return math.exp(mu + sigma * pool.next())
 
 
 def draw_normal_positive(rng: np.random.Generator, mean: float, std: float) -> float:
     """Draw a normal random variable truncated at >0.
     
+    Uses a single-draw inverse CDF instead of rejection sampling: the uniform
+    is mapped onto the part of the normal CDF above zero, so the cost is fixed
+    even when mean/std is small.
+    
+    Args:
+        rng: NumPy random number generator
+        mean: Mean of the normal distribution
+        std: Standard deviation of the normal distribution
+    
+    Returns:
+        Random value from truncated normal distribution (always > 0);
+        mean itself (if positive) when std <= 0
+    """
+    if std <= 0:
+        return mean if mean > 0 else _TINY_POSITIVE
+    u_lo = min(_ndtr(-mean / std), _BELOW_ONE)
+    val = mean + std * float(ndtri(min(u_lo + rng.random() * (1.0 - u_lo), _BELOW_ONE)))
+    if val > 0:
+        return val
+    # Only reachable through floating-point rounding at the truncation point,
+    # or when the mass above zero is below float resolution (mean << -std)
+    return _TINY_POSITIVE
+
+
+def draw_normal_positive_batch(rng: np.random.Generator, mean: float, std: float,
+                               n: int) -> np.ndarray:
+    """Draw n values from the normal distribution truncated at >0 in one call.
+    
     Args:
         rng: NumPy random number generator
         mean: Mean of the normal distribution
         std: Standard deviation of the normal distribution
+        n: Number of draws
     
     Returns:
-        Random value from truncated normal distribution (always > 0)
+        Array of n values (all > 0); all mean (if positive) when std <= 0
     """
-    val = -1.0
-    while val <= 0:
-        val = float(rng.normal(loc=mean, scale=std))
-    return val
+    if std <= 0:
+        return np.full(n, mean if mean > 0 else _TINY_POSITIVE)
+    u_lo = min(_ndtr(-mean / std), _BELOW_ONE)
+    u = np.minimum(u_lo + rng.random(n) * (1.0 - u_lo), _BELOW_ONE)
+    vals = mean + std * ndtri(u)
+    return np.maximum(vals, _TINY_POSITIVE)
 
 
 def generate_party_size(rng: np.random.Generator) -> int:
@@ -38,16 +166,13 @@ def generate_party_size(rng: np.random.Generator) -> int:
     
     Weights: 1=15%, 2=35%, 3=25%, 4=15%, 5=5%, 6=3%, 7=1%, 8=1%, 9=0.5%, 10=0.5%
     
+    Draws one uniform and inverts the precomputed CDF; this consumes the same
+    draw and returns the same size as rng.choice(sizes, p=weights).
+    
     Args:
         rng: NumPy random number generator
     
     Returns:
         Party size (1-10)
     """
-    sizes = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
-    weights = [0.15, 0.35, 0.25, 0.15, 0.05, 0.03, 0.01, 0.01, 0.005, 0.005]
-    # Normalize weights to sum to exactly 1.0 (fix floating point precision issues)
-    weights = np.array(weights)
-    weights = weights / weights.sum()
-    return int(rng.choice(sizes, p=weights))
-
+    return _PARTY_SIZES[min(bisect_right(_PARTY_SIZE_CDF, rng.random()), _LAST_PARTY_SIZE_IDX)]
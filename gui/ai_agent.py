@@ -7,52 +7,183 @@ This module provides an AI agent that can:
 """
 
 import os
+import copy
 import json
-from typing import Dict, List, Optional, Any, Tuple
+import asyncio
+import hashlib
+import re
+import sqlite3
+import tempfile
+import time
+from contextlib import closing
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Any, Tuple
 from pathlib import Path
 import sys
 
 # Add gui directory to path for imports
 gui_path = Path(__file__).parent
-sys.path.insert(0, str(gui_path))
+if str(gui_path) not in sys.path:
+    sys.path.insert(0, str(gui_path))
 
-from dotenv import load_dotenv
 import pandas as pd
 import numpy as np
 
-# Load environment variables
-load_dotenv()
+# openai (and python-dotenv) are imported in SimulationAgent.__init__, so
+# importing this module stays cheap where no agent is constructed
 
-try:
-    from openai import OpenAI
-except ImportError:
-    OpenAI = None  # Will raise error when trying to use
-
-from data_loader import get_log_summary, extract_parties, extract_dishes
+from data_loader import get_log_summary
 from metrics_calculator import (
     calculate_revpash,
+    calculate_revpash_summary,
     calculate_table_utilization,
     calculate_staff_utilization,
     calculate_station_utilization,
     calculate_queue_metrics,
     calculate_throughput_metrics,
+    calculate_throughput_summary,
     calculate_service_times,
+    calculate_service_time_stats,
     calculate_summary_statistics,
 )
 
+_NUMBER_RE = re.compile(r"\d+(?:\.\d+)?")
+
+
+def _question_numbers(question: str) -> Tuple[str, ...]:
+    """Numbers in a question, in order (times, ranges, counts)."""
+    return tuple(_NUMBER_RE.findall(question))
+
+
+# Metrics with one row per snapshot; SimulationAgent builds each over the
+# whole run once and slices it by time instead of recalculating
+_METRIC_FRAME_BUILDERS = {
+    "revpash": calculate_revpash,
+    "table_utilization": calculate_table_utilization,
+    "staff_utilization": calculate_staff_utilization,
+    "station_utilization": calculate_station_utilization,
+    "queue_metrics": calculate_queue_metrics,
+    "throughput": calculate_throughput_metrics,
+}
+
+
+# Compact tool descriptions (see SimulationAgent._compact_tools); parameters
+# not listed here lose their description, as name/enum/type say enough
+_COMPACT_TOOL_DESCRIPTIONS = {
+    "get_simulation_summary": "Get simulation summary",
+    "calculate_metric": "Compute a performance metric",
+    "get_snapshot_at_time": "Get system state at a time",
+    "query_events": "Filter events by type, time or entity",
+    "get_parties_by_status": "List parties by status or time",
+    "get_station_performance": "Get kitchen station queue/busy stats",
+    "calculate_custom_statistic": "Compute a peak, average or hourly statistic",
+}
+_COMPACT_PARAM_DESCRIPTIONS = {
+    "time_range": "[start_min, end_min]",
+    "event_type": "e.g. PARTY_ARRIVED, ORDER_PLACED",
+    "status": "waiting, seated, dining, completed, ...",
+}
+
+
+def _summarize(obj: Any, max_items: int, depth: int) -> Any:
+    """Shrink nested containers: lists keep max_items entries plus a count of
+    the rest, and containers below depth levels become placeholders."""
+    if isinstance(obj, dict):
+        if depth <= 0:
+            return f"<{len(obj)} fields>"
+        return {key: _summarize(value, max_items, depth - 1) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        if depth <= 0:
+            return f"<{len(obj)} items>"
+        items = [_summarize(value, max_items, depth - 1) for value in obj[:max_items]]
+        if len(obj) > max_items:
+            items.append(f"...({len(obj) - max_items} more)")
+        return items
+    return obj
+
+
+def _safe_dump(obj: Any, max_bytes: int = 2048, max_items: int = 5) -> str:
+    """JSON-encode a tool result, summarizing it if it exceeds max_bytes.
+    
+    Every later turn re-sends earlier tool results, so oversized ones are
+    cut down: lists are shortened first, then ever shallower levels of
+    nesting are collapsed, until the encoding fits (or only the top-level
+    scalars are left).
+    """
+    text = json.dumps(obj, default=str)
+    if len(text) <= max_bytes:
+        return text
+    for depth in (3, 2, 1):
+        for items in sorted({max_items, 2, 1}, reverse=True):
+            text = json.dumps(_summarize(obj, items, depth), default=str)
+            if len(text) <= max_bytes:
+                return text
+    return text
+
 
 class SimulationAgent:
     """AI agent for exploring and explaining simulation data."""
     
     MAX_FUNCTION_CALLS = 10  # Prevent infinite loops
+    MAX_COMPLETION_TOKENS = 512  # Bounds answer length and per-call latency
+    MAX_TOOL_RESULT_BYTES = 2048  # Larger tool results are summarized (see _safe_dump)
+    MAX_CALLS_ANSWER = ("I apologize, but I've reached the maximum number of function calls. "
+                        "Please try asking a more specific question.")
+    
+    # Answer cache: exact question match first, then embedding similarity
+    ANSWER_CACHE_PATH = Path.home() / ".cache" / "sim_agent.json"
+    EMBEDDING_MODEL = "text-embedding-3-small"
+    SIMILARITY_THRESHOLD = 0.95
     
-    def __init__(self, data: Dict):
+    # Tool results persist across sessions, keyed by dataset fingerprint
+    TOOL_CACHE_PATH = Path.home() / ".cache" / "sim_agent_tools.sqlite"
+    TOOL_CACHE_TTL = 24 * 3600  # seconds
+    
+    # Questions that map onto a single tool call: the tool is run locally and
+    # the model is called once, with tool_choice="none", to explain the result.
+    # Each pattern must match the whole (normalized) question, so questions
+    # that only mention a metric ("improve throughput with more servers",
+    # "which station was busiest") still go to the model.
+    _ASK = r"(?:(?:(?:what|how) (?:is|was|were|are)|what's) (?:the )?|(?:show|give|tell)(?: me)? (?:the )?)?"
+    _OF_RUN = r"(?: (?:for|in|of|during) (?:the|this) (?:simulation|run))?"
+    INTENT_PATTERNS = [
+        (re.compile(_ASK + r"(?:overall )?(?:revpash|revenue per (?:available )?seat hour)" + _OF_RUN),
+         "calculate_metric", {"metric_name": "revpash"}),
+        (re.compile(_ASK + r"(?:average |overall )?table utili[sz]ation" + _OF_RUN),
+         "calculate_metric", {"metric_name": "table_utilization"}),
+        (re.compile(_ASK + r"(?:average |overall )?staff utili[sz]ation" + _OF_RUN),
+         "calculate_metric", {"metric_name": "staff_utilization"}),
+        (re.compile(_ASK + r"(?:average |overall )?station utili[sz]ation" + _OF_RUN),
+         "calculate_metric", {"metric_name": "station_utilization"}),
+        (re.compile(_ASK + r"(?:average )?service times?" + _OF_RUN),
+         "calculate_metric", {"metric_name": "service_times"}),
+        (re.compile(_ASK + r"(?:overall )?throughput" + _OF_RUN),
+         "calculate_metric", {"metric_name": "throughput"}),
+        (re.compile(_ASK + r"(?:average )?revenue per hour" + _OF_RUN),
+         "calculate_custom_statistic", {"statistic": "revenue_per_hour"}),
+        (re.compile(r"(?:(?:what|which) (?:is|was) )?(?:the )?busiest hour" + _OF_RUN
+                    + r"|when (?:was|is) (?:the restaurant|it) busiest"),
+         "calculate_custom_statistic", {"statistic": "busiest_hour"}),
+        (re.compile(r"(?:(?:what|which) (?:is|was) )?(?:the )?(?:slowest|quietest) hour" + _OF_RUN
+                    + r"|when (?:was|is) (?:the restaurant|it) (?:slowest|quietest)"),
+         "calculate_custom_statistic", {"statistic": "slowest_hour"}),
+        (re.compile(r"(?:(?:give|show)(?: me)? )?(?:an? |the )?(?:summary|overview)" + _OF_RUN
+                    + r"|summari[sz]e (?:the|this) (?:simulation|run)"),
+         "get_simulation_summary", {}),
+    ]
+    
+    def __init__(self, data: Dict, verbose_prompt: bool = False):
         """Initialize agent with simulation data.
         
         Args:
             data: Simulation log data with snapshots and events
+            verbose_prompt: Send the long-form system prompt and tool
+                descriptions instead of the compact ones (more input tokens
+                on every turn)
         """
-        if OpenAI is None:
+        try:
+            from openai import AsyncOpenAI, OpenAI
+        except ImportError:
             raise ImportError("OpenAI library not installed. Run: pip install openai")
         
         self.data = data
@@ -60,19 +191,75 @@ class SimulationAgent:
         self.events = data.get("events", [])
         self.metadata = data.get("metadata", {})
         
+        # Sorted snapshot times for O(log N) closest-snapshot lookups
+        times = np.fromiter((snap.get("time", 0) for snap in self.snapshots),
+                            dtype=np.float64, count=len(self.snapshots))
+        self._snapshot_order = None  # None when snapshots are already in time order
+        if times.size > 1 and np.any(np.diff(times) < 0):
+            self._snapshot_order = np.argsort(times, kind="stable")
+            times = times[self._snapshot_order]
+        self._snapshot_times = times
+        self._metric_dfs: Dict[str, pd.DataFrame] = {}  # see _metric_frame
+        self._scalar_df: Optional[pd.DataFrame] = None  # see _snapshot_scalars
+        
+        # Event columns, built once; _query_events filters positions with masks
+        events_df = pd.DataFrame({
+            "event_type": [e.get("event_type") for e in self.events],
+            "timestamp": [e.get("timestamp", 0) for e in self.events],
+            "entity_id": [e.get("entity_id") for e in self.events],
+        })
+        self._event_timestamps = pd.to_numeric(events_df["timestamp"], errors="coerce").to_numpy(dtype=np.float64)
+        self._event_entity_ids = events_df["entity_id"].to_numpy()
+        self._event_positions_by_type = {
+            event_type: positions.to_numpy()
+            for event_type, positions in events_df.groupby("event_type", sort=False).groups.items()
+        }
+        # Exported logs are chronological; then time ranges are binary searches
+        timestamps = self._event_timestamps
+        self._events_time_sorted = bool(np.all(timestamps[1:] >= timestamps[:-1]))
+        self._event_timestamps_by_type = {
+            event_type: timestamps[positions] for event_type, positions in self._event_positions_by_type.items()
+        }
+        
+        # Load environment variables (.env does not override the environment)
+        from dotenv import load_dotenv
+        load_dotenv()
+        
         # Load API key
         api_key = os.getenv("OPENAI_API_KEY")
         if not api_key:
             raise ValueError("OPENAI_API_KEY not found in environment variables")
         
         self.client = OpenAI(api_key=api_key)
+        self.async_client = AsyncOpenAI(api_key=api_key)  # for answer_question_async
         self.model = "gpt-4o-mini"  # Cost-effective model
+        # Calls that can only write the final answer (tool_choice "none") need
+        # no tool selection, so they may use a smaller/faster model
+        self.model_final = os.getenv("SIM_AGENT_FINAL_MODEL", self.model)
         
         # Define function tools
+        self.verbose_prompt = verbose_prompt
         self.tools = self._define_tools()
+        if not verbose_prompt:
+            self.tools = self._compact_tools(self.tools)
         
         # System prompt
-        self.system_prompt = self._create_system_prompt()
+        self.system_prompt = self._create_system_prompt() if verbose_prompt else self._create_compact_system_prompt()
+        
+        # Answers are cached per dataset (metadata + final snapshot fingerprint)
+        self._data_fingerprint = hashlib.sha1(json.dumps(
+            {"metadata": self.metadata, "final": self.snapshots[-1] if self.snapshots else None},
+            sort_keys=True, default=str
+        ).encode()).hexdigest()
+        # and prompt mode, as verbose and compact prompts answer differently
+        self._answer_namespace = f"{self._data_fingerprint}:{'verbose' if verbose_prompt else 'compact'}"
+        self._answer_cache: Dict[str, Tuple[str, List[Dict]]] = {}
+        self._embed_vectors: Optional[np.ndarray] = None  # unit-norm rows
+        self._embed_keys: List[str] = []
+        self._embed_numbers: List[Tuple[str, ...]] = []  # numbers in each question
+        self._load_answer_cache()
+        self._tool_cache: Dict[str, Any] = {}  # see _execute_function
+        self.last_function_calls: List[Dict] = []  # set by answer_question_stream
     
     def _create_system_prompt(self) -> str:
         """Create system prompt describing the simulation."""
@@ -107,6 +294,32 @@ When answering questions:
 3. Provide clear explanations with specific numbers
 4. Suggest improvements if appropriate"""
     
+    def _create_compact_system_prompt(self) -> str:
+        """Short system prompt (default); the metric list is implied by the tool enums."""
+        summary = get_log_summary(self.data)
+        
+        return f"""Restaurant simulation analyst. Data: {summary.get('duration_minutes', 0):.1f} min, \
+{summary.get('num_parties', 0)} parties, ${summary.get('total_revenue', 0):,.2f} revenue, \
+{summary.get('num_snapshots', 0)} snapshots, {summary.get('num_events', 0)} events.
+Get every number from the tools; never guess.
+Answer in plain business language, citing specific metrics.
+Suggest improvements when useful."""
+    
+    @staticmethod
+    def _compact_tools(tools: List[Dict]) -> List[Dict]:
+        """Copy of tools with terse descriptions and self-evident ones dropped."""
+        compact = copy.deepcopy(tools)
+        for tool in compact:
+            function = tool["function"]
+            function["description"] = _COMPACT_TOOL_DESCRIPTIONS.get(function["name"], function["description"])
+            for name, parameter in function["parameters"]["properties"].items():
+                short = _COMPACT_PARAM_DESCRIPTIONS.get(name)
+                if short:
+                    parameter["description"] = short
+                else:
+                    parameter.pop("description", None)
+        return compact
+    
     def _define_tools(self) -> List[Dict]:
         """Define function tools for data access."""
         return [
@@ -270,6 +483,12 @@ When answering questions:
     def _execute_function(self, function_name: str, arguments: Dict) -> Any:
         """Execute a function tool and return results.
         
+        Results are memoized per (function, normalized arguments) for the
+        agent's lifetime; the agent's data never changes after __init__.
+        Misses fall back to the on-disk tool cache (shared by every agent on
+        the same dataset, entries expire after TOOL_CACHE_TTL) before the
+        function is actually run.
+        
         Args:
             function_name: Name of function to execute
             arguments: Function arguments
@@ -277,6 +496,46 @@ When answering questions:
         Returns:
             Function result
         """
+        key = function_name + "|" + json.dumps(arguments, sort_keys=True, default=str)
+        if key not in self._tool_cache:
+            disk_key = f"{self._data_fingerprint}:{key}"
+            result = self._load_tool_result(disk_key)
+            if result is None:
+                result = self._run_function(function_name, arguments)
+                self._store_tool_result(disk_key, result)
+            self._tool_cache[key] = result
+        return self._tool_cache[key]
+    
+    def _tool_db(self) -> sqlite3.Connection:
+        """Open the on-disk tool cache (one short-lived connection per use,
+        as tool calls run on worker threads)."""
+        self.TOOL_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.TOOL_CACHE_PATH, timeout=5)
+        conn.execute("CREATE TABLE IF NOT EXISTS tool_results "
+                     "(key TEXT PRIMARY KEY, result TEXT NOT NULL, created REAL NOT NULL)")
+        return conn
+    
+    def _load_tool_result(self, disk_key: str) -> Any:
+        """Unexpired cached result for disk_key, or None (also on any error)."""
+        try:
+            with closing(self._tool_db()) as conn:
+                row = conn.execute("SELECT result FROM tool_results WHERE key = ? AND created > ?",
+                                   (disk_key, time.time() - self.TOOL_CACHE_TTL)).fetchone()
+        except (sqlite3.Error, OSError):
+            return None
+        return json.loads(row[0]) if row else None
+    
+    def _store_tool_result(self, disk_key: str, result: Any):
+        """Persist a tool result (best-effort, like the answer cache)."""
+        try:
+            with closing(self._tool_db()) as conn, conn:
+                conn.execute("INSERT OR REPLACE INTO tool_results VALUES (?, ?, ?)",
+                             (disk_key, json.dumps(result, default=str), time.time()))
+        except (sqlite3.Error, OSError, TypeError, ValueError):
+            pass
+    
+    def _run_function(self, function_name: str, arguments: Dict) -> Any:
+        """Dispatch a function tool call (uncached)."""
         try:
             if function_name == "get_simulation_summary":
                 return self._get_simulation_summary()
@@ -327,18 +586,14 @@ When answering questions:
     
     def _calculate_metric(self, metric_name: str, time_range: Optional[List[float]] = None) -> Dict:
         """Calculate specified metric."""
-        # Filter snapshots by time range if provided
-        snapshots = self.snapshots
-        if time_range:
-            start, end = time_range
-            snapshots = [s for s in snapshots if start <= s.get("time", 0) <= end]
-        
-        if not snapshots:
+        if not self.snapshots or (time_range and not self._has_snapshots_in_range(time_range)):
             return {"error": "No snapshots in specified time range"}
         
         try:
             if metric_name == "revpash":
-                df = calculate_revpash(snapshots)
+                if not time_range:
+                    return {"metric": "revpash", **calculate_revpash_summary(self.snapshots)}
+                df = self._metric_frame("revpash", time_range)
                 return {
                     "metric": "revpash",
                     "final_revpash": float(df['revpash'].iloc[-1]) if len(df) > 0 else 0,
@@ -347,7 +602,7 @@ When answering questions:
                 }
             
             elif metric_name == "table_utilization":
-                df = calculate_table_utilization(snapshots)
+                df = self._metric_frame("table_utilization", time_range)
                 return {
                     "metric": "table_utilization",
                     "average_utilization": float(df['utilization'].mean()) if len(df) > 0 else 0,
@@ -356,7 +611,7 @@ When answering questions:
                 }
             
             elif metric_name == "staff_utilization":
-                df = calculate_staff_utilization(snapshots)
+                df = self._metric_frame("staff_utilization", time_range)
                 if len(df) > 0:
                     # Get average utilization for each staff type
                     result = {"metric": "staff_utilization"}
@@ -367,7 +622,7 @@ When answering questions:
                 return {"metric": "staff_utilization", "error": "No data"}
             
             elif metric_name == "station_utilization":
-                df = calculate_station_utilization(snapshots)
+                df = self._metric_frame("station_utilization", time_range)
                 if len(df) > 0:
                     result = {"metric": "station_utilization"}
                     for col in df.columns:
@@ -377,7 +632,7 @@ When answering questions:
                 return {"metric": "station_utilization", "error": "No data"}
             
             elif metric_name == "queue_metrics":
-                df = calculate_queue_metrics(snapshots)
+                df = self._metric_frame("queue_metrics", time_range)
                 return {
                     "metric": "queue_metrics",
                     "average_guest_queue": float(df['guest_queue'].mean()) if 'guest_queue' in df.columns else 0,
@@ -386,7 +641,9 @@ When answering questions:
                 }
             
             elif metric_name == "throughput":
-                df = calculate_throughput_metrics(snapshots)
+                if not time_range:
+                    return {"metric": "throughput", **calculate_throughput_summary(self.snapshots)}
+                df = self._metric_frame("throughput", time_range)
                 return {
                     "metric": "throughput",
                     "parties_served": int(df['parties_served'].iloc[-1]) if len(df) > 0 else 0,
@@ -395,17 +652,16 @@ When answering questions:
                 }
             
             elif metric_name == "service_times":
-                times = calculate_service_times(snapshots)
+                times = calculate_service_times(self._snapshots_in_range(time_range))
                 result = {"metric": "service_times"}
-                for key, values in times.items():
-                    if values:
-                        result[f"{key}_mean"] = float(np.mean(values))
-                        result[f"{key}_median"] = float(np.median(values))
-                        result[f"{key}_max"] = float(np.max(values))
+                for key, stats in calculate_service_time_stats(times).items():
+                    result[f"{key}_mean"] = stats["mean"]
+                    result[f"{key}_median"] = stats["median"]
+                    result[f"{key}_max"] = stats["max"]
                 return result
             
             elif metric_name == "summary_statistics":
-                return calculate_summary_statistics(snapshots)
+                return calculate_summary_statistics(self._snapshots_in_range(time_range))
             
             else:
                 return {"error": f"Unknown metric: {metric_name}"}
@@ -413,13 +669,52 @@ When answering questions:
         except Exception as e:
             return {"error": f"Error calculating {metric_name}: {str(e)}"}
     
+    def _has_snapshots_in_range(self, time_range: List[float]) -> bool:
+        """Whether any snapshot time falls in [start, end], by binary search."""
+        start, end = time_range
+        times = self._snapshot_times
+        return bool(np.searchsorted(times, end, side="right") > np.searchsorted(times, start, side="left"))
+    
+    def _snapshots_in_range(self, time_range: Optional[List[float]]) -> List[Dict]:
+        """Snapshots with start <= time <= end (all of them without a range)."""
+        if not time_range:
+            return self.snapshots
+        start, end = time_range
+        return [s for s in self.snapshots if start <= s.get("time", 0) <= end]
+    
+    def _metric_frame(self, metric_name: str, time_range: Optional[List[float]] = None) -> pd.DataFrame:
+        """Whole-run DataFrame for a per-snapshot metric, sliced to time_range.
+        
+        Built on first use and cached; callers must not modify the result.
+        Totals inferred from the snapshots (seats, tables, staff counts,
+        station names) come from the whole run rather than the slice.
+        """
+        df = self._metric_dfs.get(metric_name)
+        if df is None:
+            df = self._metric_dfs[metric_name] = _METRIC_FRAME_BUILDERS[metric_name](self.snapshots)
+        if time_range and len(df) > 0:
+            start, end = time_range
+            df = df[df["time_minutes"].between(start, end)]
+        return df
+    
+    def _closest_snapshot(self, time_minutes: float) -> Dict:
+        """Snapshot closest in time (earliest one on ties), by binary search."""
+        times = self._snapshot_times
+        idx = min(int(np.searchsorted(times, time_minutes)), len(times) - 1)
+        if idx > 0 and abs(times[idx - 1] - time_minutes) <= abs(times[idx] - time_minutes):
+            # First of any snapshots sharing that earlier time
+            idx = int(np.searchsorted(times, times[idx - 1]))
+        if self._snapshot_order is not None:
+            idx = int(self._snapshot_order[idx])
+        return self.snapshots[idx]
+    
     def _get_snapshot_at_time(self, time_minutes: float) -> Dict:
         """Get snapshot closest to specified time."""
         if not self.snapshots:
             return {"error": "No snapshots available"}
         
         # Find closest snapshot
-        closest = min(self.snapshots, key=lambda s: abs(s.get("time", 0) - time_minutes))
+        closest = self._closest_snapshot(time_minutes)
         
         # Return simplified snapshot (full snapshot is too large)
         return {
@@ -434,23 +729,30 @@ When answering questions:
     def _query_events(self, event_type: Optional[str], time_range: Optional[List[float]], 
                       entity_id: Optional[int], limit: int) -> Dict:
         """Query and filter events."""
-        filtered_events = self.events
-        
-        # Filter by event type
+        # Filter by event type (positions into self.events, in log order)
         if event_type:
-            filtered_events = [e for e in filtered_events if e.get("event_type") == event_type]
+            positions = self._event_positions_by_type.get(event_type, np.empty(0, dtype=np.int64))
+            timestamps = self._event_timestamps_by_type.get(event_type, np.empty(0))
+        else:
+            positions = np.arange(len(self.events))
+            timestamps = self._event_timestamps
         
         # Filter by time range
         if time_range:
             start, end = time_range
-            filtered_events = [e for e in filtered_events if start <= e.get("timestamp", 0) <= end]
+            if self._events_time_sorted:
+                lo = np.searchsorted(timestamps, start, side="left")
+                hi = np.searchsorted(timestamps, end, side="right")
+                positions = positions[lo:max(lo, hi)]
+            else:
+                positions = positions[(timestamps >= start) & (timestamps <= end)]
         
         # Filter by entity ID
         if entity_id is not None:
-            filtered_events = [e for e in filtered_events if e.get("entity_id") == entity_id]
+            positions = positions[self._event_entity_ids[positions] == entity_id]
         
-        # Limit results
-        filtered_events = filtered_events[:limit]
+        # Limit results (only these events are materialized)
+        filtered_events = [self.events[i] for i in positions[:limit]]
         
         return {
             "total_matching": len(filtered_events),
@@ -462,7 +764,7 @@ When answering questions:
         """Get parties filtered by status."""
         if time_minutes is not None:
             # Get snapshot at time
-            snapshot = min(self.snapshots, key=lambda s: abs(s.get("time", 0) - time_minutes))
+            snapshot = self._closest_snapshot(time_minutes)
             parties = snapshot.get("parties", [])
         else:
             # Get all parties from final snapshot
@@ -482,32 +784,42 @@ When answering questions:
             "summary": f"Found {len(parties)} parties" + (f" with status '{status}'" if status else "")
         }
     
+    def _snapshot_scalars(self) -> pd.DataFrame:
+        """Numeric top-level snapshot fields as columns, built on first use."""
+        if self._scalar_df is None:
+            self._scalar_df = pd.DataFrame([
+                {key: value for key, value in snap.items() if isinstance(value, (int, float))}
+                for snap in self.snapshots
+            ])
+            if "time" in self._scalar_df.columns:
+                self._scalar_df["time"] = self._scalar_df["time"].fillna(0)
+        return self._scalar_df
+    
     def _get_station_performance(self, station_name: str, time_range: Optional[List[float]]) -> Dict:
         """Get station performance metrics."""
-        snapshots = self.snapshots
-        if time_range:
-            start, end = time_range
-            snapshots = [s for s in snapshots if start <= s.get("time", 0) <= end]
-        
-        if not snapshots:
+        if not self.snapshots or (time_range and not self._has_snapshots_in_range(time_range)):
             return {"error": "No data in time range"}
         
         # Calculate utilization for this station
         try:
-            queue_key = f"{station_name}_queue"
-            busy_key = f"{station_name}_busy"
+            df = self._snapshot_scalars()
+            if time_range:
+                start, end = time_range
+                df = df[df["time"].between(start, end)]
             
-            queue_lengths = [s.get(queue_key, 0) for s in snapshots]
-            busy_slots = [s.get(busy_key, 0) for s in snapshots]
+            # Snapshots without the field count as 0
+            missing = pd.Series(0, index=df.index)
+            queue_lengths = df.get(f"{station_name}_queue", missing).fillna(0).to_numpy()
+            busy_slots = df.get(f"{station_name}_busy", missing).fillna(0).to_numpy()
             
             return {
                 "station": station_name,
-                "average_queue_length": float(np.mean(queue_lengths)) if queue_lengths else 0,
-                "max_queue_length": int(max(queue_lengths)) if queue_lengths else 0,
-                "average_busy_slots": float(np.mean(busy_slots)) if busy_slots else 0,
-                "max_busy_slots": int(max(busy_slots)) if busy_slots else 0,
+                "average_queue_length": float(queue_lengths.mean()),
+                "max_queue_length": int(queue_lengths.max()),
+                "average_busy_slots": float(busy_slots.mean()),
+                "max_busy_slots": int(busy_slots.max()),
                 "time_range": time_range,
-                "data_points": len(snapshots)
+                "data_points": len(df)
             }
         except Exception as e:
             return {"error": f"Error analyzing {station_name}: {str(e)}"}
@@ -517,7 +829,7 @@ When answering questions:
         try:
             if statistic == "peak_utilization_time":
                 # Find time with highest table utilization
-                df = calculate_table_utilization(self.snapshots)
+                df = self._metric_frame("table_utilization")
                 if len(df) > 0:
                     peak_idx = df['utilization'].idxmax()
                     peak_row = df.loc[peak_idx]
@@ -541,7 +853,8 @@ When answering questions:
             
             elif statistic in ["busiest_hour", "slowest_hour"]:
                 # Analyze parties per time window
-                df = calculate_throughput_metrics(self.snapshots)
+                # Copy: the cached frame is shared with calculate_metric
+                df = self._metric_frame("throughput").copy()
                 if len(df) > 0:
                     # Calculate rate of change (parties served per interval)
                     df['parties_rate'] = df['parties_served'].diff().fillna(0)
@@ -568,21 +881,419 @@ When answering questions:
         except Exception as e:
             return {"error": f"Error calculating {statistic}: {str(e)}"}
     
+    # ========== Answer Cache ==========
+    
+    def _cache_key(self, question: str) -> str:
+        """Exact-match key: normalized question plus dataset fingerprint and prompt mode."""
+        normalized = " ".join(question.lower().split())
+        return hashlib.sha1((normalized + self._answer_namespace).encode()).hexdigest()
+    
+    def _embed(self, question: str) -> Optional[np.ndarray]:
+        """Unit-norm embedding of a question, or None if the call fails."""
+        try:
+            response = self.client.embeddings.create(model=self.EMBEDDING_MODEL, input=question)
+        except Exception:
+            return None
+        return self._unit_vector(response)
+    
+    async def _embed_async(self, question: str) -> Optional[np.ndarray]:
+        """Async variant of _embed using the async client."""
+        try:
+            response = await self.async_client.embeddings.create(model=self.EMBEDDING_MODEL, input=question)
+        except Exception:
+            return None
+        return self._unit_vector(response)
+    
+    @staticmethod
+    def _unit_vector(response) -> Optional[np.ndarray]:
+        vector = np.asarray(response.data[0].embedding, dtype=np.float64)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else None
+    
+    def _add_embedding(self, key: str, vector: np.ndarray, question: str):
+        row = vector[np.newaxis, :]
+        self._embed_vectors = row if self._embed_vectors is None else np.vstack([self._embed_vectors, row])
+        self._embed_keys.append(key)
+        self._embed_numbers.append(_question_numbers(question))
+    
+    def _lookup_similar(self, vector: np.ndarray, question: str) -> Optional[str]:
+        """Key of the most similar cached question, if above the threshold.
+        
+        Only questions with the same numbers are candidates: "0 to 60 min"
+        and "60 to 120 min" embed almost identically but need other answers.
+        """
+        if self._embed_vectors is None or self._embed_vectors.shape[1] != vector.shape[0]:
+            return None
+        numbers = _question_numbers(question)
+        same_numbers = np.fromiter((n == numbers for n in self._embed_numbers),
+                                   dtype=bool, count=len(self._embed_numbers))
+        if not same_numbers.any():
+            return None
+        similarities = np.where(same_numbers, self._embed_vectors @ vector, -np.inf)
+        best = int(np.argmax(similarities))
+        return self._embed_keys[best] if similarities[best] >= self.SIMILARITY_THRESHOLD else None
+    
+    def _load_answer_cache(self):
+        """Load cached answers for this dataset from disk (missing/corrupt file = empty)."""
+        try:
+            with open(self.ANSWER_CACHE_PATH, "r") as f:
+                entries = json.load(f).get(self._answer_namespace, {})
+        except (OSError, ValueError):
+            return
+        for key, entry in entries.items():
+            self._answer_cache[key] = (entry["answer"], entry["function_calls"])
+            if entry.get("embedding"):
+                self._add_embedding(key, np.asarray(entry["embedding"], dtype=np.float64), entry["question"])
+    
+    def _store_answer(self, key: str, question: str, answer: str,
+                      function_calls: List[Dict], vector: Optional[np.ndarray]):
+        """Cache an answer in memory and persist it for later sessions."""
+        self._answer_cache[key] = (answer, function_calls)
+        if vector is not None:
+            self._add_embedding(key, vector, question)
+        try:
+            try:
+                with open(self.ANSWER_CACHE_PATH, "r") as f:
+                    on_disk = json.load(f)
+            except (OSError, ValueError):
+                on_disk = {}
+            on_disk.setdefault(self._answer_namespace, {})[key] = {
+                "question": question,
+                "answer": answer,
+                "function_calls": function_calls,
+                "embedding": vector.tolist() if vector is not None else None,
+            }
+            self.ANSWER_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.ANSWER_CACHE_PATH.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(on_disk, f, default=str)
+            os.replace(tmp_path, self.ANSWER_CACHE_PATH)
+        except OSError:
+            pass  # Persisting is best-effort; the in-memory cache still applies
+    
+    def _lookup_answer(self, question: str) -> Tuple[str, Optional[np.ndarray], Optional[Tuple[str, List[Dict]]]]:
+        """Return (cache key, question embedding, cached answer or None)."""
+        key = self._cache_key(question)
+        if key in self._answer_cache:
+            return key, None, self._answer_cache[key]
+        
+        vector = self._embed(question)
+        if vector is not None:
+            similar_key = self._lookup_similar(vector, question)
+            if similar_key is not None:
+                return key, vector, self._answer_cache[similar_key]
+        return key, vector, None
+    
+    def _match_intent(self, question: str) -> Optional[Tuple[str, Dict]]:
+        """The single tool call a question asks for, or None.
+        
+        Only unambiguous questions are matched: the whole question (lower
+        case, trailing punctuation dropped) fits exactly one pattern and has
+        no numbers (times or ranges the model must parse).
+        """
+        if any(ch.isdigit() for ch in question):
+            return None
+        normalized = " ".join(question.lower().split()).rstrip("?.! ")
+        matches = {(name, json.dumps(arguments, sort_keys=True))
+                   for pattern, name, arguments in self.INTENT_PATTERNS if pattern.fullmatch(normalized)}
+        if len(matches) != 1:
+            return None
+        name, arguments = matches.pop()
+        return name, json.loads(arguments)
+    
+    def _start_messages(self, question: str, function_calls_made: List[Dict]) -> Tuple[List, str]:
+        """Opening messages for a question and the tool_choice for the first call.
+        
+        If the question matches an intent, its tool is run up front and the
+        call/result pair is appended, so the model only has to write the
+        answer (tool_choice "none"); otherwise the model picks tools ("auto").
+        """
+        messages = [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "user", "content": question}
+        ]
+        intent = self._match_intent(question)
+        if intent is None:
+            return messages, "auto"
+        
+        function_name, arguments = intent
+        call_id = "call_intent"
+        messages.append({
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [{"id": call_id, "type": "function",
+                            "function": {"name": function_name, "arguments": json.dumps(arguments)}}]
+        })
+        result = self._execute_function(function_name, arguments)
+        self._record_tool_results([(call_id, function_name, arguments)], [result],
+                                  messages, function_calls_made)
+        return messages, "none"
+    
     def answer_question(self, question: str) -> Tuple[str, List[Dict]]:
         """Answer a question about the simulation using function calling.
         
+        Repeat questions on the same dataset are answered from the cache:
+        an exact (normalized) match first, then the most similar earlier
+        question by embedding cosine similarity (>= SIMILARITY_THRESHOLD).
+        
         Args:
             question: User's question
         
         Returns:
             Tuple of (answer_text, function_calls_made)
         """
-        messages = [
-            {"role": "system", "content": self.system_prompt},
-            {"role": "user", "content": question}
-        ]
+        key, vector, cached = self._lookup_answer(question)
+        if cached is not None:
+            return cached
+        
+        answer, function_calls_made = self._answer_uncached(question)
+        if answer and answer != self.MAX_CALLS_ANSWER:
+            self._store_answer(key, question, answer, function_calls_made, vector)
+        return answer, function_calls_made
+    
+    def answer_question_stream(self, question: str) -> Iterator[str]:
+        """Answer a question, yielding the answer text as it is generated.
+        
+        Same function-calling loop as answer_question, but each API call is
+        streamed: tool-call fragments are reassembled by index and executed
+        between rounds, and content tokens are yielded as they arrive. The
+        function calls made are left in self.last_function_calls.
+        
+        Args:
+            question: User's question
+        
+        Yields:
+            Chunks of answer text
+        """
+        self.last_function_calls = []
+        key, vector, cached = self._lookup_answer(question)
+        if cached is not None:
+            self.last_function_calls = cached[1]
+            yield cached[0]
+            return
+        
+        function_calls_made = self.last_function_calls
+        messages, tool_choice = self._start_messages(question, function_calls_made)
+        
+        for _ in range(self.MAX_FUNCTION_CALLS):
+            stream = self.client.chat.completions.create(
+                model=self.model_final if tool_choice == "none" else self.model,
+                messages=messages,
+                tools=self.tools,
+                tool_choice=tool_choice,
+                max_completion_tokens=self.MAX_COMPLETION_TOKENS,
+                stream=True
+            )
+            
+            content_parts = []
+            tool_calls: Dict[int, Dict[str, str]] = {}
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta
+                for fragment in delta.tool_calls or ():
+                    call = tool_calls.setdefault(fragment.index, {"id": "", "name": "", "arguments": ""})
+                    if fragment.id:
+                        call["id"] = fragment.id
+                    if fragment.function is not None:
+                        call["name"] += fragment.function.name or ""
+                        call["arguments"] += fragment.function.arguments or ""
+                if delta.content:
+                    content_parts.append(delta.content)
+                    yield delta.content
+            
+            if not tool_calls:
+                answer = "".join(content_parts)
+                if answer:
+                    self._store_answer(key, question, answer, function_calls_made, vector)
+                return
+            
+            calls = [tool_calls[index] for index in sorted(tool_calls)]
+            messages.append({
+                "role": "assistant",
+                "content": "".join(content_parts) or None,
+                "tool_calls": [
+                    {"id": call["id"], "type": "function",
+                     "function": {"name": call["name"], "arguments": call["arguments"]}}
+                    for call in calls
+                ]
+            })
+            self._run_tool_calls([(call["id"], call["name"], call["arguments"]) for call in calls],
+                                 messages, function_calls_made)
+        
+        yield self.MAX_CALLS_ANSWER
+    
+    def _run_tool_calls(self, tool_calls: List[Tuple[str, str, str]], messages: List,
+                        function_calls_made: List[Dict]):
+        """Execute (id, name, JSON arguments) tool calls and append their results.
+        
+        Calls from one assistant turn are independent, so several are run
+        concurrently on a thread pool. Each result is recorded in
+        function_calls_made and appended to messages as a tool message
+        answering its tool_call_id, in the original call order.
+        """
+        parsed = [(call_id, function_name, json.loads(raw_arguments))
+                  for call_id, function_name, raw_arguments in tool_calls]
+        
+        # Execute functions
+        if len(parsed) > 1:
+            with ThreadPoolExecutor(max_workers=min(8, len(parsed))) as executor:
+                futures = [executor.submit(self._execute_function, function_name, arguments)
+                           for _, function_name, arguments in parsed]
+                results = [future.result() for future in futures]
+        else:
+            results = [self._execute_function(function_name, arguments)
+                       for _, function_name, arguments in parsed]
+        
+        self._record_tool_results(parsed, results, messages, function_calls_made)
+    
+    @staticmethod
+    def _record_tool_results(parsed: List[Tuple[str, str, Dict]], results: List[Any],
+                             messages: List, function_calls_made: List[Dict]):
+        """Record executed tool calls and append their tool messages, in call order."""
+        for (call_id, function_name, arguments), result in zip(parsed, results):
+            # Record function call
+            function_calls_made.append({
+                "function": function_name,
+                "arguments": arguments,
+                "result": result
+            })
+            
+            # Add function result to conversation
+            messages.append({
+                "role": "tool",
+                "tool_call_id": call_id,
+                "name": function_name,
+                "content": _safe_dump(result, SimulationAgent.MAX_TOOL_RESULT_BYTES)
+            })
+    
+    async def answer_question_async(self, question: str) -> Tuple[str, List[Dict]]:
+        """Async variant of answer_question using the async OpenAI client.
+        
+        API calls are awaited instead of blocking a worker thread; the tool
+        calls of one turn run concurrently via asyncio.to_thread.
+        
+        Args:
+            question: User's question
+        
+        Returns:
+            Tuple of (answer_text, function_calls_made)
+        """
+        key = self._cache_key(question)
+        if key in self._answer_cache:
+            return self._answer_cache[key]
+        vector = await self._embed_async(question)
+        if vector is not None:
+            similar_key = self._lookup_similar(vector, question)
+            if similar_key is not None:
+                return self._answer_cache[similar_key]
+        
+        function_calls_made = []
+        messages, tool_choice = await asyncio.to_thread(self._start_messages, question, function_calls_made)
+        
+        for _ in range(self.MAX_FUNCTION_CALLS):
+            response = await self.async_client.chat.completions.create(
+                model=self.model_final if tool_choice == "none" else self.model,
+                messages=messages,
+                tools=self.tools,
+                tool_choice=tool_choice,
+                max_completion_tokens=self.MAX_COMPLETION_TOKENS
+            )
+            assistant_message = response.choices[0].message
+            
+            if not assistant_message.tool_calls:
+                answer = assistant_message.content
+                if answer:
+                    self._store_answer(key, question, answer, function_calls_made, vector)
+                return answer, function_calls_made
+            
+            messages.append(assistant_message)
+            parsed = [(tc.id, tc.function.name, json.loads(tc.function.arguments))
+                      for tc in assistant_message.tool_calls]
+            results = await asyncio.gather(*(
+                asyncio.to_thread(self._execute_function, function_name, arguments)
+                for _, function_name, arguments in parsed
+            ))
+            self._record_tool_results(parsed, results, messages, function_calls_made)
+        
+        return self.MAX_CALLS_ANSWER, function_calls_made
+    
+    def answer_questions_batch(self, questions: List[str], poll_interval: float = 30.0,
+                               timeout: float = 24 * 3600) -> List[Optional[str]]:
+        """Answer many questions through the OpenAI Batch API (lower cost, high latency).
+        
+        The Batch API cannot run the function-calling loop, so each request
+        is single-shot: the simulation summary and summary statistics are
+        computed locally and inlined into the prompt instead of offered as
+        tools. Use this for evaluation/regression suites, not interactive
+        chat. Blocks until the batch finishes (polling every poll_interval
+        seconds).
+        
+        Args:
+            questions: Questions to answer
+            poll_interval: Seconds between batch status checks
+            timeout: Give up (TimeoutError) after this many seconds
         
+        Returns:
+            Answers in question order (None where a request failed)
+        """
+        context = json.dumps({
+            "summary": self._execute_function("get_simulation_summary", {}),
+            "summary_statistics": self._execute_function("calculate_metric", {"metric_name": "summary_statistics"}),
+        }, default=str)
+        
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False) as f:
+            for i, question in enumerate(questions):
+                f.write(json.dumps({
+                    "custom_id": f"q{i}",
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": self.model_final,
+                        "max_completion_tokens": self.MAX_COMPLETION_TOKENS,
+                        "messages": [
+                            {"role": "system", "content": self.system_prompt},
+                            {"role": "user", "content": f"Tool results:\n{context}\n\nQuestion: {question}"}
+                        ]
+                    }
+                }) + "\n")
+            input_path = f.name
+        try:
+            with open(input_path, "rb") as f:
+                input_file = self.client.files.create(file=f, purpose="batch")
+        finally:
+            os.remove(input_path)
+        
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        deadline = time.monotonic() + timeout
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Batch {batch.id} still '{batch.status}' after {timeout:.0f}s")
+            time.sleep(poll_interval)
+            batch = self.client.batches.retrieve(batch.id)
+        
+        answers: List[Optional[str]] = [None] * len(questions)
+        if batch.status != "completed" or not batch.output_file_id:
+            return answers
+        for line in self.client.files.content(batch.output_file_id).text.splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            response = record.get("response") or {}
+            if response.get("status_code") != 200:
+                continue
+            index = int(record["custom_id"][1:])
+            answers[index] = response["body"]["choices"][0]["message"]["content"]
+        return answers
+    
+    def _answer_uncached(self, question: str) -> Tuple[str, List[Dict]]:
+        """Run the function-calling loop against the API for one question."""
         function_calls_made = []
+        messages, tool_choice = self._start_messages(question, function_calls_made)
         iterations = 0
         
         while iterations < self.MAX_FUNCTION_CALLS:
@@ -590,10 +1301,11 @@ When answering questions:
             
             # Call OpenAI API
             response = self.client.chat.completions.create(
-                model=self.model,
+                model=self.model_final if tool_choice == "none" else self.model,
                 messages=messages,
                 tools=self.tools,
-                tool_choice="auto"
+                tool_choice=tool_choice,
+                max_completion_tokens=self.MAX_COMPLETION_TOKENS
             )
             
             assistant_message = response.choices[0].message
@@ -607,28 +1319,11 @@ When answering questions:
             messages.append(assistant_message)
             
             # Execute each function call
-            for tool_call in assistant_message.tool_calls:
-                function_name = tool_call.function.name
-                arguments = json.loads(tool_call.function.arguments)
-                
-                # Execute function
-                result = self._execute_function(function_name, arguments)
-                
-                # Record function call
-                function_calls_made.append({
-                    "function": function_name,
-                    "arguments": arguments,
-                    "result": result
-                })
-                
-                # Add function result to conversation
-                messages.append({
-                    "role": "tool",
-                    "tool_call_id": tool_call.id,
-                    "name": function_name,
-                    "content": json.dumps(result)
-                })
+            self._run_tool_calls(
+                [(tc.id, tc.function.name, tc.function.arguments) for tc in assistant_message.tool_calls],
+                messages, function_calls_made
+            )
         
         # Max iterations reached
-        return "I apologize, but I've reached the maximum number of function calls. Please try asking a more specific question.", function_calls_made
+        return self.MAX_CALLS_ANSWER, function_calls_made
 
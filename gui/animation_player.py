@@ -4,9 +4,13 @@ This module provides animated playback functionality for visualizing
 the restaurant simulation state over time.
 """
 
+from collections import Counter, OrderedDict
+from functools import lru_cache
 from typing import Dict, List, Optional, Any, Tuple
 import math
+import numpy as np
 import plotly.graph_objects as go
+import plotly.io as pio
 from plotly.subplots import make_subplots
 import sys
 from pathlib import Path
@@ -23,6 +27,7 @@ find_snapshot_index_at_time = gui_utils.find_snapshot_index_at_time
 get_snapshot_at_time = gui_utils.get_snapshot_at_time
 format_time_display = gui_utils.format_time_display
 safe_divide = gui_utils.safe_divide
+get_total_seats_from_snapshots = gui_utils.get_total_seats_from_snapshots
 
 
 # Status colors for visualization
@@ -62,19 +67,90 @@ STATUS_COLORS = {
 }
 
 
+# Layouts with at least this many tables are drawn with WebGL (Scattergl);
+# smaller ones stay SVG, as browsers limit the number of WebGL contexts
+WEBGL_TABLE_THRESHOLD = 100
+
+
+# Party flow stages (updated with new states) and their labels
+PARTY_FLOW_STAGES = [
+    "waiting_for_table",
+    "being_seated",
+    "deciding",
+    "ordering",
+    "waiting_for_food",
+    "receiving_food",
+    "dining",
+    "paying",
+    "cleaning",
+    "departed",
+]
+
+PARTY_FLOW_LABELS = [
+    "Waiting for Table",
+    "Being Seated",
+    "Deciding",
+    "Ordering",
+    "Waiting for Food",
+    "Receiving Food",
+    "Dining",
+    "Paying",
+    "Cleaning",
+    "Departed",
+]
+
+# Plotly templates with the figures' fixed layout options, registered once
+# so each figure only sets what varies (size, axis ranges, title)
+_TOP_LEGEND = dict(orientation="h", yanchor="bottom", y=1.02, xanchor="center")
+
+pio.templates["restaurant_layout"] = go.layout.Template(pio.templates["plotly"])
+pio.templates["restaurant_layout"].layout.update(
+    xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+    yaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+    plot_bgcolor="rgba(248, 249, 250, 1)",
+    margin=dict(l=20, r=20, t=40, b=20),
+    title=dict(x=0.5),
+    legend=dict(_TOP_LEGEND, x=0.5),
+)
+
+pio.templates["restaurant_stations"] = go.layout.Template(pio.templates["plotly_white"])
+pio.templates["restaurant_stations"].layout.update(
+    barmode="stack",
+    legend=dict(_TOP_LEGEND, x=0.25),
+    margin=dict(l=40, r=40, t=60, b=40),
+)
+
+
+PARTY_FLOW_COLORS = [STATUS_COLORS.get(s, "#6C757D") for s in PARTY_FLOW_STAGES]
+PARTY_FLOW_STAGE_INDEX = {stage: i for i, stage in enumerate(PARTY_FLOW_STAGES)}
+_party_flow_stage_get = PARTY_FLOW_STAGE_INDEX.get
+
+
 class AnimationPlayer:
     """Manages animated playback of restaurant simulation snapshots."""
     
+    # Entries kept in the metrics memo for non-default seat counts
+    METRICS_MEMO_SIZE = 1024
+    
     def __init__(
         self,
         snapshots: List[Dict],
-        update_interval: float = 0.5
+        update_interval: float = 0.5,
+        total_seats: Optional[int] = None,
+        max_frames: int = 500
     ):
         """Initialize the animation player.
         
+        Per-snapshot metrics and party-flow counts are computed here, in one
+        walk over the snapshots, so playback frames only index into them.
+        
         Args:
             snapshots: List of snapshot dictionaries
             update_interval: Time between updates in seconds
+            total_seats: Total seat count for RevPASH (if None, extracted
+                from snapshots)
+            max_frames: Most snapshots step_forward/step_backward visit
+                (see set_playback_resolution)
         """
         self.snapshots = snapshots
         self.update_interval = update_interval
@@ -82,6 +158,10 @@ class AnimationPlayer:
         self.is_playing = False
         self.playback_speed = 1.0
         
+        # Snapshot times, extracted once for time lookups
+        self._times = [s.get("time", 0) for s in snapshots]
+        self.set_playback_resolution(max_frames)
+        
         # Calculate time range
         if snapshots:
             self.min_time = snapshots[0].get("time", 0)
@@ -89,6 +169,34 @@ class AnimationPlayer:
         else:
             self.min_time = 0
             self.max_time = 0
+        
+        # Figures from the render_* methods, keyed by name to (shape key,
+        # figure); later frames update their traces instead of rebuilding
+        self._figures: Dict[str, Tuple[Any, go.Figure]] = {}
+        
+        # Per-snapshot data, indexed like snapshots: current metrics and
+        # party counts by stage (columns follow PARTY_FLOW_STAGES)
+        if total_seats is None:
+            total_seats = get_total_seats_from_snapshots(snapshots)
+        self.total_seats = total_seats
+        self.metrics_cache: List[Dict[str, Any]] = []
+        # Metrics for other seat counts, computed on first visit
+        self._metrics_memo: "OrderedDict[Tuple[int, int], Dict[str, Any]]" = OrderedDict()
+        num_stages = len(PARTY_FLOW_STAGES)
+        cells = []  # snapshot index * num_stages + stage id, one per party
+        metrics_append, cells_append = self.metrics_cache.append, cells.append
+        stage_index = _party_stage_index
+        for i, snapshot in enumerate(snapshots):
+            metrics_append(render_current_metrics(snapshot, total_seats))
+            offset = i * num_stages
+            for party in snapshot.get("parties", []):
+                stage = stage_index(party)
+                if stage is not None:
+                    cells_append(offset + stage)
+        # All snapshots' counts in a single bincount
+        self.party_counts = np.bincount(
+            np.asarray(cells, dtype=np.int64), minlength=len(snapshots) * num_stages
+        ).astype(np.int32).reshape(len(snapshots), num_stages)
     
     def get_snapshot_at_time(self, target_time: float) -> Optional[Dict]:
         """Get the snapshot closest to the target time.
@@ -99,7 +207,7 @@ class AnimationPlayer:
         Returns:
             Snapshot dictionary or None
         """
-        return get_snapshot_at_time(self.snapshots, target_time)
+        return get_snapshot_at_time(self.snapshots, target_time, self._times)
     
     def get_current_snapshot(self) -> Optional[Dict]:
         """Get the current snapshot.
@@ -114,30 +222,56 @@ class AnimationPlayer:
     def set_time(self, target_time: float) -> None:
         """Set the current time position.
         
+        Playback moves forward, so the search starts at the current index
+        whenever the target is past it.
+        
         Args:
             target_time: Target time in minutes
         """
-        self.current_index = find_snapshot_index_at_time(self.snapshots, target_time)
+        lo = 0
+        if self.current_index < len(self._times) and self._times[self.current_index] < target_time:
+            lo = self.current_index
+        self.current_index = find_snapshot_index_at_time(self.snapshots, target_time, self._times, lo)
+    
+    def set_playback_resolution(self, max_frames: int) -> None:
+        """Limit stepping to at most max_frames evenly spaced snapshots.
+        
+        Long simulations have far more snapshots than playback needs to
+        show; stepping skips between the chosen ones, while set_time and
+        the snapshot lookups keep full resolution.
+        
+        Args:
+            max_frames: Maximum number of frames (at least 2)
+        """
+        num_snapshots = len(self.snapshots)
+        if num_snapshots > max_frames:
+            self._playback_indices = np.unique(
+                np.linspace(0, num_snapshots - 1, max(max_frames, 2)).round().astype(np.int64)
+            )
+        else:
+            self._playback_indices = np.arange(num_snapshots)
     
     def step_forward(self) -> bool:
-        """Move to the next snapshot.
+        """Move to the next playback frame.
         
         Returns:
             True if moved, False if at end
         """
-        if self.current_index < len(self.snapshots) - 1:
-            self.current_index += 1
+        pos = int(np.searchsorted(self._playback_indices, self.current_index, side="right"))
+        if pos < len(self._playback_indices):
+            self.current_index = int(self._playback_indices[pos])
             return True
         return False
     
     def step_backward(self) -> bool:
-        """Move to the previous snapshot.
+        """Move to the previous playback frame.
         
         Returns:
             True if moved, False if at start
         """
-        if self.current_index > 0:
-            self.current_index -= 1
+        pos = int(np.searchsorted(self._playback_indices, self.current_index, side="left"))
+        if pos > 0:
+            self.current_index = int(self._playback_indices[pos - 1])
             return True
         return False
     
@@ -145,6 +279,183 @@ class AnimationPlayer:
         """Reset to the beginning."""
         self.current_index = 0
         self.is_playing = False
+    
+    def current_metrics(self, total_seats: Optional[int] = None) -> Dict[str, Any]:
+        """Metrics of the current snapshot (see render_current_metrics)."""
+        return self.get_metrics(self.current_index, total_seats)
+    
+    def get_metrics(self, idx: int, total_seats: Optional[int] = None) -> Dict[str, Any]:
+        """Metrics of snapshot idx for a seat count.
+        
+        The player's own seat count is served from the metrics computed at
+        init; other counts are computed once per (idx, total_seats) and kept
+        in a small LRU memo, so scrubbing back over a frame is a lookup.
+        
+        Args:
+            idx: Snapshot index
+            total_seats: Seat count for RevPASH (defaults to the player's)
+            
+        Returns:
+            Metrics dictionary, or {} if idx is out of range
+        """
+        if not 0 <= idx < len(self.snapshots):
+            return {}
+        if total_seats is None or total_seats == self.total_seats:
+            return self.metrics_cache[idx]
+        key = (idx, total_seats)
+        metrics = self._metrics_memo.get(key)
+        if metrics is None:
+            metrics = render_current_metrics(self.snapshots[idx], total_seats)
+            self._metrics_memo[key] = metrics
+            if len(self._metrics_memo) > self.METRICS_MEMO_SIZE:
+                self._metrics_memo.popitem(last=False)
+        else:
+            self._metrics_memo.move_to_end(key)
+        return metrics
+    
+    def _cached_figure(self, name: str, key: Any) -> Optional[go.Figure]:
+        """Previously rendered figure for name if it was built for key."""
+        cached = self._figures.get(name)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        return None
+    
+    def render_layout(self, width: int = 800, height: int = 600) -> go.Figure:
+        """Restaurant layout of the current snapshot.
+        
+        The figure skeleton (axes, legend, styling) is built once per table
+        count and size; each frame only overwrites the table trace and title.
+        """
+        snapshot = self.get_current_snapshot()
+        tables = snapshot.get("tables", []) if snapshot else []
+        if not tables:
+            return render_restaurant_layout(snapshot, width, height)
+        
+        key = (len(tables), width, height)
+        fig = self._cached_figure("layout", key)
+        if fig is None:
+            fig = _build_layout_skeleton(len(tables), width, height)
+            self._figures["layout"] = (key, fig)
+        _update_layout_frame(fig, snapshot)
+        return fig
+    
+    def render_stations(self, width: int = 600, height: int = 300) -> go.Figure:
+        """Station status of the current snapshot (see render_layout)."""
+        snapshot = self.get_current_snapshot()
+        if not snapshot or not snapshot.get("stations"):
+            return render_station_status(snapshot, width, height)
+        
+        traces = build_station_trace_data(snapshot)
+        key = (tuple(traces[0]["x"]), width, height)
+        fig = self._cached_figure("stations", key)
+        if fig is None:
+            fig = _build_station_skeleton(traces[0]["x"], width, height)
+            self._figures["stations"] = (key, fig)
+        _update_station_frame(fig, traces, snapshot.get("time", 0))
+        return fig
+    
+    def render_party_flow(self, width: int = 800, height: int = 250) -> go.Figure:
+        """Party flow of the current snapshot (see render_layout)."""
+        snapshot = self.get_current_snapshot()
+        if not snapshot:
+            return render_party_flow(snapshot, width, height)
+        
+        key = (width, height)
+        fig = self._cached_figure("party_flow", key)
+        if fig is None:
+            fig = _build_party_flow_skeleton(width, height)
+            self._figures["party_flow"] = (key, fig)
+        _update_party_flow_frame(
+            fig, self.party_counts[self.current_index].tolist(), snapshot.get("time", 0)
+        )
+        return fig
+
+
+@lru_cache(maxsize=32)
+def _grid_coords(num_tables: int) -> Tuple[np.ndarray, np.ndarray, int, int]:
+    """Grid positions of num_tables tables as (xs, ys, cols, rows).
+    
+    The table set is fixed for a simulation, so this is computed once per
+    table count and shared (read-only) by every frame.
+    """
+    cols = math.ceil(math.sqrt(num_tables))
+    rows = math.ceil(num_tables / cols)
+    index = np.arange(num_tables, dtype=np.int16)
+    xs = (index % cols) * 2 + 1
+    ys = (rows - index // cols - 1) * 2 + 1
+    xs.flags.writeable = False
+    ys.flags.writeable = False
+    return xs, ys, cols, rows
+
+
+def _layout_title(snapshot: Dict) -> str:
+    """Title of the restaurant layout figure for a snapshot."""
+    return f"Restaurant Layout - {format_time_display(snapshot.get('time', 0))}"
+
+
+# (color, status text) of tables without a party
+_AVAILABLE_TABLE_STYLE = (STATUS_COLORS["available"], "Available")
+_UNAVAILABLE_TABLE_STYLE = (STATUS_COLORS["cleaning"], "Unavailable")
+
+
+@lru_cache(maxsize=None)
+def _seated_table_style(party_status: str) -> Tuple[str, str]:
+    """(color, status text) of a table whose party has party_status."""
+    if party_status == "cleaning":
+        return STATUS_COLORS["cleaning"], "Cleaning"
+    return STATUS_COLORS["occupied"], party_status.replace("_", " ").title()
+
+
+def build_layout_trace_data(snapshot: Dict) -> Dict[str, Any]:
+    """Per-table data of the restaurant layout's table trace.
+    
+    Keys are Plotly property paths, so the result can update trace 0 of an
+    existing layout figure in place (see AnimationPlayer.render_layout).
+    Numeric columns are NumPy arrays, which Plotly serializes as typed
+    arrays, and the label/hover texts are templates over customdata
+    (table id, size, status, party), so only the varying values are sent.
+    
+    Args:
+        snapshot: Snapshot dictionary (with at least one table)
+        
+    Returns:
+        Dictionary with x, y, marker.color, marker.size and customdata
+    """
+    tables = snapshot.get("tables", [])
+    xs, ys, _, _ = _grid_coords(len(tables))
+    
+    colors, sizes, labels = [], [], []
+    # Bound methods, looked up once rather than per table
+    party_status_get = None
+    colors_append, sizes_append, labels_append = colors.append, sizes.append, labels.append
+    for i, table in enumerate(tables):
+        table_id = table.get("id", i)
+        table_size = table.get("size", 2)
+        party_id = table.get("party_id")
+        is_available = table.get("is_available", True)
+        
+        # Determine table status and color
+        if party_id is not None:
+            if party_status_get is None:
+                party_status = {p.get("id"): p.get("status", "occupied") for p in snapshot.get("parties", [])}
+                party_status_get = party_status.get
+            color, status_text = _seated_table_style(party_status_get(party_id, "occupied"))
+        elif is_available:
+            color, status_text = _AVAILABLE_TABLE_STYLE
+        else:
+            color, status_text = _UNAVAILABLE_TABLE_STYLE
+        
+        colors_append(color)
+        sizes_append(30 + table_size * 5)
+        labels_append((table_id, table_size, status_text, party_id if party_id else "None"))
+    
+    return {
+        "x": xs,
+        "y": ys,
+        "marker.color": colors,
+        "marker.size": np.asarray(sizes, dtype=np.int16),
+        "customdata": labels,
+    }
 
 
 def render_restaurant_layout(
@@ -168,100 +479,57 @@ def render_restaurant_layout(
         return _empty_layout_figure("No snapshot data")
     
     tables = snapshot.get("tables", [])
-    parties = snapshot.get("parties", [])
     
     if not tables:
         return _empty_layout_figure("No table data in snapshot")
     
-    # Create party lookup
-    party_map = {p.get("id"): p for p in parties}
+    fig = _build_layout_skeleton(len(tables), width, height)
+    _update_layout_frame(fig, snapshot)
+    return fig
+
+
+def _build_layout_skeleton(num_tables: int, width: int = 800, height: int = 600) -> go.Figure:
+    """Restaurant layout figure for num_tables tables, without per-table data.
     
-    # Calculate grid layout for tables
-    num_tables = len(tables)
-    cols = math.ceil(math.sqrt(num_tables))
-    rows = math.ceil(num_tables / cols)
+    Trace 0 holds the tables and is filled in by _update_layout_frame; the
+    grid, axes and legend depend only on the number of tables. A constant
+    uirevision keeps zoom/legend state across frames, while each frame's
+    datarevision marks only the data as changed.
+    """
+    _, _, cols, rows = _grid_coords(num_tables)
     
     fig = go.Figure()
     
-    # Add tables as scatter points with markers
-    for i, table in enumerate(tables):
-        row = i // cols
-        col = i % cols
-        
-        x = col * 2 + 1
-        y = (rows - row - 1) * 2 + 1
-        
-        table_id = table.get("id", i)
-        table_size = table.get("size", 2)
-        party_id = table.get("party_id")
-        is_available = table.get("is_available", True)
-        
-        # Determine table status and color
-        if party_id is not None:
-            party = party_map.get(party_id, {})
-            party_status = party.get("status", "occupied")
-            if party_status == "cleaning":
-                color = STATUS_COLORS["cleaning"]
-                status_text = "Cleaning"
-            else:
-                color = STATUS_COLORS["occupied"]
-                status_text = party_status.replace("_", " ").title()
-        elif is_available:
-            color = STATUS_COLORS["available"]
-            status_text = "Available"
-        else:
-            color = STATUS_COLORS["cleaning"]
-            status_text = "Unavailable"
-        
-        # Add table marker
-        marker_size = 30 + table_size * 5
-        
-        fig.add_trace(go.Scatter(
-            x=[x],
-            y=[y],
-            mode="markers+text",
-            marker=dict(
-                size=marker_size,
-                color=color,
-                line=dict(color="white", width=2),
-                symbol="square",
-            ),
-            text=f"T{table_id}<br>{table_size}",
-            textposition="middle center",
-            textfont=dict(color="white", size=10),
-            hovertemplate=(
-                f"<b>Table {table_id}</b><br>"
-                f"Size: {table_size}<br>"
-                f"Status: {status_text}<br>"
-                f"Party: {party_id if party_id else 'None'}"
-                "<extra></extra>"
-            ),
-            showlegend=False,
-        ))
+    # Add tables as a single scatter trace with per-point markers (WebGL
+    # when there are enough tables for SVG markers to get slow)
+    scatter = go.Scattergl if num_tables >= WEBGL_TABLE_THRESHOLD else go.Scatter
+    fig.add_trace(scatter(
+        mode="markers+text",
+        marker=dict(
+            line=dict(color="white", width=2),
+            symbol="square",
+        ),
+        texttemplate="T%{customdata[0]}<br>%{customdata[1]}",
+        textposition="middle center",
+        textfont=dict(color="white", size=10),
+        hovertemplate=(
+            "<b>Table %{customdata[0]}</b><br>"
+            "Size: %{customdata[1]}<br>"
+            "Status: %{customdata[2]}<br>"
+            "Party: %{customdata[3]}"
+            "<extra></extra>"
+        ),
+        showlegend=False,
+    ))
     
-    # Configure layout
+    # Configure layout (fixed options come from the template)
     fig.update_layout(
+        template="restaurant_layout",
+        uirevision="static",
         width=width,
         height=height,
-        xaxis=dict(
-            showgrid=False,
-            zeroline=False,
-            showticklabels=False,
-            range=[0, cols * 2 + 1],
-        ),
-        yaxis=dict(
-            showgrid=False,
-            zeroline=False,
-            showticklabels=False,
-            range=[0, rows * 2 + 1],
-            scaleanchor="x",
-        ),
-        plot_bgcolor="rgba(248, 249, 250, 1)",
-        margin=dict(l=20, r=20, t=40, b=20),
-        title=dict(
-            text=f"Restaurant Layout - {format_time_display(snapshot.get('time', 0))}",
-            x=0.5,
-        ),
+        xaxis=dict(range=[0, cols * 2 + 1]),
+        yaxis=dict(range=[0, rows * 2 + 1], scaleanchor="x"),
     )
     
     # Add legend for table status
@@ -277,19 +545,43 @@ def render_restaurant_layout(
             showlegend=True,
         ))
     
-    fig.update_layout(
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=1.02,
-            xanchor="center",
-            x=0.5,
-        ),
-    )
-    
     return fig
 
 
+def _update_layout_frame(fig: go.Figure, snapshot: Dict) -> None:
+    """Fill a layout skeleton's table trace and title from a snapshot."""
+    with fig.batch_update():
+        fig.data[0].update(build_layout_trace_data(snapshot))
+        fig.layout.title.text = _layout_title(snapshot)
+        fig.layout.datarevision = snapshot.get("time", 0)
+
+
+def build_station_trace_data(snapshot: Dict) -> List[Dict[str, Any]]:
+    """Data of the station status figure's Busy, Idle and Queue bar traces.
+    
+    Slot and queue counts are NumPy arrays (idle = capacity - busy, computed
+    in one vectorized step), which Plotly passes on as typed arrays.
+    
+    Args:
+        snapshot: Snapshot dictionary
+        
+    Returns:
+        One {x, y} dictionary per trace, in trace order
+    """
+    stations = snapshot.get("stations", [])
+    count = len(stations)
+    names = [station.get("name", "Unknown").title() for station in stations]
+    busy_slots = np.fromiter((s.get("busy_slots", 0) for s in stations), dtype=np.int32, count=count)
+    capacity = np.fromiter((s.get("capacity", 1) for s in stations), dtype=np.int32, count=count)
+    queue_lengths = np.fromiter((s.get("queue_length", 0) for s in stations), dtype=np.int32, count=count)
+    
+    return [
+        {"x": names, "y": busy_slots},
+        {"x": names, "y": capacity - busy_slots},
+        {"x": names, "y": queue_lengths},
+    ]
+
+
 def render_station_status(
     snapshot: Dict,
     width: int = 600,
@@ -313,17 +605,15 @@ def render_station_status(
     if not stations:
         return _empty_layout_figure("No station data")
     
-    names = []
-    busy_slots = []
-    capacities = []
-    queue_lengths = []
-    
-    for station in stations:
-        names.append(station.get("name", "Unknown").title())
-        busy_slots.append(station.get("busy_slots", 0))
-        capacities.append(station.get("capacity", 1))
-        queue_lengths.append(station.get("queue_length", 0))
-    
+    traces = build_station_trace_data(snapshot)
+    fig = _build_station_skeleton(traces[0]["x"], width, height)
+    _update_station_frame(fig, traces, snapshot.get("time", 0))
+    return fig
+
+
+def _build_station_skeleton(names: List[str], width: int = 600, height: int = 300) -> go.Figure:
+    """Station status figure for the given stations, without bar heights
+    (filled in by _update_station_frame)."""
     fig = make_subplots(
         rows=1, cols=2,
         subplot_titles=("Station Utilization", "Queue Lengths"),
@@ -334,7 +624,6 @@ def render_station_status(
     fig.add_trace(
         go.Bar(
             x=names,
-            y=busy_slots,
             name="Busy",
             marker_color=STATUS_COLORS["busy"],
         ),
@@ -344,7 +633,6 @@ def render_station_status(
     fig.add_trace(
         go.Bar(
             x=names,
-            y=[c - b for c, b in zip(capacities, busy_slots)],
             name="Idle",
             marker_color=STATUS_COLORS["idle"],
         ),
@@ -355,7 +643,6 @@ def render_station_status(
     fig.add_trace(
         go.Bar(
             x=names,
-            y=queue_lengths,
             name="Queue",
             marker_color="#F18F01",
             showlegend=False,
@@ -364,18 +651,10 @@ def render_station_status(
     )
     
     fig.update_layout(
+        template="restaurant_stations",
+        uirevision="static",
         width=width,
         height=height,
-        barmode="stack",
-        template="plotly_white",
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=1.02,
-            xanchor="center",
-            x=0.25,
-        ),
-        margin=dict(l=40, r=40, t=60, b=40),
     )
     
     fig.update_yaxes(title_text="Slots", row=1, col=1)
@@ -384,6 +663,51 @@ def render_station_status(
     return fig
 
 
+def _update_station_frame(fig: go.Figure, traces: List[Dict[str, Any]], revision: float = 0) -> None:
+    """Set a station skeleton's bar heights (from build_station_trace_data).
+    
+    revision (the snapshot time) becomes the figure's datarevision.
+    """
+    with fig.batch_update():
+        for trace, data in zip(fig.data, traces):
+            trace.y = data["y"]
+        fig.layout.datarevision = revision
+
+
+def _party_stage_index(party: Dict) -> Optional[int]:
+    """Index in PARTY_FLOW_STAGES of a party's stage (None if not a stage).
+    
+    The stage is the party's status, except that waiting parties with some
+    (but not all) dishes delivered are "receiving_food".
+    """
+    status = party.get("status", "unknown")
+    
+    # Check if party is receiving food (some dishes delivered, not all)
+    if status == "waiting_for_food":
+        dishes_delivered = party.get("dishes_delivered_count", 0)
+        if 0 < dishes_delivered < party.get("total_dishes", 0):
+            status = "receiving_food"
+    return _party_flow_stage_get(status)
+
+
+def build_party_flow_counts(snapshot: Dict) -> List[int]:
+    """Number of parties in each PARTY_FLOW_STAGES stage.
+    
+    Args:
+        snapshot: Snapshot dictionary
+        
+    Returns:
+        Counts in stage order
+    """
+    counts = [0] * len(PARTY_FLOW_STAGES)
+    stage_index = _party_stage_index
+    for party in snapshot.get("parties", []):
+        stage = stage_index(party)
+        if stage is not None:
+            counts[stage] += 1
+    return counts
+
+
 def render_party_flow(
     snapshot: Dict,
     width: int = 800,
@@ -402,60 +726,18 @@ def render_party_flow(
     if not snapshot:
         return _empty_layout_figure("No snapshot data")
     
-    parties = snapshot.get("parties", [])
-    
-    # Count parties by status, with additional breakdown for food delivery
-    status_counts = {}
-    receiving_food_count = 0  # Parties with some dishes delivered but not all
-    
-    for party in parties:
-        status = party.get("status", "unknown")
-        
-        # Check if party is receiving food (some dishes delivered, not all)
-        dishes_delivered = party.get("dishes_delivered_count", 0)
-        total_dishes = party.get("total_dishes", 0)
-        
-        if status == "waiting_for_food" and dishes_delivered > 0 and dishes_delivered < total_dishes:
-            status = "receiving_food"
-        
-        status_counts[status] = status_counts.get(status, 0) + 1
-    
-    # Define flow stages (updated with new states)
-    stages = [
-        "waiting_for_table",
-        "being_seated",
-        "deciding",
-        "ordering",
-        "waiting_for_food",
-        "receiving_food",
-        "dining",
-        "paying",
-        "cleaning",
-        "departed",
-    ]
-    
-    stage_labels = [
-        "Waiting for Table",
-        "Being Seated",
-        "Deciding",
-        "Ordering",
-        "Waiting for Food",
-        "Receiving Food",
-        "Dining",
-        "Paying",
-        "Cleaning",
-        "Departed",
-    ]
-    
-    counts = [status_counts.get(s, 0) for s in stages]
-    colors = [STATUS_COLORS.get(s, "#6C757D") for s in stages]
-    
+    fig = _build_party_flow_skeleton(width, height)
+    _update_party_flow_frame(fig, build_party_flow_counts(snapshot), snapshot.get("time", 0))
+    return fig
+
+
+def _build_party_flow_skeleton(width: int = 800, height: int = 250) -> go.Figure:
+    """Party flow funnel without counts (filled in by _update_party_flow_frame)."""
     fig = go.Figure(go.Funnel(
-        y=stage_labels,
-        x=counts,
+        y=PARTY_FLOW_LABELS,
         textposition="inside",
         textinfo="value",
-        marker=dict(color=colors),
+        marker=dict(color=PARTY_FLOW_COLORS),
         connector=dict(line=dict(color="royalblue", dash="solid", width=2)),
     ))
     
@@ -464,12 +746,23 @@ def render_party_flow(
         height=height,
         title="Party Flow",
         template="plotly_white",
+        uirevision="static",
         margin=dict(l=20, r=20, t=60, b=20),
     )
     
     return fig
 
 
+def _update_party_flow_frame(fig: go.Figure, counts: List[int], revision: float = 0) -> None:
+    """Set a party flow skeleton's stage counts (in PARTY_FLOW_STAGES order).
+    
+    revision (the snapshot time) becomes the figure's datarevision.
+    """
+    with fig.batch_update():
+        fig.data[0].x = counts
+        fig.layout.datarevision = revision
+
+
 def render_current_metrics(
     snapshot: Dict,
     total_seats: int = 0
@@ -486,42 +779,47 @@ def render_current_metrics(
     if not snapshot:
         return {}
     
-    time_minutes = snapshot.get("time", 0)
+    snapshot_get = snapshot.get  # bound once for the field reads below
+    time_minutes = snapshot_get("time", 0)
     time_hours = time_minutes / 60.0
-    revenue = snapshot.get("total_revenue", 0)
+    revenue = snapshot_get("total_revenue", 0)
     
     # RevPASH
     revpash = safe_divide(revenue, total_seats * time_hours, 0) if time_hours > 0 and total_seats > 0 else 0
     
     # Table utilization
-    tables = snapshot.get("tables", [])
+    tables = snapshot_get("tables", [])
+    total_tables = len(tables)
     occupied = sum(1 for t in tables if t.get("party_id") is not None)
-    table_util = safe_divide(occupied, len(tables), 0) if tables else 0
+    table_util = safe_divide(occupied, total_tables, 0) if tables else 0
     
     # Party counts
-    parties_in_system = snapshot.get("parties_in_system", 0)
-    parties_served = snapshot.get("parties_served", 0)
+    parties_in_system = snapshot_get("parties_in_system", 0)
+    parties_served = snapshot_get("parties_served", 0)
     
     # Queue lengths
-    guest_queue = snapshot.get("guest_queue_length", 0)
-    expo_queue = snapshot.get("expo_queue_length", 0)
-    food_runner_queue = snapshot.get("food_runner_queue", 0)
-    
-    # Dish counts
-    dishes = snapshot.get("dishes", [])
-    dishes_cooking = sum(1 for d in dishes if d.get("status") == "cooking")
-    dishes_ready = sum(1 for d in dishes if d.get("status") in ["ready", "expo_check", "expo_queue"])
-    dishes_delivered = sum(1 for d in dishes if d.get("status") == "delivered")
+    guest_queue = snapshot_get("guest_queue_length", 0)
+    expo_queue = snapshot_get("expo_queue_length", 0)
+    food_runner_queue = snapshot_get("food_runner_queue", 0)
+    
+    # Dish counts (one pass over the dishes)
+    dishes = snapshot_get("dishes", [])
+    dish_counts = Counter(d.get("status") for d in dishes)
+    dishes_cooking = dish_counts["cooking"]
+    dishes_ready = dish_counts["ready"] + dish_counts["expo_check"] + dish_counts["expo_queue"]
+    dishes_delivered = dish_counts["delivered"]
     total_dishes = len(dishes)
     
     # Station utilization
-    stations = snapshot.get("stations", [])
-    total_station_busy = sum(s.get("busy_slots", 0) for s in stations)
-    total_station_capacity = sum(s.get("capacity", 1) for s in stations)
+    total_station_busy = 0
+    total_station_capacity = 0
+    for station in snapshot_get("stations", []):
+        total_station_busy += station.get("busy_slots", 0)
+        total_station_capacity += station.get("capacity", 1)
     station_util = safe_divide(total_station_busy, total_station_capacity, 0)
     
     # Active delivery tasks
-    tasks = snapshot.get("tasks", [])
+    tasks = snapshot_get("tasks", [])
     active_deliveries = sum(1 for t in tasks if t.get("task_type") == "DELIVERY")
     
     return {
@@ -531,7 +829,7 @@ def render_current_metrics(
         "revpash": revpash,
         "table_utilization": table_util,
         "occupied_tables": occupied,
-        "total_tables": len(tables),
+        "total_tables": total_tables,
         "parties_in_system": parties_in_system,
         "parties_served": parties_served,
         "guest_queue": guest_queue,
@@ -546,15 +844,26 @@ def render_current_metrics(
     }
 
 
+# Placeholder figures by message (see _empty_layout_figure)
+_EMPTY_FIG_CACHE: Dict[str, go.Figure] = {}
+
+
 def _empty_layout_figure(message: str) -> go.Figure:
     """Create an empty figure with a message.
     
+    The figure is built once per message and shared, so callers must not
+    modify it.
+    
     Args:
         message: Message to display
         
     Returns:
         Plotly Figure object
     """
+    fig = _EMPTY_FIG_CACHE.get(message)
+    if fig is not None:
+        return fig
+    
     fig = go.Figure()
     fig.add_annotation(
         text=message,
@@ -570,5 +879,5 @@ def _empty_layout_figure(message: str) -> go.Figure:
         yaxis=dict(visible=False),
         template="plotly_white",
     )
+    _EMPTY_FIG_CACHE[message] = fig
     return fig
-
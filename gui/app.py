@@ -27,7 +27,8 @@ if str(gui_path) not in sys.path:
     sys.path.append(str(gui_path))
 
 import streamlit as st
-import time
+import hashlib
+import json
 from typing import Dict, Any, Optional
 
 # Import GUI modules
@@ -41,6 +42,7 @@ from metrics_calculator import (
     calculate_queue_metrics,
     calculate_throughput_metrics,
     calculate_service_times,
+    calculate_service_time_stats,
     calculate_summary_statistics,
 )
 try:
@@ -104,10 +106,6 @@ from visualizations import (
 )
 from animation_player import (
     AnimationPlayer,
-    render_restaurant_layout,
-    render_station_status,
-    render_party_flow,
-    render_current_metrics,
 )
 
 # Load gui/utils.py explicitly to avoid conflict with experiments/utils.py
@@ -122,6 +120,239 @@ get_total_tables_from_snapshots = gui_utils.get_total_tables_from_snapshots
 format_time_display = gui_utils.format_time_display
 get_time_range = gui_utils.get_time_range
 
+# Seconds between animation frames while playing
+ANIMATION_FRAME_INTERVAL = 0.1
+
+
+def data_signature(data: Dict[str, Any]) -> str:
+    """Stable fingerprint of a simulation log's content.
+    
+    Keys the metrics cache (shared across sessions) and the session's
+    animation player. Hashes the metadata, snapshot count and final
+    snapshot rather than the whole log, which is enough to tell simulation
+    runs apart.
+    """
+    snapshots = data.get("snapshots", [])
+    return hashlib.sha1(json.dumps(
+        {
+            "metadata": data.get("metadata", {}),
+            "num_snapshots": len(snapshots),
+            "final": snapshots[-1] if snapshots else None,
+        },
+        sort_keys=True, default=str
+    ).encode()).hexdigest()
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def compute_dashboard_metrics(
+    data_sig: str,
+    _snapshots: list,
+    total_seats: int,
+    total_tables: int
+) -> Dict[str, Any]:
+    """Metric DataFrames for the dashboard tabs, cached per simulation log.
+    
+    Streamlit reruns the script on every widget change and playback tick;
+    the snapshots argument is not hashed (leading underscore), data_sig
+    identifies the log instead.
+    """
+    service_times = calculate_service_times(_snapshots)
+    return {
+        "revpash": calculate_revpash(_snapshots, total_seats),
+        "table_util": calculate_table_utilization(_snapshots, total_tables),
+        "staff_util": calculate_staff_utilization(_snapshots),
+        "station_util": calculate_station_utilization(_snapshots),
+        "queue": calculate_queue_metrics(_snapshots),
+        "throughput": calculate_throughput_metrics(_snapshots),
+        "service_times": service_times,
+        "service_time_stats": calculate_service_time_stats(service_times),
+        "summary": calculate_summary_statistics(_snapshots),
+    }
+
+
+def build_dashboard_figures(metrics: Dict[str, Any]) -> Dict[str, Any]:
+    """Plotly figures of the non-animation tabs, built once per simulation log.
+    
+    Args:
+        metrics: Result of compute_dashboard_metrics
+        
+    Returns:
+        Dictionary of figures by chart name
+    """
+    revpash_df = metrics["revpash"]
+    staff_util_df = metrics["staff_util"]
+    station_util_df = metrics["station_util"]
+    queue_df = metrics["queue"]
+    throughput_df = metrics["throughput"]
+    service_times = metrics["service_times"]
+    
+    figs = {
+        "revpash": plot_revpash_over_time(revpash_df),
+        "revenue": plot_revenue_accumulation(revpash_df),
+        "kitchen_performance": plot_kitchen_performance(station_util_df),
+        "dish_flow": plot_dish_flow(throughput_df),
+        "station_queues": plot_station_queues(queue_df),
+        "table_util": plot_table_utilization(metrics["table_util"]),
+        "staff_util": plot_staff_utilization(staff_util_df),
+        "station_util": plot_station_utilization(station_util_df),
+        "staff_heatmap": plot_utilization_heatmap(staff_util_df, "staff"),
+        "station_heatmap": plot_utilization_heatmap(station_util_df, "station"),
+        "queue_lengths": plot_queue_lengths(queue_df),
+        "throughput": plot_throughput(throughput_df),
+    }
+    if service_times:
+        figs["service_times"] = plot_service_time_distribution(service_times)
+    return figs
+
+
+def animation_panel(snapshots: list) -> None:
+    """Animation tab: playback controls, current metrics and state figures.
+    
+    Runs as a Streamlit fragment that reruns itself on a timer while
+    playing, so playback only re-executes this panel, not the whole app.
+    """
+    st.header("System Animation")
+    
+    # Playback controls at the top of the animation tab
+    st.subheader("🎬 Playback Controls")
+    
+    # Time range (the player has it already; scanning the snapshots is O(N))
+    player = st.session_state.player
+    if player:
+        min_time, max_time = player.min_time, player.max_time
+    else:
+        min_time, max_time = get_time_range(snapshots)
+    
+    # Time slider
+    st.session_state.current_time = st.slider(
+        "Time",
+        min_value=float(min_time),
+        max_value=float(max_time),
+        value=st.session_state.current_time,
+        format="%.1f min",
+        key="time_slider",
+    )
+    
+    # Control buttons
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        if st.button("⏮️ Start", use_container_width=True):
+            st.session_state.current_time = min_time
+            st.rerun(scope="fragment")
+    with col2:
+        play_text = "⏸️ Pause" if st.session_state.is_playing else "▶️ Play"
+        if st.button(play_text, use_container_width=True):
+            st.session_state.is_playing = not st.session_state.is_playing
+            st.rerun()  # full rerun, to start/stop the fragment timer
+    with col3:
+        if st.button("⏭️ End", use_container_width=True):
+            st.session_state.current_time = max_time
+            st.rerun(scope="fragment")
+    with col4:
+        # Initialize playback speed in session state
+        if 'playback_speed' not in st.session_state:
+            st.session_state.playback_speed = 1.0
+        
+        playback_speed = st.selectbox(
+            "Speed",
+            options=[0.5, 1.0, 2.0, 5.0, 10.0],
+            index=[0.5, 1.0, 2.0, 5.0, 10.0].index(st.session_state.playback_speed),
+            format_func=lambda x: f"{x}x",
+        )
+        st.session_state.playback_speed = playback_speed
+    
+    st.markdown("---")
+    
+    # Get current snapshot (binary search over the player's snapshot times)
+    if player:
+        player.set_time(st.session_state.current_time)
+        current_snapshot = player.get_current_snapshot()
+        
+        if current_snapshot:
+            # Current metrics - expanded row
+            metrics = player.current_metrics()
+            
+            col1, col2, col3, col4, col5, col6 = st.columns(6)
+            
+            with col1:
+                st.metric("Time", metrics.get("time_formatted", "0m"))
+            with col2:
+                st.metric("Revenue", f"${metrics.get('revenue', 0):,.2f}")
+            with col3:
+                st.metric("RevPASH", f"${metrics.get('revpash', 0):.2f}")
+            with col4:
+                st.metric("Table Util", f"{metrics.get('table_utilization', 0) * 100:.0f}%")
+            with col5:
+                st.metric("Station Util", f"{metrics.get('station_utilization', 0) * 100:.0f}%")
+            with col6:
+                st.metric("Parties", metrics.get("parties_in_system", 0))
+            
+            # Dish status row
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("🍳 Cooking", metrics.get("dishes_cooking", 0))
+            with col2:
+                st.metric("✅ Ready", metrics.get("dishes_ready", 0))
+            with col3:
+                st.metric("🚀 Deliveries", metrics.get("active_deliveries", 0))
+            with col4:
+                st.metric("🍽️ Delivered", metrics.get("dishes_delivered", 0))
+            
+            st.markdown("---")
+            
+            # Restaurant layout
+            col1, col2 = st.columns([2, 1])
+            
+            with col1:
+                st.subheader("Restaurant Layout")
+                st.plotly_chart(
+                    player.render_layout(),
+                    use_container_width=True
+                )
+            
+            with col2:
+                st.subheader("Station Status")
+                st.plotly_chart(
+                    player.render_stations(width=400, height=300),
+                    use_container_width=True
+                )
+                
+                st.subheader("Queue Status")
+                col_a, col_b, col_c = st.columns(3)
+                with col_a:
+                    st.metric("Guest", metrics.get("guest_queue", 0))
+                with col_b:
+                    st.metric("Expo", metrics.get("expo_queue", 0))
+                with col_c:
+                    st.metric("Runners", metrics.get("food_runner_queue", 0))
+            
+            # Party flow
+            st.subheader("Party Flow")
+            st.plotly_chart(
+                player.render_party_flow(),
+                use_container_width=True
+            )
+        else:
+            st.warning("No snapshot data available at this time")
+    else:
+        st.warning("Animation player not initialized")
+    
+    # Auto-advance if playing (the fragment timer shows the next frame)
+    if st.session_state.is_playing:
+        if st.session_state.current_time < max_time:
+            # Calculate time increment based on playback speed
+            # Base increment: 0.5 minutes per frame
+            base_increment = 0.5
+            time_increment = base_increment * st.session_state.playback_speed
+            
+            st.session_state.current_time = min(
+                st.session_state.current_time + time_increment,
+                max_time
+            )
+        else:
+            st.session_state.is_playing = False
+            st.rerun()  # full rerun, to stop the fragment timer
+
 
 # Page configuration
 st.set_page_config(
@@ -300,7 +531,6 @@ def main():
                     if result['success']:
                         # Store results in session state
                         st.session_state.data = result['log_data']
-                        st.session_state.player = AnimationPlayer(result['log_data']['snapshots'])
                         st.session_state.current_time = 0.0
                         st.session_state.metrics_stale = True  # Mark metrics as needing recalculation
                         
@@ -368,13 +598,28 @@ def main():
     snapshots = data["snapshots"]
     events = data.get("events", [])
     
-    # Calculate metrics
-    total_seats = get_total_seats_from_snapshots(snapshots)
-    total_tables = get_total_tables_from_snapshots(snapshots)
+    # Fingerprint the log and read its seat/table counts once per loaded
+    # simulation (the layout is fixed over a run)
+    if st.session_state.get("data_sig_source") is not data:
+        st.session_state.data_sig = data_signature(data)
+        st.session_state.total_seats = get_total_seats_from_snapshots(snapshots)
+        st.session_state.total_tables = get_total_tables_from_snapshots(snapshots)
+        st.session_state.data_sig_source = data
+    total_seats = st.session_state.total_seats
+    total_tables = st.session_state.total_tables
+    
+    # Animation player, rebuilt only when the log's content changes (a rerun
+    # or reload of identical results keeps the precomputed player)
+    if st.session_state.player is None or st.session_state.get("player_sig") != st.session_state.data_sig:
+        st.session_state.player = AnimationPlayer(snapshots, total_seats=total_seats)
+        st.session_state.player_sig = st.session_state.data_sig
+    
+    # Calculate metrics (cached across reruns)
+    dashboard_metrics = compute_dashboard_metrics(st.session_state.data_sig, snapshots, total_seats, total_tables)
     
     # Calculate standardized summary statistics for consistency
     if "standardized_metrics" not in st.session_state or st.session_state.get("metrics_stale", True):
-        summary_stats = calculate_summary_statistics(snapshots)
+        summary_stats = dashboard_metrics["summary"]
         st.session_state.standardized_metrics = summary_stats
         st.session_state.metrics_stale = False
         
@@ -389,14 +634,21 @@ def main():
     else:
         summary_stats = st.session_state.standardized_metrics
     
-    revpash_df = calculate_revpash(snapshots, total_seats)
-    table_util_df = calculate_table_utilization(snapshots, total_tables)
-    staff_util_df = calculate_staff_utilization(snapshots)
-    station_util_df = calculate_station_utilization(snapshots)
-    queue_df = calculate_queue_metrics(snapshots)
-    throughput_df = calculate_throughput_metrics(snapshots)
-    service_times = calculate_service_times(snapshots)
-    summary_stats = calculate_summary_statistics(snapshots)
+    revpash_df = dashboard_metrics["revpash"]
+    table_util_df = dashboard_metrics["table_util"]
+    staff_util_df = dashboard_metrics["staff_util"]
+    station_util_df = dashboard_metrics["station_util"]
+    queue_df = dashboard_metrics["queue"]
+    throughput_df = dashboard_metrics["throughput"]
+    service_times = dashboard_metrics["service_times"]
+    summary_stats = dashboard_metrics["summary"]
+    
+    # Figures of the static tabs, built once per log; only the animation
+    # tab's figures change between reruns
+    if st.session_state.get("figs_sig") != st.session_state.data_sig:
+        st.session_state.figs = build_dashboard_figures(dashboard_metrics)
+        st.session_state.figs_sig = st.session_state.data_sig
+    figs = st.session_state.figs
     
     # Render tabs based on availability
     if EXECUTIVE_DASHBOARD_AVAILABLE:
@@ -469,13 +721,13 @@ def main():
             
             with col1:
                 st.plotly_chart(
-                    plot_revpash_over_time(revpash_df),
+                    figs["revpash"],
                     use_container_width=True
                 )
             
             with col2:
                 st.plotly_chart(
-                    plot_revenue_accumulation(revpash_df),
+                    figs["revenue"],
                     use_container_width=True
                 )
     else:
@@ -518,13 +770,13 @@ def main():
             
             with col1:
                 st.plotly_chart(
-                    plot_revpash_over_time(revpash_df),
+                    figs["revpash"],
                     use_container_width=True
                 )
             
             with col2:
                 st.plotly_chart(
-                    plot_revenue_accumulation(revpash_df),
+                    figs["revenue"],
                     use_container_width=True
                 )
     
@@ -567,21 +819,21 @@ def main():
         # Station utilization and queues
         st.subheader("Station Performance")
         st.plotly_chart(
-            plot_kitchen_performance(station_util_df),
+            figs["kitchen_performance"],
             use_container_width=True
         )
         
         # Dish flow
         st.subheader("Dish Flow Through System")
         st.plotly_chart(
-            plot_dish_flow(throughput_df),
+            figs["dish_flow"],
             use_container_width=True
         )
         
         # Station queues
         st.subheader("Station Queue Depths")
         st.plotly_chart(
-            plot_station_queues(queue_df),
+            figs["station_queues"],
             use_container_width=True
         )
     
@@ -618,7 +870,7 @@ def main():
         # Utilization charts
         st.subheader("Table Utilization")
         st.plotly_chart(
-            plot_table_utilization(table_util_df),
+            figs["table_util"],
             use_container_width=True
         )
         
@@ -627,14 +879,14 @@ def main():
         with col1:
             st.subheader("Staff Utilization")
             st.plotly_chart(
-                plot_staff_utilization(staff_util_df),
+                figs["staff_util"],
                 use_container_width=True
             )
         
         with col2:
             st.subheader("Station Utilization")
             st.plotly_chart(
-                plot_station_utilization(station_util_df),
+                figs["station_util"],
                 use_container_width=True
             )
         
@@ -645,165 +897,30 @@ def main():
         
         with col1:
             st.plotly_chart(
-                plot_utilization_heatmap(staff_util_df, "staff"),
+                figs["staff_heatmap"],
                 use_container_width=True
             )
         
         with col2:
             st.plotly_chart(
-                plot_utilization_heatmap(station_util_df, "station"),
+                figs["station_heatmap"],
                 use_container_width=True
             )
         
         # Queue lengths
         st.subheader("Queue Lengths")
         st.plotly_chart(
-            plot_queue_lengths(queue_df),
+            figs["queue_lengths"],
             use_container_width=True
         )
     
     # Tab 5 (or 4): Animation
     tab_anim = tab5 if EXECUTIVE_DASHBOARD_AVAILABLE else tab4
     with tab_anim:
-        st.header("System Animation")
-        
-        # Playback controls at the top of the animation tab
-        st.subheader("🎬 Playback Controls")
-        
-        min_time, max_time = get_time_range(snapshots)
-        
-        # Time slider
-        st.session_state.current_time = st.slider(
-            "Time",
-            min_value=float(min_time),
-            max_value=float(max_time),
-            value=st.session_state.current_time,
-            format="%.1f min",
-            key="time_slider",
-        )
-        
-        # Control buttons
-        col1, col2, col3, col4 = st.columns(4)
-        with col1:
-            if st.button("⏮️ Start", use_container_width=True):
-                st.session_state.current_time = min_time
-                st.rerun()
-        with col2:
-            play_text = "⏸️ Pause" if st.session_state.is_playing else "▶️ Play"
-            if st.button(play_text, use_container_width=True):
-                st.session_state.is_playing = not st.session_state.is_playing
-                st.rerun()
-        with col3:
-            if st.button("⏭️ End", use_container_width=True):
-                st.session_state.current_time = max_time
-                st.rerun()
-        with col4:
-            # Initialize playback speed in session state
-            if 'playback_speed' not in st.session_state:
-                st.session_state.playback_speed = 1.0
-            
-            playback_speed = st.selectbox(
-                "Speed",
-                options=[0.5, 1.0, 2.0, 5.0, 10.0],
-                index=[0.5, 1.0, 2.0, 5.0, 10.0].index(st.session_state.playback_speed),
-                format_func=lambda x: f"{x}x",
-            )
-            st.session_state.playback_speed = playback_speed
-        
-        st.markdown("---")
-        
-        # Get current snapshot
-        player = st.session_state.player
-        if player:
-            player.set_time(st.session_state.current_time)
-            current_snapshot = player.get_current_snapshot()
-            
-            if current_snapshot:
-                # Current metrics - expanded row
-                metrics = render_current_metrics(current_snapshot, total_seats)
-                
-                col1, col2, col3, col4, col5, col6 = st.columns(6)
-                
-                with col1:
-                    st.metric("Time", metrics.get("time_formatted", "0m"))
-                with col2:
-                    st.metric("Revenue", f"${metrics.get('revenue', 0):,.2f}")
-                with col3:
-                    st.metric("RevPASH", f"${metrics.get('revpash', 0):.2f}")
-                with col4:
-                    st.metric("Table Util", f"{metrics.get('table_utilization', 0) * 100:.0f}%")
-                with col5:
-                    st.metric("Station Util", f"{metrics.get('station_utilization', 0) * 100:.0f}%")
-                with col6:
-                    st.metric("Parties", metrics.get("parties_in_system", 0))
-                
-                # Dish status row
-                col1, col2, col3, col4 = st.columns(4)
-                with col1:
-                    st.metric("🍳 Cooking", metrics.get("dishes_cooking", 0))
-                with col2:
-                    st.metric("✅ Ready", metrics.get("dishes_ready", 0))
-                with col3:
-                    st.metric("🚀 Deliveries", metrics.get("active_deliveries", 0))
-                with col4:
-                    st.metric("🍽️ Delivered", metrics.get("dishes_delivered", 0))
-                
-                st.markdown("---")
-                
-                # Restaurant layout
-                col1, col2 = st.columns([2, 1])
-                
-                with col1:
-                    st.subheader("Restaurant Layout")
-                    st.plotly_chart(
-                        render_restaurant_layout(current_snapshot),
-                        use_container_width=True
-                    )
-                
-                with col2:
-                    st.subheader("Station Status")
-                    st.plotly_chart(
-                        render_station_status(current_snapshot, width=400, height=300),
-                        use_container_width=True
-                    )
-                    
-                    st.subheader("Queue Status")
-                    col_a, col_b, col_c = st.columns(3)
-                    with col_a:
-                        st.metric("Guest", metrics.get("guest_queue", 0))
-                    with col_b:
-                        st.metric("Expo", metrics.get("expo_queue", 0))
-                    with col_c:
-                        st.metric("Runners", metrics.get("food_runner_queue", 0))
-                
-                # Party flow
-                st.subheader("Party Flow")
-                st.plotly_chart(
-                    render_party_flow(current_snapshot),
-                    use_container_width=True
-                )
-            else:
-                st.warning("No snapshot data available at this time")
-        else:
-            st.warning("Animation player not initialized")
-        
-        # Auto-advance if playing
-        if st.session_state.is_playing:
-            min_time, max_time = get_time_range(snapshots)
-            if st.session_state.current_time < max_time:
-                # Calculate time increment based on playback speed
-                # Base increment: 0.5 minutes per rerun
-                base_increment = 0.5
-                time_increment = base_increment * st.session_state.playback_speed
-                
-                st.session_state.current_time = min(
-                    st.session_state.current_time + time_increment,
-                    max_time
-                )
-                st.rerun()
-            else:
-                st.session_state.is_playing = False
-    
+        st.fragment(run_every=ANIMATION_FRAME_INTERVAL if st.session_state.is_playing else None)(
+            animation_panel
+        )(snapshots)
+
     # Tab 6 (or 5): Performance Summary
     tab_summary = tab6 if EXECUTIVE_DASHBOARD_AVAILABLE else tab5
     with tab_summary:
@@ -841,7 +958,7 @@ def main():
         # Throughput chart
         st.subheader("Throughput Over Time")
         st.plotly_chart(
-            plot_throughput(throughput_df),
+            figs["throughput"],
             use_container_width=True
         )
         
@@ -850,48 +967,26 @@ def main():
         
         if service_times:
             st.plotly_chart(
-                plot_service_time_distribution(service_times),
+                figs["service_times"],
                 use_container_width=True
             )
             
             # Summary statistics for service times - expanded to 4 columns
-            col1, col2, col3, col4 = st.columns(4)
-            
-            with col1:
-                if service_times.get("wait_times"):
-                    import numpy as np
-                    wait_times = service_times["wait_times"]
-                    st.markdown("**Wait Times**")
-                    st.write(f"Mean: {np.mean(wait_times):.1f} min")
-                    st.write(f"Median: {np.median(wait_times):.1f} min")
-                    st.write(f"Max: {np.max(wait_times):.1f} min")
-            
-            with col2:
-                if service_times.get("kitchen_times"):
-                    import numpy as np
-                    kitchen_times = service_times["kitchen_times"]
-                    st.markdown("**Kitchen Times**")
-                    st.write(f"Mean: {np.mean(kitchen_times):.1f} min")
-                    st.write(f"Median: {np.median(kitchen_times):.1f} min")
-                    st.write(f"Max: {np.max(kitchen_times):.1f} min")
-            
-            with col3:
-                if service_times.get("dining_times"):
-                    import numpy as np
-                    dining_times = service_times["dining_times"]
-                    st.markdown("**Dining Times**")
-                    st.write(f"Mean: {np.mean(dining_times):.1f} min")
-                    st.write(f"Median: {np.median(dining_times):.1f} min")
-                    st.write(f"Max: {np.max(dining_times):.1f} min")
-            
-            with col4:
-                if service_times.get("total_times"):
-                    import numpy as np
-                    total_times = service_times["total_times"]
-                    st.markdown("**Total Times**")
-                    st.write(f"Mean: {np.mean(total_times):.1f} min")
-                    st.write(f"Median: {np.median(total_times):.1f} min")
-                    st.write(f"Max: {np.max(total_times):.1f} min")
+            service_time_stats = dashboard_metrics["service_time_stats"]
+            columns = st.columns(4)
+            for col, (key, label) in zip(columns, [
+                ("wait_times", "Wait Times"),
+                ("kitchen_times", "Kitchen Times"),
+                ("dining_times", "Dining Times"),
+                ("total_times", "Total Times"),
+            ]):
+                with col:
+                    stats = service_time_stats.get(key)
+                    if stats:
+                        st.markdown(f"**{label}**")
+                        st.write(f"Mean: {stats['mean']:.1f} min")
+                        st.write(f"Median: {stats['median']:.1f} min")
+                        st.write(f"Max: {stats['max']:.1f} min")
         else:
             st.info("No completed parties in the simulation data")
     
@@ -156,8 +156,8 @@ class SimulationRunner:
                     "num_snapshots": len(sim.snapshot_history),
                     "num_events": len(sim.event_log),
                 },
-                "snapshots": sim.snapshot_history,
-                "events": sim.event_log,
+                "snapshots": list(sim.snapshot_history),
+                "events": list(sim.event_log),
             }
             
             # Update status
@@ -9,6 +9,11 @@ from typing import Dict, List, Tuple, Optional, Any, Union
 from pathlib import Path
 import io
 
+try:
+    import ijson
+except ImportError:  # optional: streaming log parsing
+    ijson = None
+
 import sys
 from pathlib import Path
 import importlib.util
@@ -272,6 +277,96 @@ def group_events_by_type(events: List[Dict]) -> Dict[str, List[Dict]]:
     return grouped
 
 
+# Top-level log lists that are filtered while streaming, with their time field
+_STREAMED_FIELDS = {"snapshots": "time", "events": "timestamp"}
+
+
+def _build_json_value(parse_events, event: str, value: Any) -> Any:
+    """Build the JSON value starting at (event, value) from ijson parse events."""
+    builder = ijson.ObjectBuilder()
+    builder.event(event, value)
+    depth = 1 if event in ("start_map", "start_array") else 0
+    while depth:
+        _, event, value = next(parse_events)
+        builder.event(event, value)
+        if event in ("start_map", "start_array"):
+            depth += 1
+        elif event in ("end_map", "end_array"):
+            depth -= 1
+    return builder.value
+
+
+def _stream_log_file(
+    file_source: Union[str, Path, io.BytesIO],
+    start_time: float,
+    end_time: float
+) -> Dict[str, Any]:
+    """Load a log with ijson, keeping only snapshots/events in a time range.
+    
+    Snapshots and events are parsed one at a time and dropped right away
+    when outside [start_time, end_time], so the rest of the log is never
+    held in memory. Other top-level fields are loaded as usual.
+    
+    Args:
+        file_source: File path or file-like object
+        start_time: Start of the kept range in minutes
+        end_time: End of the kept range in minutes
+        
+    Returns:
+        Log data dictionary with filtered snapshots and events
+        
+    Raises:
+        LogValidationError: If the file is invalid or missing required fields
+    """
+    if isinstance(file_source, (str, Path)):
+        try:
+            with open(file_source, 'rb') as f:
+                return _stream_log_file(f, start_time, end_time)
+        except FileNotFoundError:
+            raise LogValidationError(f"File not found: {file_source}")
+    if not hasattr(file_source, 'read'):
+        raise LogValidationError(f"Unsupported file source type: {type(file_source)}")
+    
+    data = {}
+    first_snapshot = None
+    try:
+        parse_events = ijson.parse(file_source, buf_size=65536, use_float=True)
+        _, event, value = next(parse_events)
+        if event != "start_map":
+            raise LogValidationError("Log data must be a dictionary")
+        
+        for _, event, key in parse_events:
+            if event == "end_map":
+                break
+            _, event, value = next(parse_events)
+            time_field = _STREAMED_FIELDS.get(key)
+            if time_field is None or event != "start_array":
+                data[key] = _build_json_value(parse_events, event, value)
+                continue
+            
+            items = []
+            for _, event, value in parse_events:
+                if event == "end_array":
+                    break
+                item = _build_json_value(parse_events, event, value)
+                if key == "snapshots" and first_snapshot is None:
+                    first_snapshot = item
+                item_time = item.get(time_field, 0) if isinstance(item, dict) else 0
+                if start_time <= item_time <= end_time:
+                    items.append(item)
+            data[key] = items
+    except (ijson.JSONError, StopIteration) as e:
+        raise LogValidationError(f"Invalid JSON format: {e}")
+    
+    # Validate as the unfiltered log (the first snapshot may be filtered out)
+    if first_snapshot is not None:
+        validate_log_structure({**data, "snapshots": [first_snapshot]})
+    else:
+        validate_log_structure(data)
+    
+    return data
+
+
 def load_and_prepare_data(
     file_source: Union[str, Path, io.BytesIO],
     max_hours: float = 4.0
@@ -284,6 +379,9 @@ def load_and_prepare_data(
     3. Filters to the maximum time range
     4. Computes summary statistics
     
+    With ijson installed, the file is parsed incrementally and snapshots
+    and events past the time range are dropped as they are read.
+    
     Args:
         file_source: File path or file-like object
         max_hours: Maximum time range in hours (default: 4.0)
@@ -296,7 +394,10 @@ def load_and_prepare_data(
             - summary: Computed summary statistics
     """
     # Load and validate
-    data = load_log_file(file_source)
+    if ijson is not None:
+        data = _stream_log_file(file_source, 0.0, convert_hours_to_minutes(max_hours))
+    else:
+        data = load_log_file(file_source)
     
     # Filter to time range
     snapshots = data.get("snapshots", [])
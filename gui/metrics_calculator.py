@@ -75,6 +75,43 @@ def calculate_revpash(
     return pd.DataFrame(data)
 
 
+def calculate_revpash_summary(
+    snapshots: List[Dict],
+    total_seats: Optional[int] = None
+) -> Dict[str, float]:
+    """Final and average RevPASH without building the per-snapshot DataFrame.
+    
+    Same values as the last row and the mean of calculate_revpash().
+    
+    Args:
+        snapshots: List of snapshot dictionaries
+        total_seats: Total seat count (if None, extracted from snapshots)
+        
+    Returns:
+        Dictionary with final_revpash, average_revpash and data_points
+    """
+    if not snapshots:
+        return {"final_revpash": 0, "average_revpash": 0, "data_points": 0}
+    
+    if total_seats is None:
+        total_seats = get_total_seats_from_snapshots(snapshots)
+    
+    if total_seats == 0:
+        total_seats = 1  # Avoid division by zero
+    
+    n = len(snapshots)
+    time_hours = np.fromiter((s.get("time", 0) for s in snapshots), dtype=np.float64, count=n) / 60.0
+    revenue = np.fromiter((s.get("total_revenue", 0) for s in snapshots), dtype=np.float64, count=n)
+    seat_hours = total_seats * time_hours
+    revpash = np.divide(revenue, seat_hours, out=np.zeros(n), where=time_hours > 0)
+    
+    return {
+        "final_revpash": float(revpash[-1]),
+        "average_revpash": float(revpash.mean()),
+        "data_points": n,
+    }
+
+
 def calculate_instantaneous_revpash(
     snapshots: List[Dict],
     total_seats: Optional[int] = None,
@@ -443,6 +480,29 @@ def calculate_throughput_metrics(snapshots: List[Dict]) -> pd.DataFrame:
     return pd.DataFrame(data)
 
 
+def calculate_throughput_summary(snapshots: List[Dict]) -> Dict[str, int]:
+    """Final throughput counts without building the per-snapshot DataFrame.
+    
+    Same values as the last row of calculate_throughput_metrics(); only the
+    last snapshot is inspected.
+    
+    Args:
+        snapshots: List of snapshot dictionaries
+        
+    Returns:
+        Dictionary with parties_served, dishes_delivered and data_points
+    """
+    if not snapshots:
+        return {"parties_served": 0, "dishes_delivered": 0, "data_points": 0}
+    
+    final = snapshots[-1]
+    return {
+        "parties_served": int(final.get("parties_served", 0)),
+        "dishes_delivered": sum(1 for d in final.get("dishes", []) if d.get("status") == "delivered"),
+        "data_points": len(snapshots),
+    }
+
+
 def calculate_service_times(snapshots: List[Dict]) -> Dict[str, List[float]]:
     """Calculate service time distributions from party data.
     
@@ -519,6 +579,28 @@ def calculate_service_times(snapshots: List[Dict]) -> Dict[str, List[float]]:
     }
 
 
+def calculate_service_time_stats(service_times: Dict[str, List[float]]) -> Dict[str, Dict[str, float]]:
+    """Mean, median and max of each service time distribution.
+    
+    Args:
+        service_times: Result of calculate_service_times
+        
+    Returns:
+        Dictionary mapping each non-empty distribution to its statistics
+    """
+    stats = {}
+    for key, values in service_times.items():
+        if not values:
+            continue
+        arr = np.asarray(values, dtype=np.float64)
+        stats[key] = {
+            "mean": float(arr.mean()),
+            "median": float(np.median(arr)),
+            "max": float(arr.max()),
+        }
+    return stats
+
+
 def calculate_summary_statistics(snapshots: List[Dict]) -> Dict[str, Any]:
     """Calculate summary statistics for the simulation.
     
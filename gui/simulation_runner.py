@@ -120,8 +120,8 @@ def convert_simulation_to_log_format(
     # Build log structure
     log_data = {
         "metadata": metadata,
-        "snapshots": sim.snapshot_history,
-        "events": sim.event_log,
+        "snapshots": list(sim.snapshot_history),
+        "events": list(sim.event_log),
     }
     
     return log_data
@@ -3,7 +3,7 @@
 Helper functions for time conversion, data extraction, and common operations.
 """
 
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Sequence
 import bisect
 
 
@@ -112,7 +112,12 @@ def get_simulation_parameters_from_metadata(metadata: Dict) -> Dict[str, Any]:
     }
 
 
-def find_snapshot_index_at_time(snapshots: List[Dict], target_time: float) -> int:
+def find_snapshot_index_at_time(
+    snapshots: List[Dict],
+    target_time: float,
+    times: Optional[Sequence[float]] = None,
+    lo: int = 0
+) -> int:
     """Find the index of the snapshot closest to the target time.
     
     Uses binary search for efficiency.
@@ -120,6 +125,9 @@ def find_snapshot_index_at_time(snapshots: List[Dict], target_time: float) -> in
     Args:
         snapshots: List of snapshot dictionaries with 'time' field
         target_time: Target time in minutes
+        times: Snapshot times, if already extracted (saves an O(N) pass)
+        lo: Start the search here; every time before index lo must be
+            below target_time
         
     Returns:
         Index of the closest snapshot
@@ -127,10 +135,11 @@ def find_snapshot_index_at_time(snapshots: List[Dict], target_time: float) -> in
     if not snapshots:
         return 0
     
-    times = [s.get("time", 0) for s in snapshots]
+    if times is None:
+        times = [s.get("time", 0) for s in snapshots]
     
     # Use bisect to find insertion point
-    idx = bisect.bisect_left(times, target_time)
+    idx = bisect.bisect_left(times, target_time, lo)
     
     # Handle edge cases
     if idx == 0:
@@ -144,12 +153,17 @@ def find_snapshot_index_at_time(snapshots: List[Dict], target_time: float) -> in
     return idx
 
 
-def get_snapshot_at_time(snapshots: List[Dict], target_time: float) -> Optional[Dict]:
+def get_snapshot_at_time(
+    snapshots: List[Dict],
+    target_time: float,
+    times: Optional[Sequence[float]] = None
+) -> Optional[Dict]:
     """Get the snapshot closest to the target time.
     
     Args:
         snapshots: List of snapshot dictionaries
         target_time: Target time in minutes
+        times: Snapshot times, if already extracted
         
     Returns:
         Snapshot dictionary or None if no snapshots
@@ -157,7 +171,7 @@ def get_snapshot_at_time(snapshots: List[Dict], target_time: float) -> Optional[
     if not snapshots:
         return None
     
-    idx = find_snapshot_index_at_time(snapshots, target_time)
+    idx = find_snapshot_index_at_time(snapshots, target_time, times)
     return snapshots[idx]
 
 